@@ -0,0 +1,118 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .tokens import USER_CLAIMS
+
+
+DEFAULTS = {
+    # strict - har so'rovda DB, cache - qisqa TTL kesh, claims - token ichidagi ma'lumot
+    'MODE': 'cache',
+    'TIMEOUT': 60,  # sekund
+    'ALIAS': 'default',
+}
+
+
+def get_config():
+    return dict(DEFAULTS, **getattr(settings, 'JWT_USER_CACHE', {}))
+
+
+# Keshga yoziladigan maydonlar - autentifikatsiya va ruxsatlar uchun yetarli (parol hash'i yo'q)
+CACHED_FIELDS = ('username', 'is_active', 'is_staff', 'is_superuser')
+
+
+def user_cache_key(user_id):
+    return f'accounts:user:{user_id}'
+
+
+def invalidate_user_cache(user_id):
+    """User saqlanganda / paroli o'zgarganda keshni tozalash"""
+    caches[get_config()['ALIAS']].delete(user_cache_key(user_id))
+
+
+def read_only_user(user_id, fields):
+    """Kesh yoki token maydonlaridan saqlab bo'lmaydigan user (accounts.models.ReadOnlyUser)"""
+    from .models import ReadOnlyUser
+
+    # Token'da id satr ko'rinishida ('1') - FK va taqqoslashlar uchun model turiga
+    user_id = ReadOnlyUser._meta.get_field(api_settings.USER_ID_FIELD).to_python(user_id)
+    user = ReadOnlyUser(**{api_settings.USER_ID_FIELD: user_id, **fields})
+    # Bazada mavjud obyekt sifatida (FK, filter va ruxsat so'rovlari uchun)
+    user._state.adding = False
+    user._state.db = 'default'
+    return user
+
+
+# ============================================
+# CACHED JWT AUTHENTICATION
+# ============================================
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication, lekin user har so'rovda SELECT qilinmaydi:
+    - cache:  CACHED_FIELDS qisqa muddatli keshdan olinadi
+    - claims: user token claim'laridan (USER_CLAIMS) yig'iladi
+    - strict: oddiy DB lookup
+    cache/claims'dan kelgan user - ReadOnlyUser (parolsiz, save() taqiqlangan).
+    """
+
+    def get_user(self, validated_token):
+        config = get_config()
+        mode = config['MODE']
+        if mode == 'strict':
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        # Parol o'zgarganini tekshirish uchun password hash kerak - claims yetmaydi
+        if mode == 'claims' and not api_settings.CHECK_REVOKE_TOKEN:
+            user = self.user_from_claims(user_id, validated_token)
+            if user is not None:
+                self.check_user(user, validated_token)
+                return user
+
+        cache = caches[config['ALIAS']]
+        key = user_cache_key(user_id)
+        entry = cache.get(key)
+        if entry is None:
+            user = super().get_user(validated_token)
+            cache.set(key, self.cache_entry(user), timeout=config['TIMEOUT'])
+            return user
+
+        fields = dict(entry)
+        password_hash = fields.pop('password_hash', None)
+        user = read_only_user(user_id, fields)
+        self.check_user(user, validated_token, password_hash)
+        return user
+
+    def cache_entry(self, user):
+        """Keshga faqat CACHED_FIELDS (va revoke tekshiruvi uchun simplejwt token'ga yozadigan md5)"""
+        entry = {field: getattr(user, field) for field in CACHED_FIELDS}
+        if api_settings.CHECK_REVOKE_TOKEN:
+            entry['password_hash'] = get_md5_hash_password(user.password)
+        return entry
+
+    def user_from_claims(self, user_id, validated_token):
+        """Token claim'laridan ReadOnlyUser yasaydi (eski token bo'lsa None)"""
+        if any(claim not in validated_token for claim in USER_CLAIMS):
+            return None
+        user = read_only_user(user_id, {claim: validated_token[claim] for claim in USER_CLAIMS})
+        user.from_token_claims = True
+        return user
+
+    def check_user(self, user, validated_token, password_hash=None):
+        """super().get_user() dagi is_active va revoke tekshiruvlari"""
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != password_hash:
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code='password_changed'
+                )
@@ -0,0 +1,71 @@
+import json
+import time
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from accounts.authentication import CachedJWTAuthentication, get_config, user_cache_key
+from accounts.models import User
+from accounts.tokens import ClaimsRefreshToken
+
+
+MODES = ('strict', 'cache', 'claims')
+
+
+class Command(BaseCommand):
+    """
+    CachedJWTAuthentication rejimlari (JWT_USER_CACHE['MODE']) uchun o'lchov:
+    sekundiga autentifikatsiyalar va bitta so'rovga SQL so'rovlar soni.
+
+        python manage.py benchmark_auth --requests 5000
+        python manage.py benchmark_auth --json
+
+    Token ClaimsRefreshToken'dan (claims rejimi ishlashi uchun); kesh har rejim oldidan tozalanadi,
+    shuning uchun birinchi so'rov (cache miss) ham hisobga kiradi.
+    """
+    help = "JWT user aniqlash rejimlarini (strict/cache/claims) solishtiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--user', type=int, help='User id (standart: birinchi aktiv user)')
+        parser.add_argument('--json', action='store_true', help='Natijani JSON ko\'rinishida chiqarish')
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(is_active=True)
+        user = users.filter(pk=options['user']).first() if options['user'] else users.order_by('pk').first()
+        if user is None:
+            raise CommandError('Aktiv user topilmadi (seed_blog bilan yarating)')
+
+        token = ClaimsRefreshToken.for_user(user).access_token
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        results = [self.measure(mode, user, request, max(1, options['requests'])) for mode in MODES]
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for result in results:
+            self.stdout.write(
+                f"{result['mode']:>6}: {result['per_second']:.0f} auth/s, "
+                f"{result['microseconds']:.0f} us, {result['queries_per_request']:.3f} SQL/so'rov"
+            )
+
+    def measure(self, mode, user, request, count):
+        config = dict(get_config(), MODE=mode)
+        with override_settings(JWT_USER_CACHE=config):
+            caches[config['ALIAS']].delete(user_cache_key(user.pk))
+            authentication = CachedJWTAuthentication()
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                for _ in range(count):
+                    authentication.authenticate(request)
+                elapsed = time.perf_counter() - started
+        return {
+            'mode': mode,
+            'requests': count,
+            'per_second': count / elapsed,
+            'microseconds': elapsed * 1e6 / count,
+            'queries_per_request': len(queries) / count,
+        }
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.1 on 2026-10-19 09:12
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_profile_avatar_variants_alter_profile_avatar'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReadOnlyUser',
+            fields=[
+            ],
+            options={
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('accounts.user',),
+        ),
+    ]
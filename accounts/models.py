@@ -3,6 +3,8 @@ from email.encoders import encode_noop
 from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 
+from core.images import validate_image_pixels
+
 
 # ============================================
 # USER MANAGER
@@ -71,6 +73,24 @@ class User(AbstractBaseUser, PermissionsMixin):
         return f"{self.first_name} {self.last_name}".strip()
 
 
+class ReadOnlyUser(User):
+    """
+    Keshdan yoki token claim'laridan yig'ilgan user (accounts.authentication).
+    Faqat autentifikatsiya/ruxsat maydonlari to'ldirilgan (parol bo'sh) - saqlash
+    bazadagi haqiqiy qiymatlarni ustidan yozib yuborardi, shuning uchun taqiqlangan.
+    FK va filter'larda oddiy User kabi ishlatiladi (request.user).
+    """
+
+    class Meta:
+        proxy = True
+
+    def save(self, *args, **kwargs):
+        raise TypeError("ReadOnlyUser saqlanmaydi - User.objects.get(pk=...) bilan yuklang")
+
+    def delete(self, *args, **kwargs):
+        raise TypeError("ReadOnlyUser o'chirilmaydi - User.objects.get(pk=...) bilan yuklang")
+
+
 # ============================================
 # PROFILE MODEL
 # ============================================
@@ -81,7 +101,11 @@ class Profile(models.Model):
 
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     bio = models.TextField(blank=True, verbose_name='Bio')
-    avatar = models.ImageField(upload_to='avatars/', blank=True, null=True, verbose_name='Avatar')
+    avatar = models.ImageField(
+        upload_to='avatars/', blank=True, null=True, validators=[validate_image_pixels], verbose_name='Avatar'
+    )
+    # WebP variantlar (core.images)
+    avatar_variants = models.JSONField(default=dict, blank=True, editable=False, verbose_name='Avatar variantlari')
     phone = models.CharField(max_length=20, blank=True, verbose_name='Telefon')
     location = models.CharField(max_length=100, blank=True, verbose_name='Manzil')
     website = models.URLField(blank=True, verbose_name='Website')
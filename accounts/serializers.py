@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from core.images import ImageVariantsField
 from .models import *
 
 User = get_user_model()
@@ -25,10 +26,32 @@ class UserSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = User
-        fields = "__all__"
+        exclude = ("password",)  # Parol hash'i javobda chiqmasin
         read_only_fields = ("id","created_at","updated_at")
 
 
+# ============================================
+# AUTHOR SERIALIZER (post/comment ichida - ixcham)
+# ============================================
+class AuthorSerializer(serializers.ModelSerializer):
+    """
+    Post va commentlar ichidagi muallif (M2M va parolsiz)
+    """
+    full_name = serializers.CharField(source='get_full_name', read_only=True)
+
+    # ?fields= uchun: method field qaysi ustunlarga tayanadi
+    sparse_sources = {'full_name': ('first_name', 'last_name')}
+    # blog.fastpath uchun: .values() ustunlaridan full_name (User.get_full_name bilan bir xil)
+    fastpath = {
+        'full_name': (('first_name', 'last_name'), lambda first, last: f"{first} {last}".strip()),
+    }
+
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'first_name', 'last_name', 'full_name']
+        read_only_fields = fields
+
+
 # PROFILE SERIALIZER
 # ============================================
 class ProfileSerializer(serializers.ModelSerializer):
@@ -36,10 +59,11 @@ class ProfileSerializer(serializers.ModelSerializer):
     Profile modelini JSON ga aylantirish
     """
     user = UserSerializer(read_only=True)
+    avatar_srcset = ImageVariantsField('avatar')
 
     class Meta:
         model = Profile
-        fields = ['id', 'user', 'bio', 'avatar', 'phone', 'location', 'website', 'created_at', 'updated_at']
+        fields = ['id', 'user', 'bio', 'avatar', 'avatar_srcset', 'phone', 'location', 'website', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
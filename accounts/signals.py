@@ -0,0 +1,18 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+
+from core.images import register as register_image_pipeline
+
+from .authentication import invalidate_user_cache
+from .models import Profile
+
+
+def clear_user_cache(sender, instance, **kwargs):
+    """User (jumladan paroli) o'zgarganda keshdagi nusxani o'chirish"""
+    invalidate_user_cache(instance.pk)
+
+
+User = get_user_model()
+post_save.connect(clear_user_cache, sender=User, dispatch_uid='accounts-user-cache-save')
+post_delete.connect(clear_user_cache, sender=User, dispatch_uid='accounts-user-cache-delete')
+register_image_pipeline(Profile, 'avatar')
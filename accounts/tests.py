@@ -1,3 +1,133 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .authentication import CACHED_FIELDS, CachedJWTAuthentication, user_cache_key
+from .models import Profile, ReadOnlyUser, User
+from .tokens import ClaimsRefreshToken
+
+
+def jwt_user_cache(mode):
+    return {'MODE': mode, 'TIMEOUT': 60, 'ALIAS': 'default'}
+
+
+# ============================================
+# JWT USER (strict / cache / claims)
+# ============================================
+class CachedJWTAuthenticationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('jwt@example.com', 'jwt', 'pass12345', is_staff=True)
+
+    def setUp(self):
+        cache.clear()
+
+    def authenticate(self, token=None):
+        token = token or AccessToken.for_user(self.user)
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        user, _ = CachedJWTAuthentication().authenticate(request)
+        return user
+
+    @override_settings(JWT_USER_CACHE=jwt_user_cache('strict'))
+    def test_strict_reads_user_on_every_request(self):
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                user = self.authenticate()
+            self.assertIs(type(user), User)
+
+    @override_settings(JWT_USER_CACHE=jwt_user_cache('cache'))
+    def test_cache_stores_only_auth_fields(self):
+        with self.assertNumQueries(1):
+            self.assertIs(type(self.authenticate()), User)
+        self.assertEqual(set(cache.get(user_cache_key(self.user.pk))), set(CACHED_FIELDS))
+
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+        self.assertIsInstance(user, ReadOnlyUser)
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(user.username, 'jwt')
+        self.assertTrue(user.is_staff)
+        self.assertFalse(user.password)
+
+    @override_settings(JWT_USER_CACHE=jwt_user_cache('claims'))
+    def test_claims_need_no_query(self):
+        with self.assertNumQueries(0):
+            user = self.authenticate(ClaimsRefreshToken.for_user(self.user).access_token)
+        self.assertIsInstance(user, ReadOnlyUser)
+        self.assertEqual((user.username, user.is_staff, user.is_superuser), ('jwt', True, False))
+
+        # Claim'larsiz (eski) token - cache rejimi kabi
+        with self.assertNumQueries(1):
+            self.authenticate()
+        with self.assertNumQueries(0):
+            self.authenticate()
+
+    @override_settings(JWT_USER_CACHE=jwt_user_cache('cache'))
+    def test_read_only_user_cannot_overwrite_real_row(self):
+        self.authenticate()
+        user = self.authenticate()
+        with self.assertRaises(TypeError):
+            user.save()
+        with self.assertRaises(TypeError):
+            user.delete()
+        # FK filter va yozuvlarda oddiy User kabi
+        Profile.objects.create(user=user, bio='read only')
+        self.assertEqual(Profile.objects.get(user=user).bio, 'read only')
+        self.assertTrue(User.objects.get(pk=self.user.pk).check_password('pass12345'))
+
+    @override_settings(JWT_USER_CACHE=jwt_user_cache('cache'))
+    def test_user_save_invalidates_cache(self):
+        self.authenticate()
+        self.user.username = 'renamed'
+        self.user.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.authenticate().username, 'renamed')
+
+    def test_deactivation_rejects_next_request(self):
+        for mode in ('strict', 'cache'):
+            with self.subTest(mode=mode), override_settings(JWT_USER_CACHE=jwt_user_cache(mode)):
+                self.user.is_active = True
+                self.user.save()
+                token = AccessToken.for_user(self.user)
+                self.authenticate(token)
+                self.authenticate(token)
+                self.user.is_active = False
+                self.user.save()
+                with self.assertRaises(AuthenticationFailed):
+                    self.authenticate(token)
+
+    @override_settings(JWT_USER_CACHE=jwt_user_cache('cache'))
+    def test_password_change_revokes_cached_tokens(self):
+        # override_settings(SIMPLE_JWT=...) import qilingan api_settings'ga yetib bormaydi
+        with mock.patch.object(api_settings, 'CHECK_REVOKE_TOKEN', True):
+            token = AccessToken.for_user(self.user)
+            self.authenticate(token)
+            self.assertIsInstance(self.authenticate(token), ReadOnlyUser)
+            self.user.set_password('changed12345')
+            self.user.save()
+            with self.assertRaises(AuthenticationFailed):
+                self.authenticate(token)
+
+    @override_settings(JWT_USER_CACHE=jwt_user_cache('claims'))
+    def test_refresh_rereads_demoted_user(self):
+        """Bir kunlik refresh token eski is_staff'ni yangi access token'ga ko'chirmaydi"""
+        refresh = ClaimsRefreshToken.for_user(self.user)
+        self.user.is_staff = False
+        self.user.save()
+
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': str(refresh)})
+        self.assertEqual(response.status_code, 200)
+        access = AccessToken(response.data['access'])
+        self.assertFalse(access['is_staff'])
+        with self.assertNumQueries(0):
+            self.assertFalse(self.authenticate(access).is_staff)
+
+        # o'chirilgan user refresh qila olmaydi
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': str(refresh)})
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,60 @@
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+# CachedJWTAuthentication 'claims' rejimi uchun tokenga yoziladigan maydonlar
+USER_CLAIMS = ('username', 'is_active', 'is_staff', 'is_superuser')
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Refresh (va undan olingan access) tokenga user ma'lumotlarini qo'shadi
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.set_user_claims(user)
+        return token
+
+    def set_user_claims(self, user):
+        for claim in USER_CLAIMS:
+            self[claim] = getattr(user, claim)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    token/refresh/: refresh token bir kun yashaydi - undagi is_staff/is_superuser
+    eskirgan bo'lishi mumkin. Shuning uchun user har refresh'da bazadan o'qiladi
+    va yangi access (hamda aylantirilgan refresh) token joriy qiymatlarni oladi.
+    """
+    token_class = ClaimsRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        user = get_user_model().objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        refresh.set_user_claims(user)
+
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    refresh.blacklist()
+                except AttributeError:
+                    # token_blacklist ilovasi o'rnatilmagan
+                    pass
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data['refresh'] = str(refresh)
+
+        return data
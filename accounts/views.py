@@ -2,9 +2,12 @@ from rest_framework import status, generics, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
+from django.shortcuts import get_object_or_404
 from django.contrib.auth import authenticate
+from core.uploads import StreamingUploadMixin
 from .serializers import *
 from .models import Profile
+from .tokens import ClaimsRefreshToken
 
 
 # royhatdan otish
@@ -14,6 +17,7 @@ class RegisterView(generics.CreateAPIView):
     """
     serializer_class = RegisterSerializer
     permission_classes = (permissions.AllowAny,)
+    query_budget = 7  # blog.query_budget - SQL so'rovlar soni chegarasi
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -21,7 +25,7 @@ class RegisterView(generics.CreateAPIView):
         user = serializer.save()
 
         # token yaratish
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
 
         return Response({
             'user': UserSerializer(user).data,
@@ -42,6 +46,7 @@ class LoginView(generics.GenericAPIView):
     """
     serializer_class = LoginSerializer
     permission_classes = [permissions.AllowAny]
+    query_budget = 4
 
     def post(self, request):
         serializer = self.get_serializer(data=request.data)
@@ -60,7 +65,7 @@ class LoginView(generics.GenericAPIView):
             )
 
         # Token yaratish
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
 
         return Response(
             {
@@ -80,6 +85,7 @@ class LogoutView(APIView):
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 3
 
     def post(self, request):
         try:
@@ -100,17 +106,19 @@ class LogoutView(APIView):
 
 # profile view (oz profilini korish va tahrirlash)
 
-class ProfileView(generics.RetrieveUpdateAPIView):
+class ProfileView(StreamingUploadMixin, generics.RetrieveUpdateAPIView):
     """
     GET /api/auth/profile/ - O'z profilini ko'rish
     PUT/PATCH /api/auth/profile/ - Profilni tahrirlash
     """
     serializer_class = ProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = {'GET': 4, 'PUT': 6, 'PATCH': 6}
+    upload_image_fields = ('avatar',)  # core.uploads
 
     def get_object(self):
-        """Joriy user'ning profili"""
-        return self.request.user.profile
+        """Joriy user'ning profili (user bilan bitta so'rovda)"""
+        return get_object_or_404(Profile.objects.select_related('user'), user_id=self.request.user.pk)
 
     def get_serializer_class(self):
         """GET uchun ProfileSerializer, PUT/PATCH uchun ProfileUpdateSerializer"""
@@ -128,6 +136,7 @@ class UserDetailView(generics.RetrieveAPIView):
     """
     serializer_class = UserSerializer
     permission_classes = [permissions.AllowAny]
+    query_budget = 4
 
     from django.contrib.auth import get_user_model
     queryset = get_user_model().objects.all()
\ No newline at end of file
@@ -1,5 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class BlogConfig(AppConfig):
     name = 'blog'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .search import ensure_sqlite_fts
+
+        # SQLite'da jadvalni o'zgartiradigan migratsiyalar FTS5 trigger'larini o'chiradi
+        post_migrate.connect(ensure_sqlite_fts, sender=self, dispatch_uid='blog-sqlite-fts')
@@ -0,0 +1,169 @@
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse, HttpResponseNotAllowed
+from django.shortcuts import aget_object_or_404
+from rest_framework.exceptions import APIException, NotAcceptable
+from rest_framework.views import exception_handler
+
+from .cache import get_response_cache
+from .comment_tree import CommentTree
+from .instrumentation import timed
+from .renderers import dumps
+
+
+# ============================================
+# ASYNC READ VIEWS (ASGI uchun)
+# ============================================
+class AsyncReadView:
+    """
+    DRF read view'ning async varianti.
+    Queryset, filter, ?fields=, pagination va kesh sozlamalari shu DRF view klassidan olinadi,
+    DB so'rovlari esa async ORM (aget, aaggregate, async for) bilan bajariladi.
+
+    Token bilan kelgan so'rovlar, GET/HEAD dan boshqa metodlar, JSON'dan boshqa renderer
+    tanlangan so'rovlar va fast path qo'llab bo'lmaydigan holatlar oddiy (sinxron) DRF view'ga beriladi.
+    """
+    safe_methods = ('GET', 'HEAD')
+    content_type = 'application/json'
+
+    def __init__(self, view_class):
+        self.view_class = view_class
+        self.sync_view = sync_to_async(view_class.as_view())
+
+    @classmethod
+    def as_view(cls, view_class):
+        handler = cls(view_class)
+
+        async def view(request, *args, **kwargs):
+            return await handler.dispatch(request, *args, **kwargs)
+
+        view.view_class = view_class
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        response_cache = get_response_cache()
+        if request.method not in self.safe_methods or not response_cache.is_cacheable(request):
+            if request.method in self.view_class().allowed_methods:
+                return await self.sync_view(request, *args, **kwargs)
+            return HttpResponseNotAllowed(self.view_class().allowed_methods)
+
+        view = self.make_view(request, args, kwargs)
+        if not self.renders_json(view):
+            # Brauzer (text/html), ?format=api yoki 406 - DRF renderer'lari bilan sinxron view.
+            # Kesh kaliti Accept'ga bog'liq, shuning uchun bu kalitga JSON yozilmasligi kerak
+            return await self.sync_view(request, *args, **kwargs)
+
+        key = await response_cache.akey_for(request, view.cache_namespaces)
+        entry = await response_cache.aget(key)
+        if entry is not None:
+            view.response_cache_hit(request, entry['meta'], *args, **kwargs)
+            response = response_cache.build_response(entry)
+            response['X-Cache'] = 'HIT'
+            return view.conditional_response(request, entry, response)
+
+        view.route_reads(request)
+        try:
+            response = await self.respond(view, *args, **kwargs)
+        except (APIException, Http404) as exc:
+            response = self.error_response(view, exc)
+        if response is None:
+            return await self.sync_view(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+
+        entry = await response_cache.astore(
+            key, response, view.response_cache_meta, view.cache_timeout,
+            validators=getattr(view, 'response_validators', None),
+        )
+        response_cache.set_validators(response, entry)
+        response['X-Cache'] = 'MISS'
+        return view.conditional_response(request, entry, response)
+
+    def make_view(self, request, args, kwargs):
+        """DRF view obyekti - faqat sozlama va yordamchi metodlar uchun (dispatch qilinmaydi)"""
+        view = self.view_class()
+        view.args, view.kwargs = args, kwargs
+        view.headers = {}
+        view.format_kwarg = None
+        view.request = view.initialize_request(request, *args, **kwargs)
+        view.response_cache_meta = {}
+        return view
+
+    def renders_json(self, view):
+        """Sinxron view bilan bir xil content negotiation (Accept, ?format=) JSON renderer tanlaydimi"""
+        try:
+            renderer, media_type = view.perform_content_negotiation(view.request)
+        except NotAcceptable:
+            return False
+        return renderer.format == 'json'
+
+    async def respond(self, view, *args, **kwargs):
+        """HttpResponse; None - sinxron view'ga topshirish"""
+        raise NotImplementedError
+
+    def render(self, data, status=200):
+        with timed('render'):
+            content = dumps(data)
+        return HttpResponse(content, content_type=self.content_type, status=status)
+
+    def error_response(self, view, exc):
+        """DRF exception_handler bilan bir xil javob (NotFound, ValidationError, Http404)"""
+        response = exception_handler(exc, {'view': view, 'args': view.args,
+                                           'kwargs': view.kwargs, 'request': view.request})
+        if response is None:
+            raise exc
+        rendered = self.render(response.data, status=response.status_code)
+        for name, value in response.items():
+            if name.lower() != 'content-type':  # render qilinmagan Response'da hali text/html
+                rendered[name] = value
+        return rendered
+
+
+class AsyncListView(AsyncReadView):
+    """PostListView, CategoryListView, CommentListView uchun (ConditionalGetMixin + FastPathListMixin)"""
+
+    async def respond(self, view, *args, **kwargs):
+        mapper = view.get_row_mapper()
+        if mapper is None:
+            return None
+
+        request = view.request
+        queryset = view.filter_queryset(view.get_queryset())
+        not_modified = view.not_modified(request, await view.alist_validators(queryset))
+        if not_modified is not None:
+            return not_modified
+
+        queryset = view.annotate_queryset(queryset).values(*sorted(mapper.paths))
+        paginator = view.paginator
+        if paginator is None:
+            rows = [row async for row in queryset]
+            return self.render(await mapper.amap(rows, request))
+
+        rows = await paginator.apaginate_queryset(queryset, request, view=view)
+        data = await mapper.amap(rows, request)
+        return self.render(paginator.get_paginated_response(data).data)
+
+
+class AsyncPostDetailView(AsyncReadView):
+    """PostDetailView uchun: post, kommentariya daraxti va COUNT'lar async yuklanadi"""
+
+    async def respond(self, view, slug):
+        request = view.request
+        post = await aget_object_or_404(view.get_queryset(), slug=slug)
+        view.record_view(post)
+
+        versions = await get_response_cache().aget_versions(view.cache_namespaces)
+        not_modified = view.not_modified(request, view.post_validators(post, versions))
+        if not_modified is not None:
+            return not_modified
+
+        context = {'request': request}
+        serializer = view.serializer_class(post, context=context)
+        if 'comments' in serializer.fields:
+            # get_comments() daraxtni context'dan oladi - serializatsiyada so'rov yo'q
+            context['comment_tree'] = await CommentTree.afor_post(
+                post,
+                max_depth=serializer.comments_max_depth,
+                per_level_limit=serializer.comments_per_level,
+            )
+        return self.render(serializer.data)
@@ -0,0 +1,105 @@
+from django.db import IntegrityError, transaction
+from rest_framework import serializers, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .signals import invalidate_response_cache
+
+
+# ============================================
+# BULK CREATE (validatsiya + bulk_create bitta tranzaksiyada)
+# ============================================
+class CachedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    context['related_cache'][model] bo'lsa obyektni undan oladi (har element uchun SELECT yo'q).
+    Topilmasa - oddiy PrimaryKeyRelatedField (so'rov va odatiy xato xabari).
+    """
+
+    def to_internal_value(self, data):
+        cache = self.context.get('related_cache', {}).get(self.get_queryset().model)
+        if cache is not None and not isinstance(data, bool):
+            obj = cache.get(str(data))
+            if obj is not None:
+                return obj
+        return super().to_internal_value(data)
+
+
+class BulkCreateMixin:
+    """
+    POST [{...}, {...}] yoki {"items": [...]} - har bir element serializer bilan tekshiriladi,
+    to'g'rilari bitta bulk_create bilan yoziladi, xatolilar batch'ni to'xtatmaydi.
+
+    Javob: {"created": [{"index", "id", ...}], "errors": [{"index", "errors"}]}
+    """
+    max_batch_size = 1000
+    insert_batch_size = 500
+
+    def create(self, request, *args, **kwargs):
+        items = request.data.get('items') if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list):
+            raise ValidationError({'items': 'Elementlar ro\'yxati kerak'})
+        if len(items) > self.max_batch_size:
+            raise ValidationError({'items': f'Bir so\'rovda ko\'pi bilan {self.max_batch_size} ta element'})
+
+        context = dict(self.get_serializer_context(), related_cache=self.load_related(items))
+        valid, errors = [], []
+        for index, item in enumerate(items):
+            serializer = self.get_serializer_class()(data=item, context=context)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+
+        created = []
+        if valid:
+            model = self.get_serializer_class().Meta.model
+            instances = self.build_instances([data for _, data in valid])
+            try:
+                self.insert(model, instances)
+            except IntegrityError:
+                # Parallel import xuddi shu slug'larni olgan - qayta ajratib, bitta urinish
+                instances = self.build_instances([data for _, data in valid])
+                self.insert(model, instances)
+            created = [
+                dict(self.created_item(instance), index=index)
+                for (index, _), instance in zip(valid, instances)
+            ]
+
+        response_status = status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST
+        return Response({'created': created, 'errors': errors}, status=response_status)
+
+    def insert(self, model, instances):
+        with transaction.atomic():
+            model._default_manager.bulk_create(instances, batch_size=self.insert_batch_size)
+            # bulk_create post_save signal yubormaydi - kesh qo'lda eskirtiriladi
+            invalidate_response_cache(model)
+
+    def load_related(self, items):
+        """Batch'dagi barcha FK id'lari uchun model bo'yicha bitta in_bulk() so'rovi"""
+        serializer = self.get_serializer_class()()
+        querysets, ids_by_model = {}, {}
+        for name, field in serializer.fields.items():
+            if not isinstance(field, serializers.PrimaryKeyRelatedField) or field.read_only:
+                continue
+            queryset = field.get_queryset()
+            querysets.setdefault(queryset.model, queryset)
+            ids = ids_by_model.setdefault(queryset.model, set())
+            for item in items:
+                value = item.get(name) if isinstance(item, dict) else None
+                if isinstance(value, int) and not isinstance(value, bool):
+                    ids.add(value)
+                elif isinstance(value, str) and value.isdigit():
+                    ids.add(int(value))
+
+        return {
+            model: {str(pk): obj for pk, obj in querysets[model].in_bulk(ids).items()}
+            for model, ids in ids_by_model.items()
+        }
+
+    def build_instances(self, validated):
+        """validated_data ro'yxatidan saqlanmagan model obyektlari"""
+        model = self.get_serializer_class().Meta.model
+        return [model(**data) for data in validated]
+
+    def created_item(self, instance):
+        return {'id': instance.pk}
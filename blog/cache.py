@@ -0,0 +1,262 @@
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpRequest, HttpResponse
+from django.urls import resolve
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .instrumentation import timed
+
+
+DEFAULTS = {
+    'ALIAS': 'default',
+    'TIMEOUT': 300,  # sekund
+    'KEY_PREFIX': 'blog',
+    'WARM': {},  # {namespace: [path, ...]} - namespace eskirgach shu javoblar qayta yig'iladi
+    'WARM_ACCEPT': ('application/json', '*/*', ''),  # kesh kaliti Accept'ga bog'liq
+}
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================
+# RESPONSE CACHE
+# ============================================
+class ResponseCache:
+    """
+    Ommaviy GET javoblari uchun read-through kesh.
+    Kalit: namespace versiyalari + path + tartiblangan query parametrlar.
+    Invalidatsiya - namespace versiyasini oshirish (wildcard delete kerak emas).
+    """
+
+    def __init__(self, alias, timeout, key_prefix, warm_paths=None, warm_accept=DEFAULTS['WARM_ACCEPT']):
+        self.alias = alias
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+        self.warm_paths = warm_paths or {}
+        self.warm_accept = warm_accept
+
+    @classmethod
+    def from_settings(cls):
+        config = dict(DEFAULTS, **getattr(settings, 'RESPONSE_CACHE', {}))
+        return cls(config['ALIAS'], config['TIMEOUT'], config['KEY_PREFIX'],
+                   config['WARM'], config['WARM_ACCEPT'])
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    # ------------------------------------------
+    # Namespace versiyalari
+    # ------------------------------------------
+    def version_key(self, namespace):
+        return f'{self.key_prefix}:ns:{namespace}'
+
+    def get_versions(self, namespaces):
+        keys = [self.version_key(namespace) for namespace in namespaces]
+        versions = self.cache.get_many(keys)
+        return [versions.get(key, 0) for key in keys]
+
+    async def aget_versions(self, namespaces):
+        keys = [self.version_key(namespace) for namespace in namespaces]
+        versions = await self.cache.aget_many(keys)
+        return [versions.get(key, 0) for key in keys]
+
+    def bump(self, *namespaces):
+        """Namespace'dagi barcha javoblarni eskirgan deb belgilash"""
+        for namespace in namespaces:
+            key = self.version_key(namespace)
+            if not self.cache.add(key, 1, timeout=None):
+                try:
+                    self.cache.incr(key)
+                except ValueError:
+                    # Kalit add va incr orasida o'chib ketgan
+                    self.cache.set(key, 1, timeout=None)
+
+    # ------------------------------------------
+    # Javoblar
+    # ------------------------------------------
+    def is_cacheable(self, request):
+        # Token bilan kelgan so'rov autentifikatsiyadan o'tishi kerak - keshlanmaydi
+        return request.method in SAFE_METHODS and 'HTTP_AUTHORIZATION' not in request.META
+
+    def key_for(self, request, namespaces):
+        return self.build_key(request, self.get_versions(namespaces))
+
+    async def akey_for(self, request, namespaces):
+        return self.build_key(request, await self.aget_versions(namespaces))
+
+    def build_key(self, request, versions):
+        query = sorted(
+            (key, value)
+            for key in request.GET
+            for value in request.GET.getlist(key)
+        )
+        raw = '|'.join([
+            request.path,
+            '&'.join(f'{key}={value}' for key, value in query),
+            request.META.get('HTTP_ACCEPT', ''),
+        ])
+        digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+        versions = '.'.join(str(version) for version in versions)
+        return f'{self.key_prefix}:resp:{versions}:{digest}'
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    async def aget(self, key):
+        return await self.cache.aget(key)
+
+    def store(self, key, response, meta=None, timeout=None, validators=None):
+        """validators - view hisoblagan ETag/Last-Modified (blog.conditional), bo'lmasa body hash"""
+        entry = self.build_entry(response, meta, validators)
+        self.cache.set(key, entry, timeout=timeout or self.timeout)
+        return entry
+
+    async def astore(self, key, response, meta=None, timeout=None, validators=None):
+        entry = self.build_entry(response, meta, validators)
+        await self.cache.aset(key, entry, timeout=timeout or self.timeout)
+        return entry
+
+    def build_entry(self, response, meta=None, validators=None):
+        content = response.content
+        validators = validators or {}
+        return {
+            'content': content,
+            'content_type': response['Content-Type'],
+            'etag': validators.get('etag') or quote_etag(hashlib.md5(content).hexdigest()),
+            'last_modified': validators.get('last_modified') or int(time.time()),
+            'meta': meta or {},
+        }
+
+    # ------------------------------------------
+    # Warming (o'zgarishdan keyin birinchi so'rov MISS bo'lmasin)
+    # ------------------------------------------
+    def warm(self, namespaces):
+        """bump() dan keyin: shu namespace'larga bog'liq WARM path'larini keshga yozish"""
+        paths = {path for namespace in namespaces for path in self.warm_paths.get(namespace, ())}
+        for path in sorted(paths):
+            try:
+                self.warm_path(path)
+            except Exception:
+                # Warming - optimizatsiya; yozuv (commit) natijasiga ta'sir qilmasin
+                logger.exception('Response cache warming xatosi: %s', path)
+
+    def warm_path(self, path):
+        """
+        View'ni ichki anonim GET bilan chaqiradi (CachedResponseMixin javobni o'zi saqlaydi),
+        so'ng o'sha entry'ni qolgan WARM_ACCEPT kalitlariga ham yozadi.
+        Middleware ishlamaydi - o'qish primary'dan (yangi commit ko'rinadi).
+        """
+        match = resolve(path)
+        view_class = match.func.view_class  # async variant (blog.async_views) ham view_class beradi
+        requests = [self.internal_request(path, accept) for accept in self.warm_accept]
+        response = view_class.as_view()(requests[0], *match.args, **match.kwargs)
+        if response.status_code != 200:
+            return
+
+        versions = self.get_versions(view_class.cache_namespaces)
+        entry = self.get(self.build_key(requests[0], versions))
+        if entry is None:
+            return
+        for request in requests[1:]:
+            self.cache.set(self.build_key(request, versions), entry, timeout=view_class.cache_timeout or self.timeout)
+
+    def internal_request(self, path, accept):
+        request = HttpRequest()
+        request.method = 'GET'
+        request.path = request.path_info = path
+        request.META = {
+            'HTTP_ACCEPT': accept,
+            'QUERY_STRING': '',
+            'REMOTE_ADDR': '127.0.0.1',
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+        }
+        return request
+
+    def build_response(self, entry):
+        response = HttpResponse(entry['content'], content_type=entry['content_type'])
+        self.set_validators(response, entry)
+        return response
+
+    def set_validators(self, response, entry):
+        response['ETag'] = entry['etag']
+        response['Last-Modified'] = http_date(entry['last_modified'])
+        patch_vary_headers(response, ('Accept', 'Authorization'))
+
+
+_response_cache = None
+
+
+def get_response_cache():
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache.from_settings()
+    return _response_cache
+
+
+def reset_response_cache(**kwargs):
+    """Testlarda override_settings(RESPONSE_CACHE=...) uchun"""
+    global _response_cache
+    if kwargs.get('setting') in ('RESPONSE_CACHE', 'CACHES'):
+        _response_cache = None
+
+
+# ============================================
+# VIEW MIXIN
+# ============================================
+class CachedResponseMixin:
+    """
+    GET javobini keshlaydi va ETag/Last-Modified orqali 304 qaytaradi.
+
+    cache_namespaces - javob qaysi ma'lumotlarga bog'liq ('posts', 'comments', 'categories')
+    """
+    cache_namespaces = ()
+    cache_timeout = None
+
+    def dispatch(self, request, *args, **kwargs):
+        response_cache = get_response_cache()
+        self.response_cache_meta = {}
+        if not response_cache.is_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = response_cache.key_for(request, self.cache_namespaces)
+        entry = response_cache.get(key)
+        if entry is not None:
+            self.response_cache_hit(request, entry['meta'], *args, **kwargs)
+            response = response_cache.build_response(entry)
+            response['X-Cache'] = 'HIT'
+            return self.conditional_response(request, entry, response)
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code != 200 or getattr(response, 'streaming', False):
+            return response
+
+        if hasattr(response, 'render'):
+            with timed('render'):
+                response.render()
+        entry = response_cache.store(
+            key, response, self.response_cache_meta, self.cache_timeout,
+            validators=getattr(self, 'response_validators', None),
+        )
+        response_cache.set_validators(response, entry)
+        response['X-Cache'] = 'MISS'
+        return self.conditional_response(request, entry, response)
+
+    def conditional_response(self, request, entry, response):
+        return get_conditional_response(
+            request,
+            etag=entry['etag'],
+            last_modified=entry['last_modified'],
+            response=response,
+        )
+
+    def response_cache_hit(self, request, meta, *args, **kwargs):
+        """Keshdan javob berilganda chaqiriladi (masalan, ko'rishlarni hisoblash)"""
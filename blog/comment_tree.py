@@ -0,0 +1,141 @@
+from collections import defaultdict
+
+from django.db.models import Count
+
+from .models import Comment
+
+
+# ============================================
+# COMMENT TREE (N+1 siz kommentariya daraxti)
+# ============================================
+class CommentTree:
+    """
+    Tasdiqlangan kommentariyalarni bir necha so'rovda yuklab,
+    parent/replies daraxtini xotirada yig'adi (parent_id -> bolalar).
+
+    max_depth       - nechta darajagacha replies ko'rsatiladi (None - cheksiz)
+    per_level_limit - har bir tugun ostida nechta javob qaytariladi (None - hammasi)
+    """
+
+    def __init__(self, roots, children, reply_counts, max_depth=None, per_level_limit=None,
+                 limit_roots=True):
+        self.max_depth = max_depth
+        self.per_level_limit = per_level_limit
+        self._children = children
+        self._depth = {}
+        self._nodes = {}
+
+        self.roots = self._limit(roots) if limit_roots else roots
+        self._assign_depth(self.roots, 0)
+        self.set_reply_counts(self._nodes.values(), reply_counts)
+
+    @classmethod
+    def for_post(cls, post, max_depth=None, per_level_limit=None):
+        """Post'ning barcha tasdiqlangan kommentariyalari - bitta so'rovda"""
+        comments = list(cls.queryset().filter(post=post, is_approved=True))
+        reply_counts = cls.count_replies(Comment.objects.filter(post=post))
+        return cls.from_comments(comments, reply_counts, max_depth, per_level_limit)
+
+    @classmethod
+    async def afor_post(cls, post, max_depth=None, per_level_limit=None):
+        """for_post() ning async varianti (blog.async_views)"""
+        comments = [comment async for comment in cls.queryset().filter(post=post, is_approved=True)]
+        rows = cls.reply_counts_queryset(Comment.objects.filter(post=post))
+        reply_counts = {row['parent_id']: row['total'] async for row in rows}
+        return cls.from_comments(comments, reply_counts, max_depth, per_level_limit)
+
+    @classmethod
+    def from_comments(cls, comments, reply_counts, max_depth=None, per_level_limit=None):
+        children = defaultdict(list)
+        roots = []
+        for comment in comments:
+            if comment.parent_id is None:
+                roots.append(comment)
+            else:
+                children[comment.parent_id].append(comment)
+        return cls(roots, children, reply_counts, max_depth, per_level_limit)
+
+    @classmethod
+    def for_roots(cls, comments, max_depth=None, per_level_limit=None):
+        """
+        Tayyor ro'yxat (masalan, sahifa) uchun daraxt.
+        Replies daraja bo'yicha yuklanadi - har bir daraja uchun bitta so'rov.
+        """
+        roots = [comment for comment in comments if comment.parent_id is None]
+        children = defaultdict(list)
+
+        level = [comment.pk for comment in roots]
+        depth = 0
+        while level and (max_depth is None or depth < max_depth):
+            replies = list(cls.queryset().filter(parent_id__in=level, is_approved=True))
+            for reply in replies:
+                children[reply.parent_id].append(reply)
+            level = [reply.pk for reply in replies]
+            depth += 1
+
+        # with_counts() orqali kelgan commentlar qayta sanalmaydi
+        nodes = list(comments) + [reply for replies in children.values() for reply in replies]
+        reply_counts = {
+            comment.pk: comment.replies_total
+            for comment in nodes if getattr(comment, 'replies_total', None) is not None
+        }
+        node_ids = [comment.pk for comment in nodes if comment.pk not in reply_counts]
+        if node_ids:
+            reply_counts.update(
+                cls.count_replies(Comment.objects.filter(parent_id__in=node_ids))
+            )
+        tree = cls(roots, children, reply_counts, max_depth, per_level_limit, limit_roots=False)
+        # Ro'yxatdagi javob-commentlar daraxtga kirmaydi, lekin soni kerak
+        tree.set_reply_counts(comments, reply_counts)
+        return tree
+
+    @staticmethod
+    def queryset():
+        return (
+            Comment.objects
+            .select_related('author')
+            .order_by('-created_at', '-id')
+        )
+
+    @classmethod
+    def count_replies(cls, queryset):
+        """parent_id -> javoblar soni (bitta GROUP BY so'rov)"""
+        return {row['parent_id']: row['total'] for row in cls.reply_counts_queryset(queryset)}
+
+    @staticmethod
+    def reply_counts_queryset(queryset):
+        return (
+            queryset.filter(parent__isnull=False)
+            .order_by()
+            .values('parent_id')
+            .annotate(total=Count('id'))
+        )
+
+    @staticmethod
+    def set_reply_counts(comments, reply_counts):
+        """Har bir comment'ga javoblar sonini (tasdiqlanmaganlari ham) yozib qo'yadi"""
+        for comment in comments:
+            comment.replies_total = reply_counts.get(comment.pk, 0)
+
+    def children(self, comment):
+        """Comment javoblari (max_depth va per_level_limit hisobga olingan)"""
+        depth = self._depth.get(comment.pk)
+        if depth is None:
+            return []
+        if self.max_depth is not None and depth >= self.max_depth:
+            return []
+        return self._limit(self._children.get(comment.pk, []))
+
+    def _limit(self, comments):
+        if self.per_level_limit is None:
+            return comments
+        return comments[:self.per_level_limit]
+
+    def _assign_depth(self, comments, depth):
+        stack = [(comment, depth) for comment in comments]
+        while stack:
+            comment, level = stack.pop()
+            self._depth[comment.pk] = level
+            self._nodes[comment.pk] = comment
+            for child in self.children(comment):
+                stack.append((child, level + 1))
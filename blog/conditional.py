@@ -0,0 +1,107 @@
+import hashlib
+
+from django.db.models import Count, Max, Sum
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from .cache import get_response_cache
+
+
+# ============================================
+# CONDITIONAL GET (ETag / If-Modified-Since)
+# ============================================
+def make_validators(*parts, last_modified=None):
+    """
+    Arzon qiymatlardan (updated_at, soni, kesh versiyalari) weak ETag yasaydi.
+    last_modified - datetime yoki None
+    """
+    raw = '|'.join('' if part is None else str(part) for part in parts)
+    etag = 'W/"%s"' % hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return {'etag': etag, 'last_modified': timestamp}
+
+
+class ConditionalGetMixin:
+    """
+    Serializer ishga tushishidan oldin validator hisoblaydi,
+    mos kelsa 304 qaytaradi (body va serializatsiyasiz).
+    """
+    validator_field = 'updated_at'
+    # Signal'siz, F() bilan yangilanadigan hisoblagichlar (views_count) updated_at'ni o'zgartirmaydi -
+    # ularning SUM'i ETag'ga qo'shiladi (o'sha aggregate so'rovida)
+    validator_counters = ()
+
+    def namespace_versions(self):
+        return get_response_cache().get_versions(getattr(self, 'cache_namespaces', ()))
+
+    def not_modified(self, request, validators):
+        """304 javob yoki None; validatorlar javob headerlari uchun saqlanadi"""
+        self.response_validators = validators
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        return get_conditional_response(request, **validators)
+
+    def list_validators(self, queryset):
+        """Ro'yxat uchun: MAX(updated_at) + qatorlar soni + hisoblagichlar yig'indisi"""
+        stats = queryset.order_by().aggregate(**self.validator_aggregates())
+        return self.make_list_validators(stats, self.namespace_versions())
+
+    async def alist_validators(self, queryset):
+        """list_validators() ning async varianti (blog.async_views)"""
+        stats = await queryset.order_by().aaggregate(**self.validator_aggregates())
+        versions = await get_response_cache().aget_versions(getattr(self, 'cache_namespaces', ()))
+        return self.make_list_validators(stats, versions)
+
+    def validator_aggregates(self):
+        aggregates = {'last_modified': Max(self.validator_field), 'total': Count('pk')}
+        for name in self.validator_counters:
+            aggregates[f'sum_{name}'] = Sum(name)
+        return aggregates
+
+    def make_list_validators(self, stats, versions):
+        """
+        Embedded author/category nomlari namespace versiyalarida (blog.signals),
+        hisoblagichlar esa SUM orqali - Last-Modified faqat updated_at bo'yicha
+        """
+        counters = [stats[f'sum_{name}'] for name in self.validator_counters]
+        return make_validators(
+            stats['last_modified'], stats['total'], *counters, *versions,
+            last_modified=stats['last_modified'],
+        )
+
+    def annotate_queryset(self, queryset):
+        """Validatordan keyin qo'llanadigan og'ir annotatsiyalar (COUNT va h.k.)"""
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        not_modified = self.not_modified(request, self.list_validators(queryset))
+        if not_modified is not None:
+            return not_modified
+
+        return self.serialize_list(self.annotate_queryset(queryset))
+
+    def serialize_list(self, queryset):
+        """Sahifalash + serializatsiya (blog.fastpath shu yerni almashtiradi)"""
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, 'response_validators', None)
+        if validators and response.status_code == 200:
+            set_validator_headers(response, validators)
+        return response
+
+
+def set_validator_headers(response, validators):
+    response['ETag'] = validators['etag']
+    if validators['last_modified'] is not None:
+        response['Last-Modified'] = http_date(validators['last_modified'])
@@ -0,0 +1,85 @@
+from datetime import datetime, time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from .fastpath import get_row_mapper
+from .renderers import dumps
+from .sparse import parse_fields
+
+
+# ============================================
+# NDJSON EXPORT (doimiy xotira bilan oqim)
+# ============================================
+def parse_since(value):
+    """'2024-05-01' yoki '2024-05-01T10:00:00Z' -> aware datetime; noto'g'ri bo'lsa 400"""
+    try:
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            if day is not None:
+                moment = datetime.combine(day, time.min)
+    except ValueError:
+        moment = None
+    if moment is None:
+        raise ValidationError({'updated_since': 'Sana noto\'g\'ri (ISO 8601 kerak)'})
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, timezone.get_default_timezone())
+    return moment
+
+
+class NDJSONExportMixin:
+    """
+    GET - har bir qator alohida JSON satr (application/x-ndjson).
+
+    Qatorlar QuerySet.iterator(chunk_size) orqali o'qiladi (PostgreSQL'da server-side cursor),
+    RowMapper (blog.fastpath) bilan dict'ga aylanadi va chunk bo'yicha yuboriladi -
+    na queryset, na butun JSON hujjat xotirada to'planmaydi.
+
+    ?updated_since=<ISO sana> - faqat shu vaqtdan keyin o'zgarganlar (inkremental sinxronlash)
+    export_fields - serializer maydonlaridan qaysilari eksport qilinadi (?fields= sintaksisi)
+    """
+    export_serializer_class = None
+    export_fields = None
+    export_chunk_size = 2000
+    export_ordering = ('updated_at', 'id')  # Oxirgi satrdagi updated_at - keyingi sync nuqtasi
+    content_type = 'application/x-ndjson'
+
+    def get_export_queryset(self):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        queryset = self.get_export_queryset()
+        since = request.query_params.get('updated_since')
+        if since:
+            queryset = queryset.filter(updated_at__gte=parse_since(since))
+
+        mapper = get_row_mapper(self.export_serializer_class, parse_fields(self.export_fields))
+        if mapper is None:
+            raise ImproperlyConfigured(
+                f'{type(self).__name__}.export_fields .values() bilan ifodalanmaydi'
+            )
+        rows = (
+            queryset.order_by(*self.export_ordering)
+            .values(*sorted(mapper.paths))
+            .iterator(chunk_size=self.export_chunk_size)
+        )
+        response = StreamingHttpResponse(
+            self.stream(rows, mapper, request), content_type=self.content_type
+        )
+        response['X-Accel-Buffering'] = 'no'  # nginx javobni buferlamasin
+        return response
+
+    def stream(self, rows, mapper, request):
+        """Har chunk_size qatordan keyin bitta bytes bo'lagi"""
+        buffer = []
+        for row in rows:
+            buffer.append(dumps(mapper.map_rows((row,), request)[0]))
+            if len(buffer) >= self.export_chunk_size:
+                yield b'\n'.join(buffer) + b'\n'
+                buffer = []
+        if buffer:
+            yield b'\n'.join(buffer) + b'\n'
@@ -0,0 +1,278 @@
+import threading
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import fields as drf_fields
+from rest_framework import relations, serializers
+from rest_framework.response import Response
+
+from core.images import ImageVariantsField
+
+from .instrumentation import timed
+from .sparse import prune_fields
+
+
+# ============================================
+# FAST PATH (values() + oldindan kompilyatsiya qilingan row mapper)
+# ============================================
+class FastPathUnsupported(Exception):
+    """Serializer maydonini values() qatoridan yasab bo'lmaydi - oddiy serializer ishlatiladi"""
+
+
+# Qiymatni o'zgartirmasdan chiqaradigan maydonlar (DB dan kelgan tip JSON uchun tayyor)
+IDENTITY_FIELDS = (
+    drf_fields.CharField,
+    drf_fields.IntegerField,
+    drf_fields.BooleanField,
+    drf_fields.FloatField,
+    relations.PrimaryKeyRelatedField,
+)
+
+
+def identity(value):
+    return value
+
+
+def placeholder(row, request):
+    return None
+
+
+class RowMapper:
+    """
+    Serializer maydonlaridan bir marta reja tuzadi:
+    paths - .values() ga beriladigan ustunlar, steps - (kalit, funksiya(row, request)).
+
+    Serializer'da fastpath = {'maydon': (paths, func)} - method field'lar uchun;
+    'nested.maydon' ko'rinishidagi kalit ichki serializer maydonini almashtiradi.
+    fastpath_fill = ('replies',) - map() dan keyin fastpath_fill_<name>() bilan to'ldiriladi.
+    """
+
+    def __init__(self, serializer):
+        self.serializer_class = type(serializer)
+        self.paths = {'id', 'created_at'}  # KeysetPagination cursor'i uchun
+        self.steps = self._compile(serializer, prefix='', overrides={})
+        self.fills = [
+            name for name in getattr(serializer, 'fastpath_fill', ())
+            if name in serializer.fields
+        ]
+
+    def _compile(self, serializer, prefix, overrides):
+        model = serializer.Meta.model
+        # Serializer'ning o'z yo'llari prefix bilan, ota serializer'dan kelganlari - tayyor
+        declared = {
+            name: (tuple(prefix + path for path in paths), func)
+            for name, (paths, func) in getattr(serializer, 'fastpath', {}).items()
+        }
+        declared.update(overrides)
+        fill = getattr(serializer, 'fastpath_fill', ())
+        steps = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if name in fill:
+                if prefix:
+                    raise FastPathUnsupported(name)
+                # Qiymatni map() oxirida fastpath_fill_<name>() yozadi
+                steps.append((name, placeholder))
+                self.paths.update(getattr(serializer, 'sparse_sources', {}).get(name, ()))
+                continue
+            if name in declared:
+                paths, func = declared[name]
+                steps.append((name, self._computed(paths, func)))
+                continue
+            if isinstance(field, serializers.BaseSerializer):
+                steps.append((name, self._nested(model, name, field, prefix, declared)))
+                continue
+            steps.append((name, self._simple(model, field, prefix)))
+        return steps
+
+    def _computed(self, paths, func):
+        self.paths.update(paths)
+
+        def compute(row, request):
+            return func(*(row[path] for path in paths))
+        return compute
+
+    def _nested(self, model, name, field, prefix, declared):
+        if isinstance(field, serializers.ListSerializer):
+            raise FastPathUnsupported(name)
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            raise FastPathUnsupported(name)
+        if not model_field.many_to_one:
+            raise FastPathUnsupported(name)
+
+        fk_path = prefix + model_field.name
+        self.paths.add(fk_path)
+        # Ota serializer'dagi 'category.posts_count' kabi almashtirishlar
+        overrides = {
+            key.split('.', 1)[1]: value
+            for key, value in declared.items() if key.startswith(name + '.')
+        }
+        steps = self._compile(field, fk_path + '__', overrides)
+
+        def nested(row, request):
+            if row[fk_path] is None:
+                return None
+            return {key: step(row, request) for key, step in steps}
+        return nested
+
+    def _simple(self, model, field, prefix):
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            raise FastPathUnsupported(field.field_name)
+        if not model_field.concrete:
+            raise FastPathUnsupported(field.field_name)
+
+        path = prefix + model_field.name
+        self.paths.add(path)
+
+        if isinstance(field, drf_fields.ChoiceField):
+            if any(str(key) != value for key, value in field.choice_strings_to_values.items()):
+                convert = field.to_representation
+            else:
+                convert = identity
+        elif isinstance(field, IDENTITY_FIELDS):
+            convert = identity
+        elif isinstance(field, drf_fields.DateTimeField):
+            convert = field.to_representation
+        elif isinstance(field, drf_fields.FileField):
+            return self._file(path, model_field)
+        elif isinstance(field, ImageVariantsField):
+            return self._image_variants(path, model, field)
+        else:
+            raise FastPathUnsupported(field.field_name)
+
+        def simple(row, request):
+            value = row[path]
+            return None if value is None else convert(value)
+        return simple
+
+    def _file(self, path, model_field):
+        storage = model_field.storage
+
+        def file_url(row, request):
+            name = row[path]
+            if not name:
+                return None
+            url = storage.url(name)
+            return request.build_absolute_uri(url) if request is not None else url
+        return file_url
+
+    def _image_variants(self, path, model, field):
+        storage = model._meta.get_field(field.image_field).storage
+
+        def srcset(row, request):
+            return ImageVariantsField.build(row[path], storage, request)
+        return srcset
+
+    def map_rows(self, rows, request=None):
+        """Fill maydonlarisiz (ular None bo'lib qoladi)"""
+        steps = self.steps
+        return [{key: step(row, request) for key, step in steps} for row in rows]
+
+    def map(self, rows, request=None):
+        rows = list(rows)
+        with timed('serialize'):
+            output = self.map_rows(rows, request)
+            for name in self.fills:
+                getattr(self.serializer_class, f'fastpath_fill_{name}')(rows, output, self, request)
+        return output
+
+    async def amap(self, rows, request=None):
+        """Async view'lar uchun: fill hook'lari afastpath_fill_<name>() orqali"""
+        with timed('serialize'):
+            output = self.map_rows(rows, request)
+            for name in self.fills:
+                await getattr(self.serializer_class, f'afastpath_fill_{name}')(rows, output, self, request)
+        return output
+
+
+MAX_MAPPERS = 256  # ?fields= kombinatsiyalari cheklangan, lekin baribir - yuqori chegara
+_mappers = {}
+_field_trees = {}
+_missing = object()
+_mappers_lock = threading.Lock()
+
+
+def field_tree(serializer_class):
+    """{'id': None, 'author': {'id': None, ...}} - ichki serializer'lar uchun dict, qolganlari None"""
+    if serializer_class not in _field_trees:
+        _field_trees[serializer_class] = build_field_tree(serializer_class(context={'sparse_fields': None}).fields)
+    return _field_trees[serializer_class]
+
+
+def build_field_tree(fields):
+    tree = {}
+    for name, field in fields.items():
+        nested = getattr(field, 'child', field)
+        tree[name] = build_field_tree(nested.fields) if isinstance(nested, serializers.BaseSerializer) else None
+    return tree
+
+
+def freeze_spec(tree, spec):
+    """
+    Kesh kaliti - prune_fields natijasi bo'yicha: serializer'da yo'q nomlar tashlanadi,
+    shuning uchun klientning ixtiyoriy ?fields= qiymatlari yangi kalit yaratmaydi
+    """
+    key = []
+    for name in sorted(spec):
+        if name not in tree:
+            continue
+        nested = tree[name]
+        key.append((name, freeze_spec(nested, spec[name]) if nested is not None and spec[name] else None))
+    return tuple(key)
+
+
+def get_row_mapper(serializer_class, spec=None):
+    """(serializer, ?fields= spec) uchun keshlangan RowMapper; qo'llab bo'lmasa None"""
+    key = (serializer_class, freeze_spec(field_tree(serializer_class), spec) if spec else None)
+    mapper = _mappers.get(key, _missing)  # boshqa thread shu orada chiqarib yuborishi mumkin
+    if mapper is not _missing:
+        return mapper
+
+    # Request'siz nusxa - reja so'rovlar orasida bo'lishiladi
+    serializer = serializer_class(context={'sparse_fields': None})
+    if spec:
+        prune_fields(serializer.fields, spec)
+    try:
+        mapper = RowMapper(serializer)
+    except FastPathUnsupported:
+        mapper = None
+
+    with _mappers_lock:
+        if len(_mappers) >= MAX_MAPPERS:
+            _mappers.pop(next(iter(_mappers)), None)  # eng eskisi
+        _mappers[key] = mapper
+    return mapper
+
+
+# ============================================
+# VIEW MIXIN
+# ============================================
+class FastPathListMixin:
+    """
+    Faqat o'qish uchun ro'yxatlar: queryset.values() -> RowMapper -> dict.
+    Serializer qo'llab-quvvatlanmasa yoki FAST_PATH_LISTS=False bo'lsa - oddiy serializer.
+    """
+
+    def serialize_list(self, queryset):
+        mapper = self.get_row_mapper()
+        if mapper is None:
+            return super().serialize_list(queryset)
+
+        queryset = queryset.values(*sorted(mapper.paths))
+        page = self.paginate_queryset(queryset)
+        rows = mapper.map(page if page is not None else queryset, self.request)
+        if page is not None:
+            return self.get_paginated_response(rows)
+        return Response(rows)
+
+    def get_row_mapper(self):
+        if not getattr(settings, 'FAST_PATH_LISTS', False):
+            return None
+        spec = self.get_sparse_spec() if hasattr(self, 'get_sparse_spec') else None
+        return get_row_mapper(self.get_serializer_class(), spec)
@@ -0,0 +1,212 @@
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .metrics import record_phases, record_request
+from .query_budget import check_query_budget
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'SAMPLE_RATE': 1.0,  # 0..1 - shuncha ulush so'rov o'lchanadi (qolganlariga xarajat yo'q)
+    'SERVER_TIMING': True,  # Server-Timing header (brauzer DevTools'da ko'rinadi)
+    'LOG': True,
+    'SLOW_MS': 500,  # bundan sekin so'rovlar WARNING bilan loglanadi
+    # View'lardagi query_budget (blog.query_budget): None - tekshirmaslik,
+    # 'log' - WARNING va SQL'lar, 'raise' - QueryBudgetExceeded (dev/CI). Faqat sampled so'rovlar
+    'QUERY_BUDGET': None,
+}
+
+# Server-Timing / log / histogram'dagi bosqichlar
+PHASES = ('db', 'serialize', 'render')
+
+
+def get_config():
+    return dict(DEFAULTS, **getattr(settings, 'PERFORMANCE', {}))
+
+
+# ============================================
+# SO'ROV O'LCHOVLARI (ContextVar - sync_to_async thread'larga ham o'tadi)
+# ============================================
+class RequestMetrics:
+    """Bitta so'rov: SQL so'rovlar soni va bosqichlar vaqti (ms)"""
+
+    def __init__(self, capture_sql=False):
+        self.queries = 0
+        self.timings = dict.fromkeys(PHASES, 0.0)
+        self.active = set()  # ichma-ich timed() ikki marta sanalmasin
+        self.statements = [] if capture_sql else None  # query budget xabari uchun
+
+    def server_timing(self, total_ms):
+        parts = [f'total;dur={total_ms:.1f}', f'db;dur={self.timings["db"]:.1f};desc="{self.queries} queries"']
+        parts.extend(f'{phase};dur={self.timings[phase]:.1f}' for phase in PHASES if phase != 'db')
+        return ', '.join(parts)
+
+
+_metrics = ContextVar('request_metrics', default=None)
+
+
+def current_metrics():
+    return _metrics.get()
+
+
+@contextmanager
+def timed(phase):
+    """
+    Blok vaqtini joriy so'rovning phase bosqichiga qo'shish.
+    O'lchanmayotgan so'rovda va ichma-ich chaqiruvda hech narsa qilmaydi.
+    """
+    metrics = _metrics.get()
+    if metrics is None or phase in metrics.active:
+        yield
+        return
+    metrics.active.add(phase)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.timings[phase] += (time.perf_counter() - started) * 1000
+        metrics.active.discard(phase)
+
+
+def time_queries(execute, sql, params, many, context):
+    """connection.execute_wrappers uchun: so'rovlar soni va DB vaqti"""
+    metrics = _metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.timings['db'] += (time.perf_counter() - started) * 1000
+        if metrics.statements is not None:
+            metrics.statements.append(sql)
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """connection_created signali: har bir (shu jumladan async thread'dagi) ulanishga bir marta"""
+    if time_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_queries)
+
+
+# ============================================
+# MIDDLEWARE
+# ============================================
+class PerformanceMiddleware:
+    """
+    Har bir so'rov: blog.metrics'dagi so'rovlar soni, latency va kesh hit/miss.
+    SAMPLE_RATE ulush so'rov uchun qo'shimcha: SQL so'rovlar soni, DB, serializer va render vaqti -
+    Server-Timing header, bitta log qatori (extra={'performance': {...}}) va bosqich histogram'lari.
+    QUERY_BUDGET yoqilgan bo'lsa - view'ning query_budget'i ham tekshiriladi.
+
+    MIDDLEWARE ro'yxatida birinchi turishi kerak - total boshqa middleware'larni ham o'z ichiga oladi.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        config = get_config()
+        if not config['ENABLED']:
+            return self.get_response(request)
+        metrics = self.start(config)
+        token = _metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _metrics.reset(token)
+        self.record(config, request, response, metrics, (time.perf_counter() - started) * 1000)
+        return response
+
+    async def __acall__(self, request):
+        config = get_config()
+        if not config['ENABLED']:
+            return await self.get_response(request)
+        metrics = self.start(config)
+        token = _metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _metrics.reset(token)
+        self.record(config, request, response, metrics, (time.perf_counter() - started) * 1000)
+        return response
+
+    def process_template_response(self, request, response):
+        """
+        DRF Response/TemplateResponse view'dan keyin render qilinadi - shu render() qaysi renderer
+        (JSON, browsable API, HTML) bo'lishidan qat'i nazar 'render' bosqichiga yoziladi.
+        View ichida render qilinadiganlar (blog.cache) o'zi timed('render') ishlatadi.
+        """
+        if _metrics.get() is not None:
+            render = response.render
+
+            def timed_render():
+                with timed('render'):
+                    return render()
+            response.render = timed_render
+        return response
+
+    def start(self, config):
+        rate = config['SAMPLE_RATE']
+        if rate > 0 and (rate >= 1 or random.random() < rate):
+            return RequestMetrics(capture_sql=bool(config['QUERY_BUDGET']))
+        return None
+
+    def record(self, config, request, response, metrics, total_ms):
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match is not None else '<unresolved>'
+        record_request(view_name, request.method, response.status_code, total_ms / 1000, response.get('X-Cache'))
+        if metrics is None:
+            return
+
+        if config['SERVER_TIMING']:
+            response['Server-Timing'] = metrics.server_timing(total_ms)
+        record_phases(view_name, metrics.queries, metrics.timings)
+
+        if config['LOG']:
+            level = logging.WARNING if total_ms >= config['SLOW_MS'] else logging.INFO
+            if logger.isEnabledFor(level):
+                record = {
+                    'view': view_name, 'method': request.method, 'status': response.status_code,
+                    'total_ms': round(total_ms, 2), 'queries': metrics.queries,
+                    **{f'{phase}_ms': round(value, 2) for phase, value in metrics.timings.items()},
+                }
+                logger.log(
+                    level, ' '.join(f'{key}={value}' for key, value in record.items()),
+                    extra={'performance': record},
+                )
+
+        # Stream javob so'rovlari header'dan keyin bajariladi - bu yerda to'liq emas
+        if config['QUERY_BUDGET'] and not response.streaming:
+            check_query_budget(config['QUERY_BUDGET'], request, view_name, metrics.queries, metrics.statements)
+
+
+# ============================================
+# SERIALIZER MIXIN
+# ============================================
+class TimedRepresentationMixin:
+    """
+    to_representation vaqti 'serialize' bosqichiga yoziladi (ichma-ich serializer'lar bir marta).
+    Serializer ichidagi so'rovlar (N+1) db'da ham, serialize'da ham ko'rinadi.
+    """
+
+    def to_representation(self, instance):
+        with timed('serialize'):
+            return super().to_representation(instance)
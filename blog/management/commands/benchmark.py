@@ -0,0 +1,396 @@
+import itertools
+import json
+import platform
+import re
+import statistics
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+import django
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.db import close_old_connections, connection, connections
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from blog.models import Category, Comment, Post
+from blog.pagination import KeysetPagination
+
+from .loadtest import percentile
+from .seed_blog import PASSWORD
+
+
+# (nom, url name, path kwarg'lari, query, metod, token kerakmi)
+# {category}, {post}, {slug}, {user}, {word}, {deep_page}, {deep_cursor} - seed qilingan ma'lumotdan
+SCENARIOS = (
+    ('categories', 'category-list', {}, '', 'GET', False),
+    ('category', 'category-detail', {'pk': '{category}'}, '', 'GET', False),
+    ('posts', 'post-list', {}, '', 'GET', False),
+    ('posts-category', 'post-list', {}, 'category={category}', 'GET', False),
+    ('posts-search', 'post-list', {}, 'search={word}', 'GET', False),
+    ('posts-activity', 'post-list', {}, 'ordering=-last_activity_at', 'GET', False),
+    ('posts-sparse', 'post-list', {}, 'fields=id,title,slug,author.username', 'GET', False),
+    # Bitta chuqur sahifa ikki usulda: OFFSET (?page=) va keyset (?cursor=)
+    ('posts-page-deep', 'post-list', {}, 'page={deep_page}', 'GET', False),
+    ('posts-cursor-deep', 'post-list', {}, 'cursor={deep_cursor}', 'GET', False),
+    ('post', 'post-detail', {'slug': '{slug}'}, '', 'GET', False),
+    ('my-posts', 'my-posts', {}, '', 'GET', True),
+    ('posts-export', 'post-export', {}, '', 'GET', True),
+    ('comments', 'comment-list', {}, '', 'GET', False),
+    ('post-comments', 'comment-list', {}, 'post={post}', 'GET', False),
+    ('comments-export', 'comment-export', {}, '', 'GET', True),
+    ('profile', 'profile', {}, '', 'GET', True),
+    ('user', 'user-detail', {'pk': '{user}'}, '', 'GET', False),
+    ('login', 'login', {}, '', 'POST', False),
+)
+
+# Javob tanasi stream qilinadi - so'rovlar header yuborilgandan keyin, Server-Timing'da ko'rinmaydi
+STREAMING_ENDPOINTS = {'post-export', 'comment-export'}
+
+# Ma'lumot o'zgartiradigan endpoint'lar - benchmark qilinmaydi
+WRITE_ENDPOINTS = {
+    'post-create', 'post-update', 'post-delete', 'post-bulk-create',
+    'comment-create', 'comment-update', 'comment-delete', 'comment-bulk-create',
+    'register', 'logout', 'token_refresh',
+}
+
+# Offset va keyset solishtiriladigan scenario juftlari
+DEEP_PAGE_SCENARIOS = ('posts-page-deep', 'posts-cursor-deep')
+
+SERVER_TIMING_QUERIES = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class BenchmarkServer(ThreadedWSGIServer):
+    request_queue_size = 128
+
+
+class Command(BaseCommand):
+    """
+    blog.urls va accounts.urls endpoint'lari uchun benchmark: p50/p95/p99, so'rov boshiga
+    SQL so'rovlar soni va throughput. Natija JSON - commit'lar orasida solishtirish uchun.
+
+        python manage.py seed_blog --posts 2000
+        python manage.py benchmark --json before.json
+        python manage.py benchmark --server --baseline before.json --threshold 0.15
+        python manage.py benchmark --only posts-page-deep posts-cursor-deep --deep-page 1000
+
+    --server - shu jarayonda haqiqiy HTTP server (ThreadedWSGIServer) ko'tariladi,
+    --url http://127.0.0.1:8000 - ishlab turgan server (gunicorn); aks holda test Client.
+    SQL so'rovlar soni Server-Timing header'dan olinadi (blog.instrumentation).
+
+    posts-page-deep / posts-cursor-deep - --deep-page sahifasi (jadvaldagi oxirgi sahifagacha)
+    OFFSET va keyset bilan; seed_blog --posts bilan jadvalni kattalashtirib, farq o'sishini ko'ring.
+    """
+    help = "API endpoint'larini o'lchaydi va baseline'ga nisbatan regressiyani tekshiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Har bir endpoint uchun so'rovlar")
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--server', action='store_true', help='Lokal HTTP server orqali')
+        parser.add_argument('--url', help='Tashqi server manzili, masalan http://127.0.0.1:8000')
+        parser.add_argument('--only', nargs='*', help='Faqat shu scenario nomlari')
+        parser.add_argument('--allow-cache', action='store_true',
+                            help="Javob keshidan foydalanish (standart: har so'rovga unique ?_bench=)")
+        parser.add_argument('--deep-page', type=int, default=1000,
+                            help="Offset/keyset solishtiriladigan sahifa (postlar kam bo'lsa - oxirgisi)")
+        parser.add_argument('--password', default=PASSWORD, help='Seed userlar paroli (login scenario)')
+        parser.add_argument('--json', dest='output', help='Natijani shu faylga yozish')
+        parser.add_argument('--baseline', help='Oldingi --json natijasi')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help="p95 shuncha ulushga (0.2 = 20%%) oshsa - regressiya")
+        parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                            help="Bundan kichik farq shovqin hisoblanadi")
+
+    def handle(self, *args, **options):
+        self.check_coverage()
+        values, user = self.sample_values(options['deep_page'])
+        scenarios = [scenario for scenario in SCENARIOS if not options['only'] or scenario[0] in options['only']]
+        if not scenarios:
+            raise CommandError("--only bo'yicha scenario topilmadi")
+
+        with override_settings(PERFORMANCE={'SAMPLE_RATE': 1.0, 'SERVER_TIMING': True, 'LOG': False}):
+            server = None
+            if options['server']:
+                server = self.start_server()
+                base_url = f'http://127.0.0.1:{server.server_port}'
+            else:
+                base_url = options['url']
+            try:
+                results = {}
+                for name, url_name, kwargs, query, method, auth in scenarios:
+                    path = reverse(url_name, kwargs={key: value.format(**values) for key, value in kwargs.items()})
+                    if query:
+                        path = f'{path}?{query.format(**values)}'
+                    request = {
+                        'path': path, 'method': method, 'streaming': url_name in STREAMING_ENDPOINTS,
+                        'token': str(AccessToken.for_user(user)) if auth else None,
+                        'body': {'email': user.email, 'password': options['password']} if method == 'POST' else None,
+                    }
+                    results[name] = self.run_scenario(request, base_url, options)
+                    self.report(name, results[name])
+                self.report_deep_page(results, values)
+            finally:
+                if server is not None:
+                    server.shutdown()
+                    server.server_close()
+
+        output = {'meta': self.meta(options, base_url), 'results': results}
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump(output, file, indent=2)
+            self.stdout.write(f"Natija: {options['output']}")
+
+        if options['baseline']:
+            self.compare(results, options)
+
+    # ============================================
+    # TAYYORGARLIK
+    # ============================================
+    def check_coverage(self):
+        """blog.urls/accounts.urls dagi har endpoint scenario'da yoki WRITE_ENDPOINTS'da bo'lishi kerak"""
+        covered = {url_name for _, url_name, *_ in SCENARIOS} | WRITE_ENDPOINTS
+        missing = sorted(
+            name for name, module in url_names(get_resolver().url_patterns)
+            if module in ('blog.urls', 'accounts.urls') and name not in covered
+        )
+        if missing:
+            self.stderr.write(f"Benchmark'da yo'q endpoint'lar: {', '.join(missing)}")
+
+    def sample_values(self, deep_page):
+        post = (
+            Post.objects.filter(status='published').exclude(category=None)
+            .order_by('-approved_comments_count', 'pk').first()
+        )
+        if post is None:
+            raise CommandError("Ma'lumot yo'q: avval python manage.py seed_blog")
+        user = User.objects.filter(pk=post.author_id).first()
+        values = {
+            'category': post.category_id,
+            'post': post.pk,
+            'slug': post.slug,
+            'user': user.pk,
+            'word': 'django',
+            **deep_page_values(deep_page),
+        }
+        if not Comment.objects.filter(post=post).exists() or not Category.objects.exists():
+            self.stderr.write("Kommentariya yoki kategoriya yo'q - natija real bo'lmaydi")
+        return values, user
+
+    def start_server(self):
+        server = BenchmarkServer(('127.0.0.1', 0), QuietRequestHandler, allow_reuse_address=True)
+        server.set_app(WSGIHandler())
+        thread = threading.Thread(target=server.serve_forever, name='benchmark-server', daemon=True)
+        thread.start()
+        return server
+
+    # ============================================
+    # O'LCHASH
+    # ============================================
+    def run_scenario(self, request, base_url, options):
+        counter = itertools.count()
+        lock = threading.Lock()
+        run = uuid.uuid4().hex[:8]  # oldingi ishga tushirishlar keshiga tushmaslik uchun
+
+        def next_path():
+            path = request['path']
+            if options['allow_cache'] or request['method'] != 'GET':
+                return path
+            with lock:
+                number = next(counter)
+            return f"{path}{'&' if '?' in path else '?'}_bench={run}-{number}"
+
+        fetch = self.http_fetch(request, base_url) if base_url else self.client_fetch(request)
+        for _ in range(options['warmup']):
+            fetch(next_path())
+
+        total = options['requests']
+        remaining = itertools.count()
+        latencies, queries, errors = [], [], []
+
+        def worker():
+            local_latencies, local_queries, local_errors = [], [], 0
+            while next(remaining) < total:
+                started = time.perf_counter()
+                try:
+                    status, server_timing = fetch(next_path())
+                except Exception:
+                    status, server_timing = None, None
+                local_latencies.append(time.perf_counter() - started)
+                local_errors += status is None or status >= 400
+                match = SERVER_TIMING_QUERIES.search(server_timing or '')
+                if match and not request['streaming']:
+                    local_queries.append(int(match.group(1)))
+            connections.close_all()
+            with lock:
+                latencies.extend(local_latencies)
+                queries.extend(local_queries)
+                errors.append(local_errors)
+
+        threads = [threading.Thread(target=worker) for _ in range(max(1, options['concurrency']))]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            'path': request['path'],
+            'method': request['method'],
+            'requests': len(latencies),
+            'errors': sum(errors),
+            'rps': len(latencies) / elapsed if elapsed else 0.0,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p95_ms': percentile(latencies, 95) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+            'mean_ms': statistics.fmean(latencies) * 1000 if latencies else 0.0,
+            'queries': statistics.median(queries) if queries else None,
+            'queries_max': max(queries) if queries else None,
+        }
+
+    def client_fetch(self, request):
+        local = threading.local()
+        headers = {'HTTP_ACCEPT': 'application/json'}
+        if request['token']:
+            headers['HTTP_AUTHORIZATION'] = f"Bearer {request['token']}"
+
+        def fetch(path):
+            client = getattr(local, 'client', None)
+            if client is None:
+                client = local.client = Client()
+            if request['method'] == 'POST':
+                response = client.post(path, request['body'], content_type='application/json', **headers)
+            else:
+                response = client.get(path, **headers)
+            if getattr(response, 'streaming', False):
+                b''.join(response.streaming_content)
+            # Test client ulanishni yopmaydi - server xatti-harakatini takrorlash
+            close_old_connections()
+            return response.status_code, response.get('Server-Timing')
+        return fetch
+
+    def http_fetch(self, request, base_url):
+        headers = {'Accept': 'application/json'}
+        if request['token']:
+            headers['Authorization'] = f"Bearer {request['token']}"
+        body = None
+        if request['body'] is not None:
+            body = json.dumps(request['body']).encode()
+            headers['Content-Type'] = 'application/json'
+
+        def fetch(path):
+            http_request = urllib.request.Request(
+                base_url.rstrip('/') + path, data=body, headers=headers, method=request['method'],
+            )
+            try:
+                with urllib.request.urlopen(http_request, timeout=30) as response:
+                    response.read()
+                    return response.status, response.headers.get('Server-Timing')
+            except urllib.error.HTTPError as exc:
+                return exc.code, exc.headers.get('Server-Timing')
+        return fetch
+
+    # ============================================
+    # NATIJA
+    # ============================================
+    def report(self, name, result):
+        queries = '-' if result['queries'] is None else f"{result['queries']:g}"
+        self.stdout.write(
+            f"{name:<18} p50 {result['p50_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms  "
+            f"p99 {result['p99_ms']:7.1f} ms  {result['rps']:7.1f} req/s  queries {queries:>3}  "
+            f"xato {result['errors']}"
+        )
+
+    def report_deep_page(self, results, values):
+        offset, keyset = (results.get(name) for name in DEEP_PAGE_SCENARIOS)
+        if offset is None or keyset is None or not keyset['p50_ms']:
+            return
+        self.stdout.write(
+            f"sahifa {values['deep_page']}: OFFSET p50 {offset['p50_ms']:.1f} ms, "
+            f"keyset p50 {keyset['p50_ms']:.1f} ms ({offset['p50_ms'] / keyset['p50_ms']:.1f}x)"
+        )
+
+    def meta(self, options, base_url):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5,
+            ).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            commit = None
+        return {
+            'commit': commit,
+            'created_at': timezone.now().isoformat(),
+            'mode': 'url' if options['url'] else 'server' if options['server'] else 'client',
+            'base_url': base_url,
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'allow_cache': options['allow_cache'],
+            'deep_page': options['deep_page'],
+            'posts': Post.objects.filter(status='published').count(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+        }
+
+    def compare(self, results, options):
+        with open(options['baseline']) as file:
+            baseline = json.load(file)['results']
+
+        regressions = []
+        for name, result in results.items():
+            before = baseline.get(name)
+            if before is None:
+                continue
+            delta = result['p95_ms'] - before['p95_ms']
+            if delta > options['min_delta_ms'] and delta > before['p95_ms'] * options['threshold']:
+                regressions.append(f"{name}: p95 {before['p95_ms']:.1f} -> {result['p95_ms']:.1f} ms")
+            if result['queries'] is not None and before.get('queries') is not None \
+                    and result['queries'] > before['queries']:
+                regressions.append(f"{name}: queries {before['queries']:g} -> {result['queries']:g}")
+            if result['errors'] > before.get('errors', 0):
+                regressions.append(f"{name}: xatolar {before.get('errors', 0)} -> {result['errors']}")
+
+        if regressions:
+            for line in regressions:
+                self.stderr.write(line)
+            raise CommandError(f"{len(regressions)} ta regressiya (threshold {options['threshold']:.0%})")
+        self.stdout.write(self.style.SUCCESS('Baseline bilan solishtirildi: regressiya yo\'q'))
+
+
+def deep_page_values(deep_page):
+    """?page=deep_page va aynan shu sahifani beradigan cursor (oldingi sahifaning oxirgi posti)"""
+    pagination = KeysetPagination()
+    published = Post.objects.filter(status='published')
+    pages = max(1, -(-published.count() // pagination.page_size))
+    page = max(1, min(deep_page, pages))
+    offset = (page - 1) * pagination.page_size
+    cursor = ''
+    if offset:
+        previous = published.order_by(*pagination.ordering)[offset - 1]
+        cursor = pagination.encode_cursor(previous)
+    return {'deep_page': page, 'deep_cursor': cursor}
+
+
+def url_names(patterns, module=None):
+    """(url name, urls moduli) - include() ichidagilar ham"""
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from url_names(pattern.url_patterns, getattr(pattern.urlconf_name, '__name__', pattern.urlconf_name))
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            yield pattern.name, module
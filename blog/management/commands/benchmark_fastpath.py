@@ -0,0 +1,104 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+from blog import fastpath
+from blog.models import Comment, Post
+from blog.serializers import CommentSerializer, PostListSerializer
+from blog.sparse import parse_fields
+
+
+class Command(BaseCommand):
+    """
+    Ro'yxat fast path'i (blog.fastpath) o'lchovi: bir xil qatorlar uchun
+    ModelSerializer(many=True).data va RowMapper.map(queryset.values()) - qator/soniya.
+    "serialize" - faqat dict yasash, "jami" - SQL o'qish bilan birga.
+
+        python manage.py seed_blog --posts 5000
+        python manage.py benchmark_fastpath --rows 1000 --repeat 5
+        python manage.py benchmark_fastpath --fields id,title,author.username --json
+    """
+    help = "RowMapper va ModelSerializer serializatsiya tezligini (qator/soniya) solishtiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--fields', default='', help="?fields= qiymati (bo'sh - hamma maydonlar)")
+        parser.add_argument('--json', action='store_true', help='Natijani JSON ko\'rinishida chiqarish')
+
+    def handle(self, *args, **options):
+        cases = [
+            ('posts', PostListSerializer,
+             Post.objects.filter(status='published').select_related('author', 'category')),
+            ('comments', CommentSerializer,
+             Comment.objects.filter(is_approved=True).select_related('author').with_counts()),
+        ]
+        spec = parse_fields(options['fields'])
+        request = Request(RequestFactory().get('/api/', {'fields': options['fields']} if spec else {}))
+
+        results = []
+        for name, serializer_class, queryset in cases:
+            queryset = queryset.order_by('-created_at', '-id')[:max(1, options['rows'])]
+            mapper = fastpath.get_row_mapper(serializer_class, spec)
+            if mapper is None:
+                raise CommandError(f'{serializer_class.__name__}: fast path qo\'llab-quvvatlanmaydi')
+            count = queryset.count()
+            if not count:
+                continue
+
+            context = {'request': request, 'sparse_fields': spec}
+            results.append({
+                'name': name,
+                'rows': count,
+                'serializer': self.measure(
+                    lambda: list(queryset.all()),
+                    lambda objects: serializer_class(objects, many=True, context=context).data,
+                    count, options['repeat'],
+                ),
+                'fastpath': self.measure(
+                    lambda: list(queryset.values(*sorted(mapper.paths))),
+                    lambda rows: mapper.map(rows, request),
+                    count, options['repeat'],
+                ),
+            })
+
+        if not results:
+            raise CommandError("Post/comment yo'q (seed_blog bilan yarating)")
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for result in results:
+            self.stdout.write(f"{result['name']}: {result['rows']} ta qator")
+            for label in ('serializer', 'fastpath'):
+                stats = result[label]
+                self.stdout.write(
+                    f"  {label}: serialize {stats['serialize_rows_per_sec']:,.0f} qator/s, "
+                    f"jami {stats['total_rows_per_sec']:,.0f} qator/s"
+                )
+            speedup = result['fastpath']['serialize_rows_per_sec'] / result['serializer']['serialize_rows_per_sec']
+            self.stdout.write(f'  fast path {speedup:.1f}x tezroq (serialize)')
+
+    def measure(self, fetch, serialize, count, repeat):
+        """Median vaqtlar: fetch() (SQL + model/dict) va serialize(natija)"""
+        fetch_times, serialize_times = [], []
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            rows = fetch()
+            fetched = time.perf_counter()
+            serialize(rows)
+            fetch_times.append(fetched - started)
+            serialize_times.append(time.perf_counter() - fetched)
+
+        serialize_time = statistics.median(serialize_times)
+        total_time = statistics.median(fetch_times) + serialize_time
+        return {
+            'serialize_ms': serialize_time * 1000,
+            'total_ms': total_time * 1000,
+            'serialize_rows_per_sec': count / serialize_time,
+            'total_rows_per_sec': count / total_time,
+        }
@@ -0,0 +1,73 @@
+import json
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from blog.models import Post
+from blog.search import IContainsSearchBackend, get_search_backend
+
+from .seed_blog import WORDS
+
+
+class Command(BaseCommand):
+    """
+    ?search= o'lchovi: bazaga mos full-text backend (blog.search) va eski ILIKE
+    (IContainsSearchBackend, DRF SearchFilter bilan bir xil) bir xil so'rovlarda.
+    PostListView kabi birinchi sahifa (20 ta) o'qiladi.
+
+        python manage.py seed_blog --posts 200000 --comments 0
+        python manage.py benchmark_search --queries 50
+    """
+    help = "Full-text qidiruv va ILIKE qidiruvini bir xil so'rovlarda solishtiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', type=int, default=30)
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=5)
+        parser.add_argument('--json', action='store_true', help='Natijani JSON ko\'rinishida chiqarish')
+
+    def handle(self, *args, **options):
+        total = Post.objects.filter(status='published').count()
+        if not total:
+            raise CommandError("Published post yo'q (seed_blog bilan yarating)")
+
+        rnd = random.Random(options['seed'])
+        queries = [
+            ' '.join(rnd.sample(WORDS, rnd.choice((1, 1, 2)))) for _ in range(max(1, options['queries']))
+        ]
+        backends = {
+            f'full-text ({connection.vendor})': get_search_backend(),
+            'icontains': IContainsSearchBackend(),
+        }
+        results = [
+            dict(self.measure(backend, queries, options['page_size']), backend=name, posts=total)
+            for name, backend in backends.items()
+        ]
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f'{total} ta published post, {len(queries)} ta so\'rov')
+        for result in results:
+            self.stdout.write(
+                f"{result['backend']}: median {result['median_ms']:.1f} ms, "
+                f"p95 {result['p95_ms']:.1f} ms, o'rtacha {result['mean_hits']:.1f} natija/sahifa"
+            )
+
+    def measure(self, backend, queries, page_size):
+        timings, hits = [], []
+        base = Post.objects.filter(status='published').select_related('author', 'category')
+        for query in queries:
+            started = time.perf_counter()
+            page = list(backend.search(base, query)[:page_size])
+            timings.append((time.perf_counter() - started) * 1000)
+            hits.append(len(page))
+        timings.sort()
+        return {
+            'median_ms': statistics.median(timings),
+            'p95_ms': timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+            'mean_hits': statistics.mean(hits),
+        }
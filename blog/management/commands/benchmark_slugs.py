@@ -0,0 +1,86 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from accounts.models import User
+from blog.models import Post
+from blog.slugs import allocate_slugs
+
+
+class QueryCounter:
+    """connection.execute_wrapper - queries_log (9000 ta) chegarasisiz so'rovlar soni"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    """
+    Bir xil sarlavhali postlar uchun slug ajratish o'lchovi (blog.slugs):
+    Post.objects.create() - birinchi va oxirgi postlar vaqti/so'rovlari bir xil bo'lishi kerak,
+    allocate_slugs() - butun batch uchun bitta SELECT.
+
+        python manage.py benchmark_slugs --count 10000
+        python manage.py benchmark_slugs --count 10000 --json
+
+    Hamma yozuvlar tranzaksiya ichida va oxirida rollback qilinadi.
+    PostgreSQL'da slug LIKE 'stem-%' unique slug indeksidan (varchar_pattern_ops) o'qiladi;
+    SQLite'da LIKE/REGEXP indekssiz - u yerda vaqt N bilan o'sadi.
+    """
+    help = "Bir xil sarlavhali N ta post uchun slug ajratish vaqtini o'lchaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=10000)
+        parser.add_argument('--title', default='Benchmark same title')
+        parser.add_argument('--json', action='store_true', help='Natijani JSON ko\'rinishida chiqarish')
+
+    def handle(self, *args, **options):
+        author = User.objects.order_by('pk').first()
+        if author is None:
+            raise CommandError('User topilmadi (seed_blog bilan yarating)')
+        count = max(2, options['count'])
+
+        queries = QueryCounter()
+        with transaction.atomic(), connection.execute_wrapper(queries):
+            timings, counts = [], []
+            for _ in range(count):
+                started, before = time.perf_counter(), queries.count
+                Post.objects.create(title=options['title'], content='x', author=author)
+                timings.append((time.perf_counter() - started) * 1000)
+                counts.append(queries.count - before)
+
+            started, before = time.perf_counter(), queries.count
+            slugs = allocate_slugs(Post, [options['title']] * count)
+            batch_ms = (time.perf_counter() - started) * 1000
+            batch_queries = queries.count - before
+            if len(set(slugs)) != count:
+                raise CommandError('allocate_slugs takroriy slug qaytardi')
+            transaction.set_rollback(True)
+
+        tenth = max(1, count // 10)
+        result = {
+            'count': count,
+            'first_median_ms': statistics.median(timings[1:tenth + 1]),
+            'last_median_ms': statistics.median(timings[-tenth:]),
+            'first_queries': counts[1],
+            'last_queries': counts[-1],
+            'total_s': sum(timings) / 1000,
+            'batch_ms': batch_ms,
+            'batch_queries': batch_queries,
+        }
+        if options['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        self.stdout.write(
+            f"create(): birinchi 10% median {result['first_median_ms']:.2f} ms ({result['first_queries']} SQL), "
+            f"oxirgi 10% median {result['last_median_ms']:.2f} ms ({result['last_queries']} SQL), "
+            f"jami {result['total_s']:.1f} s\n"
+            f"allocate_slugs({count}): {batch_ms:.0f} ms, {batch_queries} SQL"
+        )
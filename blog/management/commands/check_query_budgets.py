@@ -0,0 +1,259 @@
+import inspect
+import io
+import json
+import re
+import uuid
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import get_resolver, resolve, reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+import accounts.views
+import blog.views
+from accounts.models import User
+from blog.models import Category, Comment, Post
+from blog.query_budget import QueryBudgetExceeded, get_query_budget
+
+from .benchmark import SCENARIOS, STREAMING_ENDPOINTS, WRITE_ENDPOINTS, deep_page_values, url_names
+from .seed_blog import PASSWORD
+
+
+# (nom, url name, path kwarg'lari, metod, body) - {size} ta element bilan bulk body
+# {tmp_category}, {post}, {slug}, {delete_slug}, {comment}, {size}, {tag} - har o'lcham uchun seed'dan
+WRITE_SCENARIOS = (
+    ('category-create', 'category-list', {}, 'POST', {'name': 'Budget {tag}', 'slug': 'budget-{tag}'}),
+    ('category-update', 'category-detail', {'pk': '{tmp_category}'}, 'PATCH', {'description': 'budget'}),
+    ('post-create', 'post-create', {}, 'POST', {'title': 'Budget {tag}', 'content': 'x', 'status': 'published'}),
+    ('post-bulk-create', 'post-bulk-create', {}, 'POST', 'posts'),
+    ('post-update', 'post-update', {'slug': '{slug}'}, 'PATCH', {'title': 'Budget {tag}'}),
+    ('comment-create', 'comment-create', {}, 'POST', {'post': '{post}', 'content': 'budget'}),
+    ('comment-bulk-create', 'comment-bulk-create', {}, 'POST', 'comments'),
+    ('comment-update', 'comment-update', {'pk': '{comment}'}, 'PATCH', {'content': 'budget'}),
+    ('register', 'register', {}, 'POST',
+     {'email': 'budget-{tag}@example.com', 'username': 'budget-{tag}', 'password': PASSWORD,
+      'password2': PASSWORD}),
+    # O'chirish oxirida - oldingi scenario'lar shu qatorlarni ishlatadi
+    ('comment-delete', 'comment-delete', {'pk': '{comment}'}, 'DELETE', None),
+    ('post-delete', 'post-delete', {'slug': '{delete_slug}'}, 'DELETE', None),
+    ('category-delete', 'category-detail', {'pk': '{tmp_category}'}, 'DELETE', None),
+)
+
+# Scenario'siz endpoint'lar: token_refresh - simplejwt view'i;
+# logout - token_blacklist ilovasi INSTALLED_APPS'da yo'q, javob har doim 400
+UNCHECKED_ENDPOINTS = {'token_refresh', 'logout'}
+
+SERVER_TIMING_QUERIES = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+class Command(BaseCommand):
+    """
+    blog.views va accounts.views'dagi har view'ning query_budget'ini tekshiradi (CI uchun, exit code 1):
+    ma'lumot har xil hajmda (--sizes) seed qilinadi, har endpoint chaqiriladi va
+
+      - SQL so'rovlar soni budjetdan oshsa (SQL'lar fingerprint bo'yicha guruhlangan),
+      - so'rovlar soni ma'lumot hajmi bilan o'ssa (N+1 - budjet ichida bo'lsa ham),
+      - view'da query_budget e'lon qilinmagan bo'lsa - xato.
+
+        python manage.py check_query_budgets
+        python manage.py check_query_budgets --sizes 5 50 --verbose
+        call_command('check_query_budgets')  # testdan - xato bo'lsa CommandError
+
+    Har o'lcham alohida tranzaksiyada, oxirida rollback. Stream javobli view'lar
+    (query_budget = None) tekshirilmaydi.
+    """
+    help = "View'larning SQL so'rovlar budjetini va N+1 yo'qligini tekshiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[3, 30],
+                            help="Seed qilinadigan postlar soni. 100 dan katta o'lchamda CASCADE "
+                                 "o'chirish Django'ning 100 talik DELETE batch'lariga bo'linadi")
+        parser.add_argument('--verbose', action='store_true', help="Har endpoint so'rovlar sonini chiqarish")
+
+    def handle(self, *args, **options):
+        sizes = sorted(set(options['sizes']))
+        failures = self.check_declarations() + self.check_coverage()
+
+        counts = {}
+        for size in sizes:
+            with transaction.atomic():
+                values, user = self.seed(size)
+                for name, count in self.run_scenarios(values, user).items():
+                    counts.setdefault(name, []).append(count)
+                transaction.set_rollback(True)
+
+        for name, results in counts.items():
+            view_class, method = results[0][:2]
+            failures += self.report(name, view_class, method, [result for *_, result in results], sizes,
+                                    options['verbose'])
+
+        if failures:
+            raise CommandError(f'{failures} ta query budget xatosi')
+        self.stdout.write(self.style.SUCCESS(f"Barcha view'lar budjet ichida (o'lchamlar: {sizes})"))
+
+    # ============================================
+    # E'LONLAR
+    # ============================================
+    def check_declarations(self):
+        """Har bir APIView'da query_budget bo'lishi kerak (None - ataylab tekshirilmaydi)"""
+        failures = 0
+        for module in (blog.views, accounts.views):
+            for name, view_class in inspect.getmembers(module, inspect.isclass):
+                if view_class.__module__ != module.__name__ or not hasattr(view_class, 'as_view'):
+                    continue
+                if not hasattr(view_class, 'query_budget'):
+                    failures += 1
+                    self.stdout.write(self.style.ERROR(f'{module.__name__}.{name}: query_budget yo\'q'))
+        return failures
+
+    def check_coverage(self):
+        """Har endpoint scenario'da bo'lishi kerak (stream va UNCHECKED_ENDPOINTS'dan tashqari)"""
+        covered = (
+            {url_name for _, url_name, *_ in SCENARIOS + WRITE_SCENARIOS}
+            | STREAMING_ENDPOINTS | UNCHECKED_ENDPOINTS
+        )
+        missing = sorted(
+            name for name, module in url_names(get_resolver().url_patterns)
+            if module in ('blog.urls', 'accounts.urls') and name not in covered
+        )
+        for name in missing:
+            self.stdout.write(self.style.ERROR(f'{name}: scenario yo\'q'))
+        return len(missing)
+
+    # ============================================
+    # O'LCHASH
+    # ============================================
+    def seed(self, size):
+        prefix = f'budget{size}-{uuid.uuid4().hex[:6]}'
+        call_command(
+            'seed_blog', users=max(3, size // 10), categories=3, posts=size, comments=max(3, size / 5),
+            depth=3, prefix=prefix, stdout=io.StringIO(),
+        )
+        post = (
+            Post.objects.filter(status='published', slug__startswith=f'{prefix}-').exclude(category=None)
+            .order_by('-approved_comments_count', 'pk').first()
+        )
+        if post is None:
+            raise CommandError(f'--sizes {size}: published post yaratilmadi, kattaroq o\'lcham bering')
+        user = User.objects.get(pk=post.author_id)
+        category = Category.objects.create(name=f'{prefix} tmp', slug=f'{prefix}-tmp')
+        delete_post = Post.objects.create(
+            title=f'{prefix} delete', slug=f'{prefix}-delete', content='x', author=user, status='published',
+        )
+        comment = Comment.objects.create(post=post, author=user, content='budget')
+        # O'chiriladigan qatorlar: shakli (daraxt chuqurligi) o'zgarmas, kengligi - size.
+        # Cascade har daraja uchun so'rov qiladi - o'lchamlar solishtiriladigan bo'lsin
+        for parent in (comment, None):
+            target = delete_post if parent is None else post
+            level = Comment.objects.bulk_create(
+                Comment(post=target, parent=parent, author=user, content='budget') for _ in range(size)
+            )
+            Comment.objects.bulk_create(
+                Comment(post=target, parent=reply, author=user, content='budget') for reply in level
+            )
+        values = {
+            'category': post.category_id, 'post': post.pk, 'slug': post.slug, 'user': user.pk, 'word': 'django',
+            'tmp_category': category.pk, 'delete_slug': delete_post.slug, 'comment': comment.pk,
+            'size': size, 'tag': prefix, **deep_page_values(2),
+        }
+        return values, user
+
+    def run_scenarios(self, values, user):
+        """{scenario: (view klassi, metod, so'rovlar soni yoki QueryBudgetExceeded)}"""
+        caches = {**settings.CACHES, 'query_budget': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+        response_cache = {**getattr(settings, 'RESPONSE_CACHE', {}), 'ALIAS': 'query_budget', 'WARM': {}}
+        replicas = {**getattr(settings, 'READ_REPLICAS', {}), 'ALIASES': []}
+        performance = {**getattr(settings, 'PERFORMANCE', {}), 'ENABLED': True, 'SAMPLE_RATE': 1.0,
+                       'SERVER_TIMING': True, 'LOG': False, 'QUERY_BUDGET': 'raise'}
+
+        token = f'Bearer {RefreshToken.for_user(user).access_token}'
+        results = {}
+        with override_settings(CACHES=caches, RESPONSE_CACHE=response_cache, READ_REPLICAS=replicas,
+                               PERFORMANCE=performance):
+            for name, url_name, kwargs, query, method, auth in SCENARIOS:
+                if url_name in WRITE_ENDPOINTS | STREAMING_ENDPOINTS:
+                    continue
+                path = reverse(url_name, kwargs=format_all(kwargs, values))
+                if query:
+                    path = f'{path}?{query.format(**values)}'
+                body = {'email': user.email, 'password': PASSWORD} if method == 'POST' else None
+                count = self.fetch(method, path, body, token if auth else None)
+                results[name] = (view_class(path), method, count)
+
+            for name, url_name, kwargs, method, body in WRITE_SCENARIOS:
+                path = reverse(url_name, kwargs=format_all(kwargs, values))
+                count = self.fetch(method, path, self.body(body, values), token)
+                results[name] = (view_class(path), method, count)
+        return results
+
+    def body(self, body, values):
+        if body == 'posts':
+            return [
+                {'title': f"Budget {values['tag']} {number}", 'content': 'x', 'status': 'published'}
+                for number in range(values['size'])
+            ]
+        if body == 'comments':
+            return [{'post': values['post'], 'content': f'budget {number}'} for number in range(values['size'])]
+        return format_all(body, values) if body else None
+
+    def fetch(self, method, path, body, token):
+        headers = {'HTTP_ACCEPT': 'application/json'}
+        if token:
+            headers['HTTP_AUTHORIZATION'] = token
+        # Har so'rovga yangi Client: xato exc_info'si keyingi so'rovga o'tmasin
+        try:
+            response = Client().generic(
+                method, path, json.dumps(body) if body is not None else '', content_type='application/json',
+                **headers,
+            )
+        except QueryBudgetExceeded as error:
+            return error
+        if response.status_code >= 400:
+            raise CommandError(f'{method} {path}: HTTP {response.status_code} {response.content[:300]!r}')
+        match = SERVER_TIMING_QUERIES.search(response.get('Server-Timing', ''))
+        if match is None:
+            raise CommandError(f"{method} {path}: Server-Timing yo'q (blog.instrumentation.PerformanceMiddleware)")
+        return int(match.group(1))
+
+    # ============================================
+    # NATIJA
+    # ============================================
+    def report(self, name, view_class, method, results, sizes, verbose):
+        budget = get_query_budget(view_class, method)
+        label = f'{name} ({method} {view_class.__name__})'
+        errors = [result for result in results if isinstance(result, QueryBudgetExceeded)]
+        if errors:
+            self.stdout.write(self.style.ERROR(f'{label}: budjetdan oshdi\n{errors[-1]}'))
+            return 1
+        trend = ' -> '.join(f'{count} ({size})' for count, size in zip(results, sizes))
+        if budget is None:
+            self.stdout.write(self.style.ERROR(f'{label}: {method} uchun query_budget yo\'q ({trend})'))
+            return 1
+        if results[-1] > results[0]:
+            self.stdout.write(self.style.ERROR(
+                f"{label}: so'rovlar ma'lumot bilan o'smoqda (N+1?): {trend}, budjet {budget}"
+            ))
+            return 1
+        if verbose:
+            self.stdout.write(f'{label}: {trend}, budjet {budget}')
+        return 0
+
+
+def view_class(path):
+    return resolve(path.split('?')[0]).func.view_class
+
+
+def format_all(data, values):
+    """dict/list ichidagi '{...}' qatorlar - values bilan (butun qiymat bo'lsa tipi saqlanadi)"""
+    if isinstance(data, dict):
+        return {key: format_all(value, values) for key, value in data.items()}
+    if isinstance(data, str):
+        if re.fullmatch(r'\{\w+\}', data):
+            return values[data[1:-1]]
+        return data.format(**values)
+    return data
+
@@ -0,0 +1,158 @@
+import re
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from blog.models import Category, Comment, Post
+
+
+# Endpoint -> tekshiriladigan so'rov. {category}, {author}, {post}, {slug} - namuna qatorlardan
+ENDPOINTS = (
+    '/api/posts/',
+    '/api/posts/?category={category}',
+    '/api/posts/?author={author}',
+    '/api/posts/?ordering=-last_activity_at',
+    '/api/posts/{slug}/',
+    '/api/posts/my/',
+    '/api/comments/',
+    '/api/comments/?post={post}',
+    '/api/posts/export/',
+    '/api/posts/export/?updated_since=2000-01-01',
+    '/api/comments/export/',
+)
+# Login talab qiladigan endpointlar (namuna post muallifi sifatida)
+AUTHENTICATED = ('/api/posts/my/', '/api/posts/export/', '/api/comments/export/')
+
+# Shu jadvallarni to'liq o'qish (Seq Scan / SCAN ... indekssiz) - regressiya
+TABLES = ('blog_post', 'blog_comment')
+
+# Jadval (yoki alias) to'liq o'qiladigan reja qatorlari
+SEQ_SCAN = {
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'sqlite': re.compile(r'^SCAN (\w+)(?!.*\bUSING\b)', re.MULTILINE),
+}
+# Django subquery/JOIN alias'lari: "blog_comment" U0 (SQLite rejada faqat alias ko'rinadi)
+TABLE_ALIAS = re.compile(r'"(\w+)"\s+(?:AS\s+)?"?([A-Z]\d+)"?\b')
+
+
+class Command(BaseCommand):
+    """
+    Har bir ommaviy endpoint bajaradigan SELECT'lar uchun EXPLAIN va
+    TABLES dagi jadvallarda sequential scan bo'lsa - xato (CI uchun, exit code 1).
+
+        python manage.py check_query_plans              # bazadagi ma'lumot bilan
+        python manage.py check_query_plans --seed 500   # tranzaksiyada to'ldirib, oxirida rollback
+        python manage.py check_query_plans --verbose    # to'liq rejalar
+
+    PostgreSQL'da enable_seqscan = off: kichik jadvalda ham planner indeks tanlaydi,
+    Seq Scan qolgan bo'lsa - so'rovga mos indeks yo'q.
+    """
+    help = "Endpoint so'rovlarining EXPLAIN rejalarida sequential scan yo'qligini tekshiradi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help='Shuncha post (va commentlar) bilan to\'ldirish')
+        parser.add_argument('--verbose', action='store_true', help='Har bir so\'rov rejasini chiqarish')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in SEQ_SCAN:
+            raise CommandError(f'{connection.vendor} qo\'llab-quvvatlanmaydi')
+
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            if options['seed']:
+                self.seed(options['seed'])
+            failures = self.check_endpoints(options['verbose'])
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f'{failures} ta so\'rovda sequential scan')
+        self.stdout.write(self.style.SUCCESS('Barcha so\'rovlar indeks bilan bajariladi'))
+
+    def check_endpoints(self, verbose):
+        post = Post.objects.filter(status='published').exclude(category=None).order_by('-pk').first()
+        if post is None:
+            raise CommandError('Published post yo\'q: --seed bilan ishga tushiring')
+        values = {'category': post.category_id, 'author': post.author_id, 'post': post.pk, 'slug': post.slug}
+
+        failures = 0
+        for path in ENDPOINTS:
+            path = path.format(**values)
+            queries = self.capture(path, post.author)
+            scans = 0
+            for sql in queries:
+                plan = self.explain(sql)
+                scanned = self.scanned_tables(sql, plan)
+                if scanned:
+                    scans += 1
+                    self.stdout.write(self.style.ERROR(f"{path}: {', '.join(scanned)} - sequential scan"))
+                if scanned or verbose:
+                    self.stdout.write(f'  {sql}\n' + '\n'.join(f'  | {line}' for line in plan.splitlines()))
+            if not scans:
+                self.stdout.write(f'{path}: {len(queries)} ta so\'rov, OK')
+            failures += scans
+        return failures
+
+    def scanned_tables(self, sql, plan):
+        aliases = {alias: table for table, alias in TABLE_ALIAS.findall(sql)}
+        scanned = {aliases.get(name, name) for name in SEQ_SCAN[connection.vendor].findall(plan)}
+        return sorted(scanned & set(TABLES))
+
+    def capture(self, path, user):
+        """Endpoint bajargan SELECT'lar (javob keshi va replica'larsiz, oqim javoblari to'liq o'qiladi)"""
+        client = Client()
+        if path.startswith(AUTHENTICATED):
+            client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {AccessToken.for_user(user)}'
+        caches = {**settings.CACHES, 'query_plans': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+        response_cache = {**getattr(settings, 'RESPONSE_CACHE', {}), 'ALIAS': 'query_plans', 'WARM': {}}
+        replicas = {**getattr(settings, 'READ_REPLICAS', {}), 'ALIASES': []}
+        with override_settings(CACHES=caches, RESPONSE_CACHE=response_cache, READ_REPLICAS=replicas):
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(path, HTTP_ACCEPT='application/json')
+                if response.streaming:
+                    # Export so'rovlari oqim o'qilganda bajariladi
+                    b''.join(response.streaming_content)
+        if response.status_code != 200:
+            raise CommandError(f'{path}: HTTP {response.status_code}')
+        return [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT') and any(f'"{table}"' in query['sql'] for table in TABLES)
+        ]
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(f'EXPLAIN {sql}')
+                return '\n'.join(row[0] for row in cursor.fetchall())
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return '\n'.join(row[-1] for row in cursor.fetchall())
+
+    def seed(self, count):
+        """count ta post (har xil status/kategoriya), har biriga commentlar va javoblar"""
+        tag = uuid.uuid4().hex[:8]
+        author = User.objects.create_user(f'plans-{tag}@example.com', f'plans-{tag}', uuid.uuid4().hex)
+        categories = Category.objects.bulk_create(
+            Category(name=f'Plans {tag} {number}', slug=f'plans-{tag}-{number}') for number in range(5)
+        )
+        posts = Post.objects.bulk_create(
+            Post(
+                title=f'Plans {tag} {number}', slug=f'plans-{tag}-{number}', content='x', author=author,
+                category=categories[number % len(categories)],
+                status='published' if number % 4 else 'draft',
+            )
+            for number in range(count)
+        )
+        roots = Comment.objects.bulk_create(
+            Comment(post=post, author=author, content='x', is_approved=bool(number % 5))
+            for post in posts for number in range(3)
+        )
+        Comment.objects.bulk_create(
+            Comment(post_id=root.post_id, parent=root, author=author, content='x') for root in roots[::2]
+        )
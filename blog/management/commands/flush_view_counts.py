@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.view_counter import get_view_counter
+
+
+class Command(BaseCommand):
+    """
+    Buferdagi ko'rishlarni darhol bazaga yozish
+    python manage.py flush_view_counts
+    """
+    help = "Buferdagi ko'rishlar sonini (views_count) bazaga yozadi"
+
+    def handle(self, *args, **options):
+        counter = get_view_counter()
+        if not counter.store.shared:
+            raise CommandError(
+                f"{type(counter.store).__name__} worker jarayonlari buferini ko'rmaydi - "
+                "VIEW_COUNTER['STORE'] = 'blog.view_counter.SQLiteStore' kerak"
+            )
+        flushed = counter.flush()
+        self.stdout.write(self.style.SUCCESS(f'{flushed} ta post yangilandi'))
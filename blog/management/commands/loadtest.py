@@ -0,0 +1,185 @@
+import itertools
+import json
+import threading
+import time
+import urllib.request
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection, connections
+from django.db.backends.signals import connection_created
+from django.test import Client
+
+
+class Command(BaseCommand):
+    """
+    Oddiy yuklama testi: so'rov/sekund, kechikish va DB ulanishlar soni.
+    Pool yoqilgan va o'chirilgan holatni solishtirish uchun ikki marta ishga tushiriladi:
+
+        DB_POOL=0 python manage.py loadtest --path /api/categories/
+        DB_POOL=1 python manage.py loadtest --path /api/categories/
+
+    --url berilsa ishlab turgan serverga (gunicorn/uvicorn) HTTP so'rov yuboradi,
+    aks holda so'rovlar shu jarayonda django.test.Client orqali bajariladi.
+    """
+    help = "Endpoint'ga parallel so'rovlar yuborib RPS va DB ulanishlarini o'lchaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/categories/')
+        parser.add_argument('--url', help='Tashqi server, masalan http://127.0.0.1:8000/api/categories/')
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--duration', type=float, default=10.0, help='sekund')
+        parser.add_argument('--json', action='store_true', help='Natijani JSON ko\'rinishida chiqarish')
+        parser.add_argument('--allow-cache', action='store_true',
+                            help='Javob keshidan foydalanish (standart: har so\'rovga unique ?_lt=, DB ishlaydi)')
+
+    def handle(self, *args, **options):
+        opened = []
+        lock = threading.Lock()
+
+        def on_connection(sender, connection, **kwargs):
+            with lock:
+                opened.append(connection.alias)
+
+        connection_created.connect(on_connection, weak=False)
+        try:
+            result = self.run(options)
+        finally:
+            connection_created.disconnect(on_connection)
+
+        result['connections_opened'] = len(opened)
+        result['mode'] = self.db_mode()
+        if options['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+
+        self.stdout.write(
+            f"{result['mode']}: {result['requests']} so'rov, {result['rps']:.1f} req/s, "
+            f"p50 {result['p50_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms, xato {result['errors']}"
+        )
+        self.stdout.write(
+            f"Ochilgan ulanishlar: {result['connections_opened']}, "
+            f"serverdagi eng ko'p ulanishlar: {result['server_connections_max']}"
+        )
+
+    def run(self, options):
+        deadline = time.monotonic() + options['duration']
+        latencies, errors = [], []
+        lock = threading.Lock()
+        target = options['url'] or options['path']
+        if options['allow_cache']:
+            targets = itertools.repeat(target)
+        else:
+            separator = '&' if '?' in target else '?'
+            targets = (f'{target}{separator}_lt={number}' for number in itertools.count())
+        fetch = self.http_fetch(targets) if options['url'] else self.client_fetch(targets)
+
+        def worker():
+            local_latencies, local_errors = [], 0
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    ok = fetch()
+                except Exception:
+                    ok = False
+                local_latencies.append(time.perf_counter() - started)
+                local_errors += not ok
+            # Thread'dagi doimiy ulanish jarayon tugashini kutmasin
+            connections.close_all()
+            with lock:
+                latencies.extend(local_latencies)
+                errors.append(local_errors)
+
+        sampler = ServerConnectionSampler()
+        threads = [threading.Thread(target=worker) for _ in range(options['concurrency'])]
+        sampler.start()
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        sampler.stop()
+
+        latencies.sort()
+        return {
+            'requests': len(latencies),
+            'errors': sum(errors),
+            'rps': len(latencies) / elapsed if elapsed else 0.0,
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p95_ms': percentile(latencies, 95) * 1000,
+            'concurrency': options['concurrency'],
+            'server_connections_max': sampler.maximum,
+        }
+
+    def client_fetch(self, targets):
+        local = threading.local()
+        lock = threading.Lock()
+
+        def fetch():
+            with lock:
+                path = next(targets)
+            client = getattr(local, 'client', None)
+            if client is None:
+                client = local.client = Client()
+            response = client.get(path, HTTP_ACCEPT='application/json')
+            # Test client request_finished'da ulanishni yopmaydi - server xatti-harakatini takrorlash
+            close_old_connections()
+            return response.status_code < 400
+        return fetch
+
+    def http_fetch(self, targets):
+        lock = threading.Lock()
+
+        def fetch():
+            with lock:
+                url = next(targets)
+            with urllib.request.urlopen(url, timeout=30) as response:
+                response.read()
+                return response.status < 400
+        return fetch
+
+    def db_mode(self):
+        database = settings.DATABASES['default']
+        if database.get('OPTIONS', {}).get('pool'):
+            return f"pool(max_size={database['OPTIONS']['pool'].get('max_size')})"
+        return f"CONN_MAX_AGE={database.get('CONN_MAX_AGE', 0)}"
+
+
+class ServerConnectionSampler:
+    """PostgreSQL'da pg_stat_activity dan ulanishlar sonini har 0.5 sekundda o'qiydi"""
+
+    def __init__(self, interval=0.5):
+        self.interval = interval
+        self.maximum = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        if connection.vendor == 'postgresql':
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        'SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()'
+                    )
+                    count = cursor.fetchone()[0]
+                self.maximum = max(self.maximum or 0, count)
+                self._stop.wait(self.interval)
+        finally:
+            connection.close()
+
+
+def percentile(values, percent):
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(len(values) * percent / 100))
+    return values[index]
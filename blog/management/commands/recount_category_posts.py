@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from blog.models import Category
+from blog.signals import invalidate_counts_cache
+
+
+class Command(BaseCommand):
+    """
+    Category.published_posts_count'ni haqiqiy qiymat bilan tekshirish va tuzatish
+    (loaddata, to'g'ridan-to'g'ri SQL yoki signal'siz yozuvlardan keyingi drift)
+
+        python manage.py recount_category_posts          # bitta UPDATE bilan qayta hisoblash
+        python manage.py recount_category_posts --check  # faqat farqlarni ko'rsatish
+    """
+    help = "Kategoriyalardagi published postlar sonini qayta hisoblaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help="Tuzatmasdan farqlarni chiqarish")
+
+    def handle(self, *args, **options):
+        drifted = list(
+            Category.objects.with_published_counts()
+            .exclude(published_posts_count=F('published_posts_total'))
+            .values_list('name', 'published_posts_count', 'published_posts_total')
+        )
+        for name, stored, actual in drifted:
+            self.stdout.write(f'{name}: {stored} -> {actual}')
+
+        if options['check']:
+            self.stdout.write(f'{len(drifted)} ta kategoriyada farq bor')
+            return
+
+        updated = Category.objects.recount_published_posts()
+        if drifted:
+            invalidate_counts_cache()
+        self.stdout.write(self.style.SUCCESS(f'{updated} ta kategoriya qayta hisoblandi, {len(drifted)} tasi tuzatildi'))
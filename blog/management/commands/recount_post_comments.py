@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+
+from blog.models import Post
+from blog.signals import bump_namespaces
+
+
+class Command(BaseCommand):
+    """
+    Post.approved_comments_count va last_comment_at'ni haqiqiy qiymat bilan tekshirish va tuzatish
+    (loaddata, to'g'ridan-to'g'ri SQL yoki signal'siz yozuvlardan keyingi drift)
+
+        python manage.py recount_post_comments          # bitta UPDATE bilan qayta hisoblash
+        python manage.py recount_post_comments --check  # faqat farqlarni ko'rsatish
+    """
+    help = "Postlardagi tasdiqlangan kommentariyalar soni va oxirgi kommentariya vaqtini qayta hisoblaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help="Tuzatmasdan farqlarni chiqarish")
+
+    def handle(self, *args, **options):
+        drifted = list(
+            Post.objects.with_approved_comments()
+            .filter(
+                ~Q(approved_comments_count=F('approved_comments_total'))
+                | Q(last_comment_at__lt=F('last_comment_total'))
+                | Q(last_comment_at__gt=F('last_comment_total'))
+                | Q(last_comment_at__isnull=True, last_comment_total__isnull=False)
+                | Q(last_comment_at__isnull=False, last_comment_total__isnull=True)
+            )
+            .values_list('slug', 'approved_comments_count', 'approved_comments_total',
+                         'last_comment_at', 'last_comment_total')
+        )
+        for slug, stored, actual, stored_at, actual_at in drifted:
+            self.stdout.write(f'{slug}: {stored} -> {actual}, last_comment_at {stored_at} -> {actual_at}')
+
+        if options['check']:
+            self.stdout.write(f'{len(drifted)} ta postda farq bor')
+            return
+
+        updated = Post.objects.recount_comments()
+        if drifted:
+            bump_namespaces(('posts', 'comments'))
+        self.stdout.write(self.style.SUCCESS(f'{updated} ta post qayta hisoblandi, {len(drifted)} tasi tuzatildi'))
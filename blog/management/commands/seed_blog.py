@@ -0,0 +1,155 @@
+import math
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from accounts.models import Profile, User
+from blog.models import Category, Comment, Post
+
+
+# Matn uchun lug'at (qidiruv benchmark'i uchun ham - ?search=django)
+WORDS = (
+    'django python api server cache query index database postgres redis worker queue async '
+    'request response latency throughput serializer model view router middleware template '
+    'dasturlash loyiha maqola yangilik tajriba natija tezlik xotira sahifa foydalanuvchi '
+    'kategoriya kommentariya javob savol muammo yechim misol kod test deploy docker nginx '
+    'the of and to in is for with on that this from by as are was be at it an or'
+).split()
+
+PASSWORD = 'benchmark-pass-123'  # benchmark login'i uchun (hamma seed userlarda bir xil)
+
+
+class Command(BaseCommand):
+    """
+    Benchmark uchun sintetik ma'lumot: userlar (profil bilan), kategoriyalar,
+    real hajmdagi postlar va chuqur kommentariya daraxtlari - hammasi bulk_create bilan.
+    Bir xil --seed - bir xil ma'lumot.
+
+        python manage.py seed_blog --users 100 --posts 2000 --comments 15 --depth 4
+        python manage.py benchmark --json results.json
+    """
+    help = "Benchmark uchun userlar, kategoriyalar, postlar va kommentariyalar yaratadi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--categories', type=int, default=8)
+        parser.add_argument('--posts', type=int, default=500)
+        parser.add_argument('--comments', type=float, default=10, help="Post boshiga o'rtacha asosiy commentlar")
+        parser.add_argument('--depth', type=int, default=4, help='Javoblar daraxtining eng katta chuqurligi')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--prefix', default='bench', help='username/slug prefiksi')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        prefix = options['prefix']
+        if User.objects.filter(username__startswith=f'{prefix}-').exists():
+            raise CommandError(f"'{prefix}-' userlar allaqachon bor - boshqa --prefix bering")
+
+        self.rnd = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        with transaction.atomic():
+            users = self.create_users(prefix, options['users'])
+            categories = self.create_categories(prefix, options['categories'])
+            posts = self.create_posts(prefix, options['posts'], users, categories)
+            comments = self.create_comments(posts, users, options['comments'], options['depth'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(users)} user, {len(categories)} kategoriya, {len(posts)} post, {comments} comment yaratildi'
+        ))
+
+    # ============================================
+    # MATN
+    # ============================================
+    def words(self, median, sigma=0.6, minimum=1):
+        """Log-normal uzunlikdagi matn (real post/comment hajmlari taqsimotiga yaqin)"""
+        count = max(minimum, int(self.rnd.lognormvariate(math.log(median), sigma)))
+        return ' '.join(self.rnd.choice(WORDS) for _ in range(count))
+
+    def paragraphs(self, median_words):
+        text = self.words(median_words)
+        words = text.split()
+        size = 80
+        return '\n\n'.join(
+            ' '.join(words[start:start + size]).capitalize() + '.' for start in range(0, len(words), size)
+        )
+
+    # ============================================
+    # MODELLAR
+    # ============================================
+    def create_users(self, prefix, count):
+        password = make_password(PASSWORD)
+        users = User.objects.bulk_create(
+            (
+                User(
+                    email=f'{prefix}-{number}@example.com', username=f'{prefix}-{number}', password=password,
+                    first_name=self.words(1).title(), last_name=self.words(1).title(),
+                )
+                for number in range(count)
+            ),
+            batch_size=self.batch_size,
+        )
+        Profile.objects.bulk_create(
+            (Profile(user=user, bio=self.words(20)) for user in users), batch_size=self.batch_size
+        )
+        return users
+
+    def create_categories(self, prefix, count):
+        return Category.objects.bulk_create(
+            Category(name=f'{prefix.title()} {number} {self.words(1)}', slug=f'{prefix}-{number}',
+                     description=self.words(15))
+            for number in range(count)
+        )
+
+    def create_posts(self, prefix, count, users, categories):
+        now = timezone.now()
+        posts = []
+        for number in range(count):
+            title = self.words(8, sigma=0.3, minimum=3).capitalize()
+            published = self.rnd.random() < 0.85
+            posts.append(Post(
+                title=title,
+                slug=f'{prefix}-{number}-{slugify(title)[:60]}'.rstrip('-'),
+                author=self.rnd.choice(users),
+                category=self.rnd.choice(categories) if categories and self.rnd.random() < 0.9 else None,
+                content=self.paragraphs(600),
+                excerpt=self.words(30)[:300],
+                status='published' if published else 'draft',
+                published_at=now if published else None,
+                views_count=int(self.rnd.paretovariate(1.2) * 10),
+            ))
+        return Post.objects.bulk_create(posts, batch_size=self.batch_size)
+
+    def create_comments(self, posts, users, per_post, max_depth):
+        """Daraja bo'yicha: har daraja bitta (yoki batch_size bo'lib) bulk_create, parent pk'lari ma'lum"""
+        level = Comment.objects.bulk_create(
+            (
+                self.comment(post.pk, users)
+                for post in posts
+                for _ in range(int(self.rnd.expovariate(1 / per_post)) if per_post else 0)
+            ),
+            batch_size=self.batch_size,
+        )
+        total = len(level)
+        for depth in range(1, max_depth + 1):
+            # Chuqurlashgan sari javob ehtimoli kamayadi
+            chance = 0.6 / depth
+            replies = [
+                self.comment(parent.post_id, users, parent=parent)
+                for parent in level
+                for _ in range(self.rnd.randint(1, 3) if self.rnd.random() < chance else 0)
+            ]
+            if not replies:
+                break
+            level = Comment.objects.bulk_create(replies, batch_size=self.batch_size)
+            total += len(level)
+        return total
+
+    def comment(self, post_id, users, parent=None):
+        return Comment(
+            post_id=post_id, parent=parent, author=self.rnd.choice(users),
+            content=self.words(25, sigma=0.8), is_approved=self.rnd.random() < 0.9,
+        )
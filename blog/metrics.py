@@ -0,0 +1,437 @@
+import atexit
+import bisect
+import glob
+import hmac
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+
+try:
+    import fcntl
+except ImportError:  # Windows (dev) - multiprocess rejimi gunicorn'da, ya'ni POSIX'da
+    fcntl = None
+
+
+DEFAULTS = {
+    # gunicorn: har worker o'z snapshot'ini shu papkaga yozadi, /metrics hammasini yig'adi.
+    # None - faqat joriy jarayon (runserver, bitta worker)
+    'MULTIPROCESS_DIR': None,
+    'WRITE_INTERVAL': 5,  # sekund - worker snapshot'ni ko'pi bilan shu oraliqda yozadi
+    # /metrics ichki endpoint: TOKEN ham, ALLOWED_IPS ham bo'sh bo'lsa - yopiq (403).
+    # Ikkalasi berilsa - ikkala shart ham bajarilishi kerak.
+    'ALLOWED_IPS': (),  # klient manzillari
+    'TOKEN': None,  # Authorization: Bearer <TOKEN>
+    # Shu manzillardan kelgan so'rovda klient manzili X-Forwarded-For'dan olinadi (reverse proxy);
+    # qolganlarida X-Forwarded-For hisobga olinmaydi - uni klient o'zi yozishi mumkin
+    'TRUSTED_PROXIES': (),
+    'LATENCY_BUCKETS': (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    'QUERY_BUCKETS': (1, 2, 3, 5, 10, 20, 50, 100),
+}
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def get_config():
+    return dict(DEFAULTS, **getattr(settings, 'METRICS', {}))
+
+
+# ============================================
+# STORE (har thread o'z shard'iga lock'siz yozadi)
+# ============================================
+class MetricsStore:
+    """
+    Jarayon ichidagi qiymatlar: {(metrika, label'lar): son yoki [bucket'lar..., sum]}.
+    Yozish faqat joriy thread shard'iga (lock yo'q); lock faqat yangi thread
+    shard'ini ro'yxatga qo'shishda va snapshot'da.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+
+    def shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def snapshot(self):
+        """Barcha shard'lar yig'indisi: {(metrika, label'lar): qiymat}"""
+        with self._lock:
+            shards = list(self._shards)
+        merged = {}
+        for shard in shards:
+            for key, value in list(shard.items()):
+                merge_value(merged, key, value)
+        return merged
+
+    def reset(self):
+        with self._lock:
+            for shard in self._shards:
+                shard.clear()
+
+
+def merge_value(merged, key, value):
+    current = merged.get(key)
+    if current is None:
+        merged[key] = list(value) if isinstance(value, list) else value
+    elif isinstance(value, list):
+        merged[key] = [a + b for a, b in zip(current, value)]
+    else:
+        merged[key] = current + value
+
+
+_store = MetricsStore()
+
+
+# ============================================
+# METRIKALAR
+# ============================================
+class Metric:
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY[name] = self
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, labels=(), amount=1):
+        shard = _store.shard()
+        key = (self.name, labels)
+        shard[key] = shard.get(key, 0) + amount
+
+
+class Histogram(Metric):
+    """Qiymat: [bucket_1, ..., bucket_n, +Inf, sum] (kumulyativ emas - exposition'da yig'iladi)"""
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets_setting='LATENCY_BUCKETS'):
+        super().__init__(name, documentation, labelnames)
+        self.buckets_setting = buckets_setting
+        self._buckets = None
+
+    @property
+    def buckets(self):
+        if self._buckets is None:
+            self._buckets = tuple(get_config()[self.buckets_setting])
+        return self._buckets
+
+    def observe(self, value, labels=()):
+        shard = _store.shard()
+        key = (self.name, labels)
+        buckets = self.buckets
+        counts = shard.get(key)
+        if counts is None:
+            counts = shard[key] = [0] * (len(buckets) + 1) + [0.0]
+        counts[bisect.bisect_left(buckets, value)] += 1
+        counts[-1] += value
+
+
+class Gauge(Metric):
+    """Jarayon holati - scrape/snapshot paytida hisoblanadi, pid label'i bilan"""
+    type = 'gauge'
+
+
+REGISTRY = {}
+
+REQUESTS = Counter('blog_http_requests_total', "HTTP so'rovlar soni", ('view', 'method', 'status'))
+LATENCY = Histogram('blog_http_request_duration_seconds', "So'rov davomiyligi", ('view', 'status'))
+PHASES = Histogram(
+    'blog_http_request_phase_seconds', "Bosqichlar vaqti (db, serialize, render; sampled so'rovlar)",
+    ('view', 'phase'),
+)
+QUERIES = Histogram(
+    'blog_db_queries_per_request', "So'rovdagi SQL so'rovlar soni (sampled so'rovlar)", ('view',),
+    buckets_setting='QUERY_BUCKETS',
+)
+RESPONSE_CACHE = Counter('blog_response_cache_requests_total', 'Javob keshi: hit/miss', ('view', 'result'))
+VIEW_COUNTER_LAG = Gauge('blog_view_counter_flush_lag_seconds', "Oxirgi ko'rishlar flush'idan beri", ('pid',))
+DB_POOL = Gauge('blog_db_pool', 'psycopg pool statistikasi (get_stats)', ('pid', 'alias', 'stat'))
+
+
+def record_request(view, method, status, seconds, cache_result=None):
+    """Har bir so'rov (blog.instrumentation.PerformanceMiddleware)"""
+    status = str(status)
+    REQUESTS.inc((view, method, status))
+    LATENCY.observe(seconds, (view, status))
+    if cache_result:
+        RESPONSE_CACHE.inc((view, cache_result.lower()))
+    maybe_write_snapshot()
+
+
+def record_phases(view, queries, timings_ms):
+    """Sampled so'rov tafsilotlari"""
+    QUERIES.observe(queries, (view,))
+    for phase, duration in timings_ms.items():
+        PHASES.observe(duration / 1000, (view, phase))
+
+
+def process_gauges():
+    """Joriy jarayon gauge'lari: {(metrika, label'lar): qiymat}"""
+    from .view_counter import _view_counter
+
+    pid = str(os.getpid())
+    gauges = {}
+    if _view_counter is not None and _view_counter.flush_interval:
+        gauges[(VIEW_COUNTER_LAG.name, (pid,))] = time.monotonic() - _view_counter.last_flush
+    for alias in connections:
+        connection = connections[alias]
+        if not connection.settings_dict.get('OPTIONS', {}).get('pool'):
+            continue
+        for stat, value in connection.pool.get_stats().items():
+            gauges[(DB_POOL.name, (pid, alias, stat))] = value
+    return gauges
+
+
+# ============================================
+# MULTIPROCESS (gunicorn worker'lari)
+# ============================================
+# Worker fayli: blog-metrics-<pid>-<boshlangan vaqt>.json - pid qayta ishlatilsa ham fayl boshqa.
+# O'lgan worker'lar fayllari scrape paytida MERGED_FILE'ga qo'shilib o'chiriladi (counter'lar monoton).
+SNAPSHOT_GLOB = 'blog-metrics-*-*.json'
+MERGED_FILE = 'blog-metrics-merged.json'
+LOCK_FILE = 'blog-metrics.lock'
+
+_last_write = 0.0
+_process = None  # (pid, boshlangan vaqt ms) - fork'dan keyin yangilanadi
+_exit_hooks = set()  # atexit'da oxirgi snapshot yoziladigan papkalar
+
+
+def process_identity():
+    global _process
+    pid = os.getpid()
+    if _process is None or _process[0] != pid:
+        _process = (pid, int(time.time() * 1000))
+    return _process
+
+
+def snapshot_path(directory, identity=None):
+    pid, started = identity or process_identity()
+    return os.path.join(directory, f'blog-metrics-{pid}-{started}.json')
+
+
+def write_json(path, data):
+    """Atomik yozish (tmp + rename) - o'quvchi yarim faylni ko'rmaydi"""
+    tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp, 'w') as file:
+        json.dump(data, file)
+    os.replace(tmp, path)
+
+
+def write_snapshot(directory):
+    """Joriy jarayon qiymatlarini yozish; birinchi marta - atexit'da oxirgi snapshot ham"""
+    global _last_write
+    _last_write = time.monotonic()
+    pid, started = process_identity()
+    if (pid, directory) not in _exit_hooks:
+        _exit_hooks.add((pid, directory))
+        atexit.register(write_final_snapshot, directory, pid)
+    write_json(snapshot_path(directory), {
+        'pid': pid,
+        'started': started,
+        'values': [[name, list(labels), value] for (name, labels), value in _store.snapshot().items()],
+        'gauges': [[name, list(labels), value] for (name, labels), value in process_gauges().items()],
+    })
+
+
+def write_final_snapshot(directory, pid):
+    """atexit: worker to'xtaganda oxirgi WRITE_INTERVAL ichidagi so'rovlar ham yo'qolmasin"""
+    if os.getpid() != pid:
+        return  # fork qilingan bola ota-ona hook'ini meros qilgan
+    try:
+        write_snapshot(directory)
+    except Exception:
+        pass  # interpreter to'xtamoqda - xato chiqarishdan foyda yo'q
+
+
+def maybe_write_snapshot():
+    config = get_config()
+    if config['MULTIPROCESS_DIR'] and time.monotonic() - _last_write >= config['WRITE_INTERVAL']:
+        write_snapshot(config['MULTIPROCESS_DIR'])
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def read_json(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+@contextmanager
+def directory_lock(directory):
+    """Bir vaqtda bitta jarayon o'lik fayllarni birlashtiradi (fcntl yo'q bo'lsa - lock'siz)"""
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(directory, LOCK_FILE), 'a') as file:
+        fcntl.flock(file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(file, fcntl.LOCK_UN)
+
+
+def collect():
+    """
+    (counter/histogram qiymatlari, gauge'lar).
+    Multiprocess: tirik worker fayllari + MERGED_FILE yig'iladi. O'lgan worker fayli
+    MERGED_FILE'ga qo'shiladi va o'chiriladi: counter'lari saqlanadi, gauge'lari tashlanadi.
+    """
+    directory = get_config()['MULTIPROCESS_DIR']
+    if not directory:
+        return _store.snapshot(), process_gauges()
+
+    write_snapshot(directory)
+    values, gauges = {}, {}
+    with directory_lock(directory):
+        merged = read_json(os.path.join(directory, MERGED_FILE)) or {'values': []}
+        dead = []
+        for path in glob.glob(os.path.join(directory, SNAPSHOT_GLOB)):
+            data = read_json(path)
+            if data is None:
+                continue  # boshqa worker hozir yozmoqda yoki yangi boshlagan - keyingi scrape'da
+            if pid_alive(data['pid']):
+                for name, labels, value in data['values']:
+                    merge_value(values, (name, tuple(labels)), value)
+                for name, labels, value in data['gauges']:
+                    gauges[(name, tuple(labels))] = value
+            elif fcntl is not None:
+                dead.append((path, data))
+            else:
+                for name, labels, value in data['values']:
+                    merge_value(values, (name, tuple(labels)), value)
+
+        if dead:
+            totals = {}
+            for name, labels, value in merged['values']:
+                merge_value(totals, (name, tuple(labels)), value)
+            for _, data in dead:
+                for name, labels, value in data['values']:
+                    merge_value(totals, (name, tuple(labels)), value)
+            merged = {'values': [[name, list(labels), value] for (name, labels), value in totals.items()]}
+            write_json(os.path.join(directory, MERGED_FILE), merged)
+            for path, _ in dead:
+                os.remove(path)
+
+    for name, labels, value in merged['values']:
+        merge_value(values, (name, tuple(labels)), value)
+    return values, gauges
+
+
+# ============================================
+# EXPOSITION (Prometheus text format 0.0.4)
+# ============================================
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(labelnames, labels, extra=()):
+    pairs = list(zip(labelnames, labels)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in pairs) + '}'
+
+
+def format_value(value):
+    if isinstance(value, float):
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        return repr(value)
+    return str(value)
+
+
+def exposition():
+    values, gauges = collect()
+    by_metric = {}
+    for (name, labels), value in {**values, **gauges}.items():
+        by_metric.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name, metric in REGISTRY.items():
+        samples = sorted(by_metric.get(name, []))
+        if not samples:
+            continue
+        lines.append(f'# HELP {name} {metric.documentation}')
+        lines.append(f'# TYPE {name} {metric.type}')
+        for labels, value in samples:
+            if metric.type != 'histogram':
+                lines.append(f'{name}{format_labels(metric.labelnames, labels)} {format_value(value)}')
+                continue
+            cumulative = 0
+            bounds = [format_value(float(bound)) for bound in metric.buckets] + ['+Inf']
+            for bound, count in zip(bounds, value[:-1]):
+                cumulative += count
+                lines.append(f'{name}_bucket{format_labels(metric.labelnames, labels, [("le", bound)])} {cumulative}')
+            lines.append(f'{name}_sum{format_labels(metric.labelnames, labels)} {format_value(float(value[-1]))}')
+            lines.append(f'{name}_count{format_labels(metric.labelnames, labels)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+def client_address(request, trusted_proxies):
+    """
+    REMOTE_ADDR; u ishonchli proxy bo'lsa - X-Forwarded-For'da o'ngdan birinchi proxy bo'lmagan manzil
+    (chapdagi qismlarni klient o'zi yozgan bo'lishi mumkin). Aniqlab bo'lmasa - None.
+    """
+    address = request.META.get('REMOTE_ADDR')
+    if address not in trusted_proxies:
+        return address
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')
+    for address in reversed([part.strip() for part in forwarded]):
+        if address not in trusted_proxies:
+            return address or None
+    return None
+
+
+def is_authorized(request, config):
+    token, allowed_ips = config['TOKEN'], config['ALLOWED_IPS']
+    if not token and not allowed_ips:
+        return False
+    if allowed_ips and client_address(request, config['TRUSTED_PROXIES']) not in allowed_ips:
+        return False
+    if token:
+        expected = f'Bearer {token}'.encode()
+        return hmac.compare_digest(request.headers.get('Authorization', '').encode(), expected)
+    return True
+
+
+def metrics_view(request):
+    """GET /metrics - ichki endpoint (Bearer TOKEN va/yoki ALLOWED_IPS; sozlanmagan bo'lsa 403)"""
+    if not is_authorized(request, get_config()):
+        return HttpResponseForbidden()
+    return HttpResponse(exposition(), content_type=CONTENT_TYPE)
+
+
+def reset_metrics(**kwargs):
+    """Testlarda override_settings(METRICS=...) uchun: qiymatlar va bucket kesh'i"""
+    if kwargs.get('setting', 'METRICS') != 'METRICS':
+        return
+    _store.reset()
+    for metric in REGISTRY.values():
+        if isinstance(metric, Histogram):
+            metric._buckets = None
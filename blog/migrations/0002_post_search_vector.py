@@ -0,0 +1,102 @@
+# Generated by Django 6.0.1 on 2026-10-18 17:53
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+
+POSTGRES_FORWARD = [
+    # Uzbek tili uchun stemmer yo'q - 'simple' konfiguratsiya
+    """
+    CREATE OR REPLACE FUNCTION blog_post_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(NEW.content, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER blog_post_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, content ON blog_post
+    FOR EACH ROW EXECUTE FUNCTION blog_post_search_vector_update();
+    """,
+    """
+    UPDATE blog_post SET search_vector =
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(content, '')), 'B');
+    """,
+]
+
+POSTGRES_REVERSE = [
+    'DROP TRIGGER IF EXISTS blog_post_search_vector_trigger ON blog_post;',
+    'DROP FUNCTION IF EXISTS blog_post_search_vector_update();',
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE blog_post_fts USING fts5(
+        title, content, content='blog_post', content_rowid='id'
+    );
+    """,
+    """
+    CREATE TRIGGER blog_post_fts_insert AFTER INSERT ON blog_post BEGIN
+        INSERT INTO blog_post_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END;
+    """,
+    """
+    CREATE TRIGGER blog_post_fts_delete AFTER DELETE ON blog_post BEGIN
+        INSERT INTO blog_post_fts(blog_post_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END;
+    """,
+    """
+    CREATE TRIGGER blog_post_fts_update AFTER UPDATE OF title, content ON blog_post BEGIN
+        INSERT INTO blog_post_fts(blog_post_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO blog_post_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END;
+    """,
+    "INSERT INTO blog_post_fts(blog_post_fts) VALUES ('rebuild');",
+]
+
+SQLITE_REVERSE = [
+    'DROP TRIGGER IF EXISTS blog_post_fts_update;',
+    'DROP TRIGGER IF EXISTS blog_post_fts_delete;',
+    'DROP TRIGGER IF EXISTS blog_post_fts_insert;',
+    'DROP TABLE IF EXISTS blog_post_fts;',
+]
+
+
+def run_vendor_sql(statements):
+    """Faqat mos bazada (postgresql / sqlite) SQL bajarish"""
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='blog_post_search_gin'),
+        ),
+        migrations.RunPython(
+            run_vendor_sql({'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            run_vendor_sql({'postgresql': POSTGRES_REVERSE, 'sqlite': SQLITE_REVERSE}),
+        ),
+    ]
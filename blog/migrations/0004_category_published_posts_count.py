@@ -0,0 +1,35 @@
+# Generated by Django 6.0.1 on 2026-10-18 19:02
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def recount_published_posts(apps, schema_editor):
+    Category = apps.get_model('blog', 'Category')
+    Post = apps.get_model('blog', 'Post')
+    published = (
+        Post.objects
+        .filter(category=OuterRef('pk'), status='published')
+        .order_by()
+        .values('category')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    Category.objects.update(published_posts_count=Coalesce(Subquery(published), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_post_image_variants_alter_post_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='published_posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Published postlar soni'),
+        ),
+        migrations.RunPython(recount_published_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 6.0.1 on 2026-10-18 20:14
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+
+def recount_comments(apps, schema_editor):
+    Comment = apps.get_model('blog', 'Comment')
+    Post = apps.get_model('blog', 'Post')
+    approved = (
+        Comment.objects
+        .filter(post=OuterRef('pk'), is_approved=True)
+        .order_by()
+        .values('post')
+    )
+    last_comment = Subquery(approved.annotate(last=Max('created_at')).values('last'))
+    Post.objects.update(
+        approved_comments_count=Coalesce(Subquery(approved.annotate(total=Count('id')).values('total')), 0),
+        last_comment_at=last_comment,
+        last_activity_at=Greatest('created_at', Coalesce(last_comment, 'created_at')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_category_published_posts_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='approved_comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Tasdiqlangan kommentariyalar'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='last_comment_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Oxirgi kommentariya'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Oxirgi faollik'),
+        ),
+        migrations.RunPython(recount_comments, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['status', '-last_activity_at', '-id'], name='blog_post_activity_idx'),
+        ),
+    ]
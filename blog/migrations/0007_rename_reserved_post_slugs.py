@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+# Post.reserved_slugs: blog/urls.py'da posts/<slug>/ dan oldin keladigan yo'llar
+RESERVED_SLUGS = ('my', 'create', 'export', 'bulk')
+
+
+def rename_reserved_slugs(apps, schema_editor):
+    """Shunday slug'li postlar ochilmas edi - 'my' -> 'my-N' (birinchi bo'sh N)"""
+    Post = apps.get_model('blog', 'Post')
+    for post in Post.objects.filter(slug__in=RESERVED_SLUGS).only('pk', 'slug'):
+        number = 2
+        while Post.objects.filter(slug=f'{post.slug}-{number}').exists():
+            number += 1
+        Post.objects.filter(pk=post.pk).update(slug=f'{post.slug}-{number}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_reserved_slugs, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,244 @@
-from django.db import models
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import models, router, transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
 from django.conf import settings
-from django.utils.text import slugify
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+
+from core.images import validate_image_pixels
+
+from .slugs import UniqueSlugMixin
+
+
+# ============================================
+# QUERYSETS (COUNT annotatsiyalari)
+# ============================================
+class CategoryQuerySet(models.QuerySet):
+    def with_published_counts(self):
+        """Published postlar soni JOIN + COUNT bilan (haqiqiy qiymat - published_posts_count tekshiruvi)"""
+        return self.annotate(
+            published_posts_total=Count('posts', filter=Q(posts__status='published'))
+        )
+
+    def recount_published_posts(self):
+        """published_posts_count'ni bitta UPDATE ... = (SELECT COUNT(*) ...) bilan qayta hisoblash"""
+        published = (
+            Post.objects
+            .filter(category=OuterRef('pk'), status='published')
+            .order_by()
+            .values('category')
+            .annotate(total=Count('id'))
+            .values('total')
+        )
+        return self.update(published_posts_count=Coalesce(Subquery(published), 0))
+
+
+def adjust_published_counts(deltas):
+    """
+    {category_id: +n/-n} bo'yicha Category.published_posts_count'ni F() bilan o'zgartirish.
+    Bir xil delta'li kategoriyalar bitta UPDATE; chaqiruvchi tranzaksiyasida bajariladi.
+    """
+    by_delta = defaultdict(list)
+    for category_id, delta in deltas.items():
+        if category_id is not None and delta:
+            by_delta[delta].append(category_id)
+    for delta, category_ids in by_delta.items():
+        Category.objects.filter(pk__in=category_ids).update(
+            published_posts_count=Greatest(F('published_posts_count') + delta, 0)
+        )
+    if by_delta:
+        from .signals import invalidate_counts_cache
+        invalidate_counts_cache()
+
+
+class PostQuerySet(models.QuerySet):
+    def with_approved_comments(self):
+        """Tasdiqlangan commentlar soni va oxirgisi JOIN bilan (approved_comments_count tekshiruvi)"""
+        approved = Q(comments__is_approved=True)
+        return self.annotate(
+            approved_comments_total=Count('comments', filter=approved),
+            last_comment_total=Max('comments__created_at', filter=approved),
+        )
+
+    def with_comments_updated(self):
+        """comments_updated_at - oxirgi o'zgargan comment vaqti (conditional GET uchun)"""
+        return self.annotate(comments_updated_at=Max('comments__updated_at'))
+
+    def recount_comments(self):
+        """
+        approved_comments_count, last_comment_at va last_activity_at'ni
+        bitta UPDATE ... = (SELECT COUNT/MAX ...) bilan qayta hisoblash
+        """
+        approved = (
+            Comment.objects
+            .filter(post=OuterRef('pk'), is_approved=True)
+            .order_by()
+            .values('post')
+        )
+        last_comment = Subquery(approved.annotate(last=Max('created_at')).values('last'))
+        return self.update(
+            approved_comments_count=Coalesce(Subquery(approved.annotate(total=Count('id')).values('total')), 0),
+            last_comment_at=last_comment,
+            last_activity_at=Greatest('created_at', Coalesce(last_comment, 'created_at')),
+        )
+
+    # Category.published_posts_count: bulk_create va update() post_save yubormaydi
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            adjust_published_counts(Counter(obj.counted_category_id() for obj in objs))
+        return objs
+
+    def update(self, **kwargs):
+        if not COUNTED_FIELDS & set(kwargs):
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            category_ids = set(self.order_by().values_list('category_id', flat=True).distinct())
+            rows = super().update(**kwargs)
+            category = kwargs.get('category', kwargs.get('category_id'))
+            category_ids.add(getattr(category, 'pk', category))
+            category_ids.discard(None)
+            if category_ids:
+                Category.objects.filter(pk__in=category_ids).recount_published_posts()
+                from .signals import invalidate_counts_cache
+                invalidate_counts_cache()
+        return rows
+
+
+class CommentQuerySet(models.QuerySet):
+    def with_counts(self):
+        """replies_total - javoblar soni"""
+        return self.annotate(replies_total=Count('replies'))
+
+    # Post.approved_comments_count: bulk_create va update() post_save yubormaydi
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            added = defaultdict(list)
+            for comment in objs:
+                if comment.counted_post_id() is not None:
+                    added[comment.post_id].append(comment.created_at)
+            for post_id, created in added.items():
+                add_post_comments(post_id, len(created), max(created))
+        return objs
+
+    def update(self, **kwargs):
+        if not COMMENT_COUNTED_FIELDS & set(kwargs):
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            post_ids = set(self.order_by().values_list('post_id', flat=True).distinct())
+            rows = super().update(**kwargs)
+            post = kwargs.get('post', kwargs.get('post_id'))
+            post_ids.add(getattr(post, 'pk', post))
+            post_ids.discard(None)
+            if post_ids:
+                Post.objects.filter(pk__in=post_ids).recount_comments()
+        return rows
+
+    def delete(self):
+        with deferred_comment_recount(self.db):
+            return super().delete()
+
+
+def add_post_comments(post_id, count, last_created_at):
+    """Post'ga count ta tasdiqlangan comment qo'shildi (eng yangisi - last_created_at)"""
+    created = Value(last_created_at)
+    Post.objects.filter(pk=post_id).update(
+        approved_comments_count=F('approved_comments_count') + count,
+        last_comment_at=Greatest(Coalesce(F('last_comment_at'), created), created),
+        last_activity_at=Greatest(F('last_activity_at'), created),
+    )
+
+
+# Comment o'chirilayotganda (javoblari CASCADE bilan) hisoblagichi o'zgargan postlar
+_deferred_recount = ContextVar('deferred_comment_recount', default=None)
+
+
+@contextmanager
+def deferred_comment_recount(using):
+    """
+    Blok ichida o'chirilgan commentlar postlari har comment uchun emas (N ta UPDATE),
+    oxirida bitta recount_comments() bilan yangilanadi (blog.signals.decrement_comment_counts).
+    """
+    if _deferred_recount.get() is not None:
+        yield
+        return
+    post_ids = set()
+    token = _deferred_recount.set(post_ids)
+    try:
+        with transaction.atomic(using=using):
+            yield
+            if post_ids:
+                Post.objects.filter(pk__in=post_ids).recount_comments()
+    finally:
+        _deferred_recount.reset(token)
+
+
+def defer_comment_recount(post_id):
+    """deferred_comment_recount ichida bo'lsa - post_id yig'iladi (True)"""
+    post_ids = _deferred_recount.get()
+    if post_ids is None:
+        return False
+    post_ids.add(post_id)
+    return True
+
+
+def remove_post_comment(post_id):
+    """
+    Tasdiqlangan comment o'chirildi yoki tasdiqdan chiqarildi (qator allaqachon o'zgargan).
+    Son F() bilan kamayadi, oxirgi comment vaqti esa qolgan commentlardan MAX bilan olinadi.
+    """
+    last_comment = Subquery(
+        Comment.objects
+        .filter(post=OuterRef('pk'), is_approved=True)
+        .order_by('-created_at')
+        .values('created_at')[:1]
+    )
+    Post.objects.filter(pk=post_id).update(
+        approved_comments_count=Greatest(F('approved_comments_count') - 1, 0),
+        last_comment_at=last_comment,
+        last_activity_at=Greatest('created_at', Coalesce(last_comment, 'created_at')),
+    )
+
+
+# ============================================
+# HISOBLAGICH MAYDONLARI (signal/F() bilan yangilanadi)
+# ============================================
+class CounterFieldsMixin:
+    """
+    Mavjud qatorni to'liq save() - counter_fields update_fields'dan chiqariladi:
+    oldin yuklangan instance ular bazada F() bilan o'zgargan qiymatini eski qiymat bilan yozib yubormasin.
+    Aniq update_fields (masalan recount) va insert'ga tegilmaydi.
+    """
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if (
+            not args and kwargs.get('update_fields') is None and not kwargs.get('force_insert')
+            and not self._state.adding and self.pk is not None
+        ):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields
+            ]
+        return super().save(*args, **kwargs)
+
+
+# Category.published_posts_count'ga ta'sir qiladigan Post maydonlari
+COUNTED_FIELDS = {'status', 'category', 'category_id'}
+# Post.approved_comments_count'ga ta'sir qiladigan Comment maydonlari
+COMMENT_COUNTED_FIELDS = {'is_approved', 'post', 'post_id'}
 
 
 # ============================================
 # CATEGORY MODEL
 # ============================================
-class Category(models.Model):
+class Category(CounterFieldsMixin, UniqueSlugMixin, models.Model):
     """
     Blog kategoriyalari (Technology, Health, Travel va h.k.)
     """
@@ -14,18 +246,20 @@ class Category(models.Model):
     slug = models.SlugField(max_length=100, unique=True, blank=True, verbose_name='Slug')
     description = models.TextField(blank=True, verbose_name='Tavsif')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan')
+    # Post saqlanganda/o'chirilganda yangilanadi (blog.signals); drift: recount_category_posts
+    published_posts_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Published postlar soni'
+    )
+
+    objects = CategoryQuerySet.as_manager()
+    slug_source = 'name'  # UniqueSlugMixin
+    counter_fields = ('published_posts_count',)  # CounterFieldsMixin
 
     class Meta:
         verbose_name = 'Category'
         verbose_name_plural = 'Categories'
         ordering = ['name']
 
-    def save(self, *args, **kwargs):
-        """Slug avtomatik yaratish"""
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
-
     def __str__(self):
         return self.name
 
@@ -33,7 +267,7 @@ class Category(models.Model):
 # ============================================
 # POST MODEL
 # ============================================
-class Post(models.Model):
+class Post(CounterFieldsMixin, UniqueSlugMixin, models.Model):
     """
     Blog postlari
     """
@@ -65,7 +299,11 @@ class Post(models.Model):
     # Kontent
     content = models.TextField(verbose_name='Matn')
     excerpt = models.TextField(max_length=300, blank=True, verbose_name='Qisqacha')
-    image = models.ImageField(upload_to='posts/', blank=True, null=True, verbose_name='Rasm')
+    image = models.ImageField(
+        upload_to='posts/', blank=True, null=True, validators=[validate_image_pixels], verbose_name='Rasm'
+    )
+    # WebP variantlar (core.images): {'source': ..., 'webp': {'320': 'posts/variants/...'}}
+    image_variants = models.JSONField(default=dict, blank=True, editable=False, verbose_name='Rasm variantlari')
 
     # Status va sanalar
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='draft', verbose_name='Status')
@@ -75,29 +313,69 @@ class Post(models.Model):
 
     # Statistika
     views_count = models.PositiveIntegerField(default=0, verbose_name='Ko\'rishlar soni')
+    # Comment saqlanganda/o'chirilganda yangilanadi (blog.signals); drift: recount_post_comments
+    approved_comments_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name='Tasdiqlangan kommentariyalar'
+    )
+    last_comment_at = models.DateTimeField(
+        null=True, blank=True, editable=False, verbose_name='Oxirgi kommentariya'
+    )
+    # max(created_at, last_comment_at) - ?ordering=-last_activity_at uchun
+    last_activity_at = models.DateTimeField(
+        default=timezone.now, editable=False, verbose_name='Oxirgi faollik'
+    )
+
+    # Qidiruv (PostgreSQL'da trigger orqali to'ldiriladi, blog.search)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = PostQuerySet.as_manager()
+    # UniqueSlugMixin: blog/urls.py'da posts/<slug>/ dan oldin keladigan yo'llar
+    reserved_slugs = ('my', 'create', 'export', 'bulk')
+    # CounterFieldsMixin: views_count - blog.view_counter, qolganlari - comment signallari
+    counter_fields = ('views_count', 'approved_comments_count', 'last_comment_at', 'last_activity_at')
 
     class Meta:
         verbose_name = 'Post'
         verbose_name_plural = 'Posts'
         ordering = ['-created_at']
+        # Har bir indeks blog.views dagi aniq so'rov uchun (tekshiruv: check_query_plans)
         indexes = [
             models.Index(fields=['-created_at']),
-            models.Index(fields=['status']),
+            # PostListView: WHERE status = 'published' ORDER BY created_at DESC, id DESC
+            models.Index(
+                fields=['-created_at', '-id'], condition=Q(status='published'),
+                name='blog_post_published_idx',
+            ),
+            # PostListView ?category=
+            models.Index(
+                fields=['category', '-created_at', '-id'], condition=Q(status='published'),
+                name='blog_post_pub_category_idx',
+            ),
+            # MyPostsView va PostListView ?author=
+            models.Index(fields=['author', '-created_at', '-id'], name='blog_post_author_idx'),
+            # PostListView ?ordering=-last_activity_at (status'ning o'zi uchun ham - prefiks)
+            models.Index(fields=['status', '-last_activity_at', '-id'], name='blog_post_activity_idx'),
+            # PostExportView: ORDER BY updated_at, id (va ?updated_since= oralig'i)
+            models.Index(fields=['updated_at', 'id'], name='blog_post_updated_idx'),
+            GinIndex(fields=['search_vector'], name='blog_post_search_gin'),
         ]
 
-    def save(self, *args, **kwargs):
-        """Slug avtomatik yaratish"""
-        if not self.slug:
-            self.slug = slugify(self.title)
-        super().save(*args, **kwargs)
-
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # Category.published_posts_count shu tranzaksiyada yangilanadi (blog.signals)
+        with transaction.atomic():
+            return super().save(*args, **kwargs)
+
+    def counted_category_id(self):
+        """Post qaysi kategoriyaning published_posts_count'ida hisoblanadi (yo'q - None)"""
+        return self.category_id if self.status == 'published' else None
+
     @property
     def comments_count(self):
-        """Kommentariyalar soni"""
-        return self.comments.count()
+        """Tasdiqlangan kommentariyalar soni (so'rovsiz)"""
+        return self.approved_comments_count
 
 
 # ============================================
@@ -134,14 +412,54 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='O\'zgartirilgan')
 
+    objects = CommentQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'Comment'
         verbose_name_plural = 'Comments'
         ordering = ['-created_at']
+        indexes = [
+            # CommentListView: WHERE is_approved ORDER BY created_at DESC, id DESC
+            models.Index(
+                fields=['-created_at', '-id'], condition=Q(is_approved=True),
+                name='blog_comment_approved_idx',
+            ),
+            # CommentListView ?post= (faqat asosiy commentlar)
+            models.Index(
+                fields=['post', '-created_at', '-id'], condition=Q(is_approved=True, parent__isnull=True),
+                name='blog_comment_post_roots_idx',
+            ),
+            # CommentTree.for_post va Post.last_comment_at qayta hisoblash
+            models.Index(
+                fields=['post', '-created_at', '-id'], condition=Q(is_approved=True),
+                name='blog_comment_post_idx',
+            ),
+            # Javoblar (fast path va CommentTree.for_roots): WHERE parent_id IN (...) AND is_approved
+            models.Index(
+                fields=['parent', '-created_at', '-id'], condition=Q(is_approved=True),
+                name='blog_comment_replies_idx',
+            ),
+            # CommentExportView: ORDER BY updated_at, id (va ?updated_since= oralig'i)
+            models.Index(fields=['updated_at', 'id'], name='blog_comment_updated_idx'),
+        ]
 
     def __str__(self):
         return f"{self.author.username} - {self.post.title[:30]}"
 
+    def save(self, *args, **kwargs):
+        # Post.approved_comments_count shu tranzaksiyada yangilanadi (blog.signals)
+        with transaction.atomic():
+            return super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        # Javoblar ham (CASCADE) o'chadi - post hisoblagichi oxirida bir marta
+        with deferred_comment_recount(kwargs.get('using') or router.db_for_write(Comment, instance=self)):
+            return super().delete(*args, **kwargs)
+
+    def counted_post_id(self):
+        """Comment qaysi postning approved_comments_count'ida hisoblanadi (yo'q - None)"""
+        return self.post_id if self.is_approved else None
+
     @property
     def replies_count(self):
         """Javoblar soni"""
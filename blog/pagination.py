@@ -0,0 +1,186 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+# ============================================
+# KEYSET (CURSOR) PAGINATION
+# ============================================
+class KeysetPagination(BasePagination):
+    """
+    (created_at, id) bo'yicha keyset pagination.
+
+    ?cursor=<token> - keyingi/oldingi sahifa (har qanday chuqurlikda O(page))
+    ?page=<n>       - eski offset sahifalar (orqaga moslik uchun)
+    ?page_size=<n>  - sahifa hajmi (max_page_size bilan cheklangan)
+    """
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_query_param = 'page'
+    page_size_query_param = 'page_size'
+
+    # Post.Meta.indexes dagi -created_at indeksi, id esa tiebreaker
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Cursor noto\'g\'ri'
+    invalid_page_message = 'Sahifa raqami noto\'g\'ri'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        sliced, finish = self.prepare(queryset, request)
+        return finish(list(sliced))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async view'lar uchun (blog.async_views) - xuddi shu sahifa, async ORM bilan"""
+        sliced, finish = self.prepare(queryset, request)
+        return finish([row async for row in sliced])
+
+    def prepare(self, queryset, request):
+        """(kesilgan queryset, finish(rows) -> sahifa) - so'rovning o'zi chaqiruvchida"""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.next_url = None
+        self.previous_url = None
+
+        # ?page= yoki boshqa tartib (?ordering=, ?search=) bo'lsa offset rejimi,
+        # chunki keyset faqat created_at tartibida ishlaydi
+        if self.page_query_param in request.query_params or self._has_custom_ordering(queryset):
+            return self._prepare_offset(queryset, request)
+        return self._prepare_keyset(queryset, request)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.next_url),
+            ('previous', self.previous_url),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        """page_size parametrini 1..max_page_size oralig'ida qaytaradi"""
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    # ------------------------------------------
+    # Keyset rejimi
+    # ------------------------------------------
+    def _prepare_keyset(self, queryset, request):
+        created_at, pk, reverse = self.decode_cursor(request)
+
+        if reverse:
+            queryset = queryset.order_by('created_at', 'id')
+            if created_at is not None:
+                queryset = queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+                )
+        else:
+            queryset = queryset.order_by(*self.ordering)
+            if created_at is not None:
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+                )
+
+        def finish(rows):
+            has_more = len(rows) > self.page_size
+            rows = rows[:self.page_size]
+
+            if reverse:
+                rows.reverse()
+                has_next, has_previous = True, has_more
+            else:
+                has_next, has_previous = has_more, created_at is not None
+
+            if rows and has_next:
+                self.next_url = self._cursor_url(rows[-1], reverse=False)
+            if rows and has_previous:
+                self.previous_url = self._cursor_url(rows[0], reverse=True)
+            return rows
+
+        # Bitta ortiqcha qator - keyingi sahifa bormi yo'qmi bilish uchun
+        return queryset[:self.page_size + 1], finish
+
+    def decode_cursor(self, request):
+        """Cursor'ni (created_at, id, reverse) ko'rinishiga o'giradi"""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, None, False
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            created_at = parse_datetime(payload['c'])
+            pk = int(payload['i'])
+            reverse = bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            created_at = None
+        if created_at is None:
+            # Klient yuborgan parametr xato - 400 (sahifa yo'qligi emas)
+            raise ValidationError({self.cursor_query_param: [self.invalid_cursor_message]})
+        return created_at, pk, reverse
+
+    def encode_cursor(self, obj, reverse=False):
+        # obj - model instance yoki .values() qatori (blog.fastpath)
+        if isinstance(obj, dict):
+            payload = {'c': obj['created_at'].isoformat(), 'i': obj['id']}
+        else:
+            payload = {'c': obj.created_at.isoformat(), 'i': obj.pk}
+        if reverse:
+            payload['r'] = 1
+        data = json.dumps(payload, separators=(',', ':')).encode('ascii')
+        return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+    def _cursor_url(self, obj, reverse):
+        url = remove_query_param(self.base_url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(obj, reverse))
+
+    # ------------------------------------------
+    # Offset rejimi (orqaga moslik)
+    # ------------------------------------------
+    def _prepare_offset(self, queryset, request):
+        try:
+            page = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            raise NotFound(self.invalid_page_message)
+        if page < 1:
+            raise NotFound(self.invalid_page_message)
+
+        if not queryset.ordered:
+            queryset = queryset.order_by(*self.ordering)
+
+        def finish(rows):
+            has_next = len(rows) > self.page_size
+            rows = rows[:self.page_size]
+
+            url = remove_query_param(self.base_url, self.cursor_query_param)
+            if has_next:
+                self.next_url = replace_query_param(url, self.page_query_param, page + 1)
+            if page > 1:
+                self.previous_url = replace_query_param(url, self.page_query_param, page - 1)
+            return rows
+
+        offset = (page - 1) * self.page_size
+        return queryset[offset:offset + self.page_size + 1], finish
+
+    def _has_custom_ordering(self, queryset):
+        """Queryset'ga aniq order_by berilgan bo'lsa (OrderingFilter, qidiruv reytingi)"""
+        order_by = tuple(str(field) for field in queryset.query.order_by)
+        return bool(order_by) and order_by != self.ordering
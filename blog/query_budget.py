@@ -0,0 +1,84 @@
+import logging
+import re
+from collections import Counter
+
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================
+# VIEW BUDJETLARI
+# ============================================
+class QueryBudgetExceeded(Exception):
+    """So'rov view'ning query_budget'idan ko'p SQL bajardi (PERFORMANCE['QUERY_BUDGET'] = 'raise')"""
+
+
+def get_query_budget(view_class, method):
+    """
+    View klassidagi query_budget: butun son (hamma metodlar uchun) yoki
+    {'GET': 3, 'POST': 6} - metod bo'yicha. HEAD uchun GET budjeti. Yo'q bo'lsa - None.
+    """
+    budget = getattr(view_class, 'query_budget', None)
+    if isinstance(budget, dict):
+        if method == 'HEAD':
+            method = 'GET'
+        return budget.get(method)
+    return budget
+
+
+def resolve_view_class(resolver_match):
+    """URL view funksiyasidan klass: Django/DRF as_view() va AsyncReadView.as_view() view_class beradi"""
+    if resolver_match is None:
+        return None
+    return getattr(resolver_match.func, 'view_class', None)
+
+
+# ============================================
+# SQL FINGERPRINT (bir xil so'rovlar - N+1 - bitta guruhga)
+# ============================================
+FINGERPRINT_RULES = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),  # string literal
+    (re.compile(r'%s|\b\d+(?:\.\d+)?\b'), '?'),  # parametr va sonlar
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(...)'),  # IN (?, ?, ?) - uzunligidan qat'i nazar
+    (re.compile(r'\s+'), ' '),
+)
+
+
+def fingerprint(sql):
+    for pattern, replacement in FINGERPRINT_RULES:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def group_statements(statements):
+    """[(soni, fingerprint), ...] - eng ko'p takrorlangani birinchi"""
+    counts = Counter(fingerprint(sql) for sql in statements)
+    return [(count, sql) for sql, count in counts.most_common()]
+
+
+def format_statements(statements):
+    return '\n'.join(f'  {count} x {sql}' for count, sql in group_statements(statements))
+
+
+# ============================================
+# RUNTIME TEKSHIRUV (blog.instrumentation.PerformanceMiddleware)
+# ============================================
+def check_query_budget(mode, request, view_name, queries, statements):
+    """
+    Sampled so'rov budjetdan oshgan bo'lsa: mode='log' - WARNING (extra={'query_budget': {...}}),
+    mode='raise' - QueryBudgetExceeded (dev/CI). SQL'lar fingerprint bo'yicha guruhlanadi.
+    """
+    budget = get_query_budget(resolve_view_class(getattr(request, 'resolver_match', None)), request.method)
+    if budget is None or queries <= budget:
+        return
+
+    message = (
+        f'{request.method} {view_name} ({request.path}): {queries} ta SQL so\'rov, budjet {budget}\n'
+        f'{format_statements(statements)}'
+    )
+    if mode == 'raise':
+        raise QueryBudgetExceeded(message)
+    logger.warning(message, extra={'query_budget': {
+        'view': view_name, 'method': request.method, 'path': request.path,
+        'queries': queries, 'budget': budget, 'statements': group_statements(statements),
+    }})
@@ -0,0 +1,41 @@
+import json
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .instrumentation import timed
+
+try:
+    import orjson
+except ImportError:  # orjson ixtiyoriy - bo'lmasa oddiy JSONRenderer
+    orjson = None
+
+
+_default = JSONEncoder().default  # Decimal, UUID, lazy string va h.k.
+
+
+def dumps(data):
+    """Ixcham JSON (bytes): orjson bo'lsa u bilan, aks holda json + DRF encoder"""
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8')
+
+
+# ============================================
+# FAST JSON RENDERER
+# ============================================
+class FastJSONRenderer(JSONRenderer):
+    """
+    orjson o'rnatilgan bo'lsa u bilan kodlaydi (bir necha barobar tez),
+    aks holda yoki indent so'ralganda (?format=json; indent=4) - DRF JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed('render'):
+            if orjson is None or data is None:
+                return super().render(data, accepted_media_type, renderer_context)
+            if self.get_indent(accepted_media_type, renderer_context or {}):
+                return super().render(data, accepted_media_type, renderer_context)
+            return dumps(data)
@@ -0,0 +1,178 @@
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+from .cache import CachedResponseMixin, get_response_cache
+
+
+DEFAULTS = {
+    'ALIASES': [],  # DATABASES dagi replica alias'lari
+    'STICKY_SECONDS': 5,  # yozgandan keyin shuncha vaqt primary'dan o'qiladi
+    'COOKIE': 'db_primary',
+    'CACHE_ALIAS': 'default',
+    'RESPONSE_CACHE_TIMEOUT': 30,  # replica'dan o'qilgan javob keshda ko'pi bilan shuncha turadi
+}
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def get_config():
+    return dict(DEFAULTS, **getattr(settings, 'READ_REPLICAS', {}))
+
+
+# ============================================
+# ROUTING HOLATI (so'rov bo'yicha, async uchun ham ContextVar)
+# ============================================
+class RoutingState:
+    """read_alias - o'qish qaysi bazadan (None - primary), wrote - so'rovda yozuv bo'ldimi"""
+
+    def __init__(self):
+        self.read_alias = None
+        self.wrote = False
+
+
+_state = ContextVar('db_routing_state', default=None)
+
+
+def current_state():
+    return _state.get()
+
+
+def sticky_cache_key(user_id):
+    return f'db:sticky:{user_id}'
+
+
+def is_sticky(request, user=None):
+    """Yaqinda yozgan client (cookie) yoki user (kesh) - primary'dan o'qiydi"""
+    config = get_config()
+    if request.COOKIES.get(config['COOKIE']):
+        return True
+    if user is not None and user.is_authenticated:
+        return bool(caches[config['CACHE_ALIAS']].get(sticky_cache_key(user.pk)))
+    return False
+
+
+def route_reads_to_replica():
+    """Joriy so'rov o'qishlarini tasodifiy replica'ga yo'naltirish (replica bo'lmasa - primary)"""
+    state = current_state()
+    aliases = get_config()['ALIASES']
+    if state is not None and aliases and not state.wrote:
+        state.read_alias = random.choice(aliases)
+
+
+# ============================================
+# DATABASE ROUTER
+# ============================================
+class ReplicaRouter:
+    """
+    Yozish - har doim primary. O'qish - faqat ReplicaReadMixin yoqgan so'rovlarda replica,
+    qolganlari (admin, management command, background thread) - primary.
+    So'rov ichida yozuv bo'lsa qolgan o'qishlar ham primary'ga o'tadi (read-your-writes).
+    """
+
+    def db_for_read(self, model, **hints):
+        state = current_state()
+        if state is None:
+            return None
+        return state.read_alias
+
+    def db_for_write(self, model, **hints):
+        state = current_state()
+        if state is not None:
+            state.wrote = True
+            state.read_alias = None
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica'lar primary'ning nusxasi - obyektlar bir xil bazadan
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in get_config()['ALIASES']
+
+
+# ============================================
+# MIDDLEWARE
+# ============================================
+class ReplicaRoutingMiddleware:
+    """
+    Har so'rov uchun yangi RoutingState; so'rovda yozuv bo'lsa
+    STICKY_SECONDS davomida shu client (cookie) va user (kesh) primary'dan o'qiydi.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        if state.wrote:
+            self.mark_sticky(request, response)
+        return response
+
+    async def __acall__(self, request):
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        if state.wrote:
+            self.mark_sticky(request, response)
+        return response
+
+    def mark_sticky(self, request, response):
+        config = get_config()
+        seconds = config['STICKY_SECONDS']
+        response.set_cookie(config['COOKIE'], '1', max_age=seconds, httponly=True, samesite='Lax')
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            caches[config['CACHE_ALIAS']].set(sticky_cache_key(user.pk), 1, timeout=seconds)
+
+
+# ============================================
+# VIEW MIXIN
+# ============================================
+class ReplicaReadMixin:
+    """
+    DRF view uchun: xavfsiz (GET/HEAD) so'rovlar o'qishini replica'ga yuboradi.
+
+    db_routing = 'replica' - replica (yaqinda yozgan user/client bundan mustasno)
+    db_routing = 'primary' - har doim primary (view darajasida override)
+    """
+    db_routing = 'replica'
+
+    def initial(self, request, *args, **kwargs):
+        # Autentifikatsiya shu yerda - user ma'lum bo'lgandan keyin qaror qilinadi
+        super().initial(request, *args, **kwargs)
+        self.route_reads(request, getattr(request, 'user', None))
+
+    def route_reads(self, request, user=None):
+        if self.db_routing != 'replica' or request.method not in SAFE_METHODS:
+            return
+        if is_sticky(request, user):
+            return
+        route_reads_to_replica()
+        state = current_state()
+        if state is not None and state.read_alias and isinstance(self, CachedResponseMixin):
+            # Replica orqada qolgan bo'lishi mumkin - eskirgan javob uzoq keshlanmasin
+            timeout = self.cache_timeout or get_response_cache().timeout
+            self.cache_timeout = min(timeout, get_config()['RESPONSE_CACHE_TIMEOUT'])
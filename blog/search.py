@@ -0,0 +1,181 @@
+import re
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from rest_framework import filters
+
+
+# ============================================
+# SEARCH BACKENDS
+# ============================================
+# So'zlar (harf/raqam) - qolgan belgilar ('"', '*', ':' va h.k.) qidiruv sintaksisiga o'tmaydi
+WORD = re.compile(r'\w+')
+
+
+class BaseSearchBackend:
+    """
+    Postlarni qidirish interfeysi.
+    search() - filtrlangan va search_rank bo'yicha tartiblangan queryset qaytaradi.
+    Har bir so'z prefiks sifatida ('djan' -> 'django'), hammasi bir vaqtda (AND) mos kelishi kerak.
+    """
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+    def terms(self, query):
+        return WORD.findall(query.lower())
+
+    def order_by_rank(self, queryset):
+        return queryset.order_by(F('search_rank').desc(nulls_last=True), '-created_at', '-id')
+
+    def author_match(self, query):
+        # author__username unique indeksga ega - aniq moslik arzon
+        return Q(author__username__iexact=query)
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    PostgreSQL: trigger bilan saqlanadigan search_vector (GIN indeks),
+    title (A) > content (B) vaznlari bilan SearchRank
+    """
+    config = 'simple'
+
+    def search(self, queryset, query):
+        tsquery = self.tsquery(query)
+        if not tsquery:
+            return queryset.filter(self.author_match(query))
+        search_query = SearchQuery(tsquery, config=self.config, search_type='raw')
+        queryset = queryset.filter(Q(search_vector=search_query) | self.author_match(query))
+        queryset = queryset.annotate(search_rank=SearchRank(F('search_vector'), search_query))
+        return self.order_by_rank(queryset)
+
+    def tsquery(self, query):
+        """'django rest' -> "'django':* & 'rest':*" (faqat WORD so'zlari - tsquery operatorlari kirmaydi)"""
+        return ' & '.join(f"'{term}':*" for term in self.terms(query))
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """
+    SQLite (dev/test): blog_post_fts FTS5 jadvali, bm25 bo'yicha tartib
+    """
+    title_weight = 10.0
+    content_weight = 1.0
+
+    def search(self, queryset, query):
+        match = self.match_expression(query)
+        if not match:
+            return queryset.filter(self.author_match(query))
+
+        table = queryset.model._meta.db_table
+        matched_ids = RawSQL('SELECT rowid FROM blog_post_fts WHERE blog_post_fts MATCH %s', [match])
+        # bm25 kichik bo'lsa yaxshiroq - shuning uchun teskari ishora.
+        # MATCH har qatorda qayta bajarilmasligi uchun (O(n^2)) CTE bir marta materializatsiya qilinadi
+        rank = RawSQL(
+            f'WITH m AS MATERIALIZED (SELECT rowid AS id, -bm25(blog_post_fts, %s, %s) AS score '
+            f'FROM blog_post_fts WHERE blog_post_fts MATCH %s) '
+            f'SELECT score FROM m WHERE m.id = "{table}"."id"',
+            [self.title_weight, self.content_weight, match],
+            output_field=FloatField(),
+        )
+        queryset = queryset.filter(Q(id__in=matched_ids) | self.author_match(query))
+        queryset = queryset.annotate(search_rank=rank)
+        return self.order_by_rank(queryset)
+
+    def match_expression(self, query):
+        """Har bir so'z qo'shtirnoqda va prefiks: "djan"* (NEAR, AND, * operator bo'lib qolmaydi)"""
+        return ' '.join(f'"{term}"*' for term in self.terms(query))
+
+
+class IContainsSearchBackend(BaseSearchBackend):
+    """
+    Boshqa bazalar uchun eski ILIKE usuli
+    """
+
+    def search(self, queryset, query):
+        terms = self.terms(query)
+        if not terms:
+            return queryset.filter(self.author_match(query))
+        condition = Q()
+        for term in terms:
+            condition &= Q(title__icontains=term) | Q(content__icontains=term)
+        return queryset.filter(condition | self.author_match(query))
+
+
+# SQLite ALTER'da jadvalni qayta yaratadi (yangi jadval -> nusxa -> rename) va blog_post trigger'lari
+# yo'qoladi - shuning uchun 0002 migratsiyasidagi trigger'lar har migrate'dan keyin tiklanadi
+SQLITE_FTS_TRIGGERS = {
+    'blog_post_fts_insert': """
+        AFTER INSERT ON blog_post BEGIN
+            INSERT INTO blog_post_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+    """,
+    'blog_post_fts_delete': """
+        AFTER DELETE ON blog_post BEGIN
+            INSERT INTO blog_post_fts(blog_post_fts, rowid, title, content)
+            VALUES ('delete', old.id, old.title, old.content);
+        END
+    """,
+    'blog_post_fts_update': """
+        AFTER UPDATE OF title, content ON blog_post BEGIN
+            INSERT INTO blog_post_fts(blog_post_fts, rowid, title, content)
+            VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO blog_post_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+    """,
+}
+
+
+def ensure_sqlite_fts(using='default', **kwargs):
+    """
+    post_migrate (blog.apps): SQLite'da yo'qolgan FTS5 trigger'larini yaratib,
+    blog_post_fts indeksini qayta quradi. Boshqa bazalarda yoki 0002'gacha - hech narsa.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT name FROM sqlite_master WHERE name LIKE %s', ['blog_post_fts%'])
+        existing = {name for name, in cursor.fetchall()}
+        if 'blog_post_fts' not in existing:
+            return
+        missing = [name for name in SQLITE_FTS_TRIGGERS if name not in existing]
+        for name in missing:
+            cursor.execute(f'CREATE TRIGGER {name} {SQLITE_FTS_TRIGGERS[name]}')
+        if missing:
+            cursor.execute("INSERT INTO blog_post_fts(blog_post_fts) VALUES ('rebuild')")
+
+
+SEARCH_BACKENDS = {
+    'postgresql': PostgresSearchBackend,
+    'sqlite': SQLiteSearchBackend,
+}
+
+
+def get_search_backend(using='default'):
+    """POST_SEARCH_BACKEND sozlamasi yoki baza turiga mos backend"""
+    backend_path = getattr(settings, 'POST_SEARCH_BACKEND', None)
+    if backend_path:
+        return import_string(backend_path)()
+    vendor = connections[using].vendor
+    return SEARCH_BACKENDS.get(vendor, IContainsSearchBackend)()
+
+
+# ============================================
+# DRF FILTER
+# ============================================
+class PostSearchFilter(filters.SearchFilter):
+    """
+    ?search=django - SearchFilter bilan bir xil parametr,
+    lekin ILIKE o'rniga full-text backend ishlatiladi
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        backend = get_search_backend(queryset.db)
+        return backend.search(queryset, ' '.join(terms))
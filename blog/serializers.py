@@ -1,89 +1,186 @@
+from django.db import models
 from rest_framework import serializers
 from .models import Category, Post, Comment
-from accounts.serializers import UserSerializer
+from .bulk import CachedPrimaryKeyRelatedField
+from .comment_tree import CommentTree
+from .fastpath import identity
+from .instrumentation import TimedRepresentationMixin
+from .sparse import SparseFieldsetsMixin
+from accounts.serializers import AuthorSerializer
+from core.images import ImageVariantsField
+from core.uploads import UploadedImageField
+
+
+def annotated(obj, name, fallback):
+    """Annotatsiya qilingan qiymat, bo'lmasa fallback() (alohida COUNT so'rovi)"""
+    value = getattr(obj, name, None)
+    if value is None:
+        return fallback()
+    return value
 
 
 # ============================================
 # CATEGORY SERIALIZER
 # ============================================
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedRepresentationMixin, SparseFieldsetsMixin, serializers.ModelSerializer):
     """
     Kategoriya serializer
     """
-    posts_count = serializers.SerializerMethodField()
+    # Denormalizatsiya qilingan son (blog.signals yangilaydi) - COUNT so'rovi yo'q
+    posts_count = serializers.IntegerField(source='published_posts_count', read_only=True)
 
     class Meta:
         model = Category
         fields = ['id', 'name', 'slug', 'description', 'posts_count', 'created_at']
         read_only_fields = ['id', 'slug', 'created_at']
 
-    def get_posts_count(self, obj):
-        """Shu kategoriyada nechta post borligini qaytaradi"""
-        return obj.posts.filter(status='published').count()
-
 
 # ============================================
 # COMMENT SERIALIZER
 # ============================================
-class CommentSerializer(serializers.ModelSerializer):
+class CommentListSerializer(serializers.ListSerializer):
+    """
+    Ro'yxat uchun CommentTree'ni bir marta yig'adi,
+    shunda har bir comment replies uchun alohida so'rov yubormaydi
+    """
+    max_depth = 1  # Faqat asosiy commentlarning javoblari (oldingi format)
+    per_level_limit = None
+
+    def to_representation(self, data):
+        # replies so'ralmagan bo'lsa (?fields=) daraxt ham kerak emas
+        needs_tree = 'replies' in self.child.fields or 'replies_count' in self.child.fields
+        if needs_tree and 'comment_tree' not in self.context and self.parent is None:
+            data = list(data.all() if hasattr(data, 'all') else data)
+            self._context = dict(self.context)
+            self._context['comment_tree'] = CommentTree.for_roots(
+                data, max_depth=self.max_depth, per_level_limit=self.per_level_limit
+            )
+        return super().to_representation(data)
+
+
+class CommentSerializer(TimedRepresentationMixin, SparseFieldsetsMixin, serializers.ModelSerializer):
     """
     Kommentariya serializer
     """
-    author = UserSerializer(read_only=True)
+    author = AuthorSerializer(read_only=True)
     replies = serializers.SerializerMethodField()
-    replies_count = serializers.IntegerField(read_only=True)
+    replies_count = serializers.SerializerMethodField()
+
+    sparse_sources = {'replies': ('parent',), 'replies_count': ('parent',)}
+    fastpath = {'replies_count': (('replies_total',), identity)}
+    fastpath_fill = ('replies',)
 
     class Meta:
         model = Comment
         fields = ['id', 'post', 'author', 'content', 'parent', 'replies', 'replies_count',
                   'is_approved', 'created_at', 'updated_at']
         read_only_fields = ['id', 'author', 'created_at', 'updated_at']
+        list_serializer_class = CommentListSerializer
 
     def get_replies(self, obj):
         """
         Javoblarni (replies) qaytaradi
         """
-        if obj.parent is None:  # Faqat asosiy commentlar uchun
+        tree = self.context.get('comment_tree')
+        if tree is not None:
+            return CommentSerializer(tree.children(obj), many=True, context=self.context).data
+
+        if obj.parent_id is None:  # Faqat asosiy commentlar uchun
             replies = obj.replies.filter(is_approved=True)
             return CommentSerializer(replies, many=True).data
         return []
 
+    def get_replies_count(self, obj):
+        """with_counts() yoki CommentTree hisoblagan qiymat, bo'lmasa property"""
+        return annotated(obj, 'replies_total', lambda: obj.replies_count)
+
+    @classmethod
+    def fastpath_fill_replies(cls, rows, output, mapper, request):
+        """
+        blog.fastpath uchun: asosiy commentlar javoblari bitta so'rovda
+        (CommentListSerializer.max_depth = 1 bilan bir xil natija)
+        """
+        roots, replies = cls.fastpath_replies(rows, output, mapper)
+        if replies is not None:
+            cls.fastpath_attach_replies(roots, list(replies), mapper, request)
+
+    @classmethod
+    async def afastpath_fill_replies(cls, rows, output, mapper, request):
+        roots, replies = cls.fastpath_replies(rows, output, mapper)
+        if replies is not None:
+            cls.fastpath_attach_replies(roots, [reply async for reply in replies], mapper, request)
+
+    @staticmethod
+    def fastpath_replies(rows, output, mapper):
+        """(id -> asosiy comment dict, javoblar .values() queryset yoki None)"""
+        roots = {row['id']: item for row, item in zip(rows, output) if row['parent'] is None}
+        for item in output:
+            item['replies'] = []
+        if not roots:
+            return roots, None
+
+        replies = Comment.objects.filter(parent_id__in=roots, is_approved=True)
+        if 'replies_total' in mapper.paths:
+            replies = replies.with_counts()
+        return roots, replies.order_by('-created_at', '-id').values(*mapper.paths)
+
+    @staticmethod
+    def fastpath_attach_replies(roots, replies, mapper, request):
+        for reply, item in zip(replies, mapper.map_rows(replies, request)):
+            item['replies'] = []
+            roots[reply['parent']]['replies'].append(item)
+
+
+# ============================================
+# POST COUNTS MIXIN
+# ============================================
+class PostCountsMixin(serializers.Serializer):
+    """
+    Denormalizatsiya qilingan hisoblagichlar (blog.signals yangilaydi) - qo'shimcha so'rovsiz
+    """
+    comments_count = serializers.IntegerField(source='approved_comments_count', read_only=True)
+
 
 # ============================================
 # POST LIST SERIALIZER (Ro'yxat uchun - qisqacha)
 # ============================================
-class PostListSerializer(serializers.ModelSerializer):
+class PostListSerializer(TimedRepresentationMixin, SparseFieldsetsMixin, PostCountsMixin, serializers.ModelSerializer):
     """
     Postlar ro'yxati uchun (qisqacha ma'lumot)
     """
-    author = UserSerializer(read_only=True)
+    author = AuthorSerializer(read_only=True)
     category = CategorySerializer(read_only=True)
-    comments_count = serializers.IntegerField(read_only=True)
+    image_srcset = ImageVariantsField('image')
 
     class Meta:
         model = Post
-        fields = ['id', 'title', 'slug', 'author', 'category', 'excerpt', 'image',
-                  'status', 'views_count', 'comments_count', 'created_at', 'published_at']
+        fields = ['id', 'title', 'slug', 'author', 'category', 'excerpt', 'image', 'image_srcset',
+                  'status', 'views_count', 'comments_count', 'last_comment_at', 'created_at',
+                  'published_at']
         read_only_fields = ['id', 'slug', 'views_count', 'created_at']
 
 
 # ============================================
 # POST DETAIL SERIALIZER (Batafsil)
 # ============================================
-class PostDetailSerializer(serializers.ModelSerializer):
+class PostDetailSerializer(TimedRepresentationMixin, SparseFieldsetsMixin, PostCountsMixin, serializers.ModelSerializer):
     """
     Bitta postni batafsil ko'rish uchun
     """
-    author = UserSerializer(read_only=True)
+    author = AuthorSerializer(read_only=True)
     category = CategorySerializer(read_only=True)
     comments = serializers.SerializerMethodField()
-    comments_count = serializers.IntegerField(read_only=True)
+    image_srcset = ImageVariantsField('image')
+
+    # Kommentariya daraxti sozlamalari (None - cheklovsiz)
+    comments_max_depth = 1
+    comments_per_level = None
 
     class Meta:
         model = Post
         fields = ['id', 'title', 'slug', 'author', 'category', 'content', 'excerpt',
-                  'image', 'status', 'views_count', 'comments_count', 'comments',
-                  'created_at', 'updated_at', 'published_at']
+                  'image', 'image_srcset', 'status', 'views_count', 'comments_count', 'last_comment_at',
+                  'comments', 'created_at', 'updated_at', 'published_at']
         read_only_fields = ['id', 'slug', 'views_count', 'created_at', 'updated_at']
 
     def get_comments(self, obj):
@@ -91,8 +188,14 @@ class PostDetailSerializer(serializers.ModelSerializer):
         Faqat asosiy kommentariyalarni qaytaradi (parent=None)
         Replies ularning ichida
         """
-        comments = obj.comments.filter(parent=None, is_approved=True).order_by('-created_at')
-        return CommentSerializer(comments, many=True).data
+        # Async view daraxtni oldindan yuklab context'da beradi (CommentTree.afor_post)
+        tree = self.context.get('comment_tree') or CommentTree.for_post(
+            obj, max_depth=self.comments_max_depth, per_level_limit=self.comments_per_level
+        )
+        # ?fields=comments.id,comments.content - commentlar uchun alohida spec
+        spec = self.get_sparse_spec() or {}
+        context = dict(self.context, comment_tree=tree, sparse_fields=spec.get('comments') or None)
+        return CommentSerializer(tree.roots, many=True, context=context).data
 
 
 # ============================================
@@ -102,6 +205,11 @@ class PostCreateUpdateSerializer(serializers.ModelSerializer):
     """
     Post yaratish va yangilash uchun
     """
+    serializer_related_field = CachedPrimaryKeyRelatedField  # bulk import uchun (blog.bulk)
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.ImageField: UploadedImageField,  # core.uploads tekshirgan rasm qayta ochilmaydi
+    }
 
     class Meta:
         model = Post
@@ -123,6 +231,7 @@ class CommentCreateSerializer(serializers.ModelSerializer):
     """
     Kommentariya yaratish uchun
     """
+    serializer_related_field = CachedPrimaryKeyRelatedField  # bulk import uchun (blog.bulk)
 
     class Meta:
         model = Comment
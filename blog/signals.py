@@ -0,0 +1,169 @@
+from collections import Counter
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from core.images import register as register_image_pipeline, variants_ready
+
+from .cache import get_response_cache, reset_response_cache
+from .instrumentation import install_query_timer
+from .metrics import reset_metrics
+from .models import (
+    COMMENT_COUNTED_FIELDS, COUNTED_FIELDS, Category, Comment, Post, add_post_comments,
+    adjust_published_counts, defer_comment_recount, remove_post_comment,
+)
+
+
+# Model o'zgarganda qaysi javoblar eskiradi
+CACHE_NAMESPACES = {
+    Post: ('posts',),  # Kategoriya posts_count o'zgarsa - invalidate_counts_cache()
+    Comment: ('comments', 'posts'),  # Post comments_count, last_comment_at va comments
+    Category: ('categories', 'posts'),  # Post ichidagi kategoriya
+}
+
+
+def bump_namespaces(namespaces):
+    """Commit'dan keyin namespace'larni eskirtirib, RESPONSE_CACHE['WARM'] javoblarini qayta yig'ish"""
+    def bump():
+        response_cache = get_response_cache()
+        response_cache.bump(*namespaces)
+        response_cache.warm(namespaces)
+    transaction.on_commit(bump)
+
+
+def invalidate_response_cache(sender, **kwargs):
+    """Javob keshini tranzaksiya commit bo'lgandan keyin eskirtirish"""
+    bump_namespaces(CACHE_NAMESPACES[sender])
+
+
+def invalidate_counts_cache():
+    """published_posts_count o'zgardi: kategoriyalar va ichida kategoriya bor post javoblari"""
+    bump_namespaces(('categories', 'posts'))
+
+
+# Post va commentlar ichidagi muallif (accounts.serializers.AuthorSerializer) ustunlari
+AUTHOR_FIELDS = frozenset({'username', 'first_name', 'last_name'})
+
+
+def invalidate_author_cache(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Muallif ismi o'zgarsa post/comment javoblari eskiradi (login'dagi last_login - yo'q)"""
+    if raw or kwargs.get('created'):
+        return
+    if update_fields is not None and not AUTHOR_FIELDS & set(update_fields):
+        return
+    bump_namespaces(('posts', 'comments'))
+
+
+for model in CACHE_NAMESPACES:
+    post_save.connect(invalidate_response_cache, sender=model, dispatch_uid=f'cache-save-{model.__name__}')
+    post_delete.connect(invalidate_response_cache, sender=model, dispatch_uid=f'cache-delete-{model.__name__}')
+post_save.connect(invalidate_author_cache, sender=settings.AUTH_USER_MODEL, dispatch_uid='cache-save-author')
+
+
+# ============================================
+# CATEGORY.PUBLISHED_POSTS_COUNT
+# ============================================
+def remember_counted_category(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Saqlashdan oldingi holat bazadan, qator qulflangan holda o'qiladi
+    (eskirgan instance yoki parallel saqlash ikki marta hisoblamasin).
+    Post.save() tranzaksiya ichida - qulf post_save'gacha turadi.
+    """
+    instance._counted_category_id = None
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not COUNTED_FIELDS & set(update_fields):
+        instance._counted_category_id = instance.counted_category_id()
+        return
+    row = (
+        Post.objects.select_for_update()
+        .filter(pk=instance.pk)
+        .values_list('category_id', 'status')
+        .first()
+    )
+    if row is not None and row[1] == 'published':
+        instance._counted_category_id = row[0]
+
+
+def update_published_counts(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    old = getattr(instance, '_counted_category_id', None)
+    new = instance.counted_category_id()
+    if old != new:
+        adjust_published_counts(Counter({old: -1, new: 1}))
+    instance._counted_category_id = new
+
+
+def decrement_published_counts(sender, instance, **kwargs):
+    adjust_published_counts({instance.counted_category_id(): -1})
+
+
+pre_save.connect(remember_counted_category, sender=Post, dispatch_uid='counts-pre-save-Post')
+post_save.connect(update_published_counts, sender=Post, dispatch_uid='counts-save-Post')
+post_delete.connect(decrement_published_counts, sender=Post, dispatch_uid='counts-delete-Post')
+
+
+# ============================================
+# POST.APPROVED_COMMENTS_COUNT / LAST_COMMENT_AT
+# ============================================
+def remember_counted_post(sender, instance, raw=False, update_fields=None, **kwargs):
+    """remember_counted_category bilan bir xil: eski holat qulflangan qatordan o'qiladi"""
+    instance._counted_post_id = None
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not COMMENT_COUNTED_FIELDS & set(update_fields):
+        instance._counted_post_id = instance.counted_post_id()
+        return
+    row = (
+        Comment.objects.select_for_update()
+        .filter(pk=instance.pk)
+        .values_list('post_id', 'is_approved')
+        .first()
+    )
+    if row is not None and row[1]:
+        instance._counted_post_id = row[0]
+
+
+def update_comment_counts(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    old = getattr(instance, '_counted_post_id', None)
+    new = instance.counted_post_id()
+    if old != new:
+        if old is not None:
+            remove_post_comment(old)
+        if new is not None:
+            add_post_comments(new, 1, instance.created_at)
+    instance._counted_post_id = new
+
+
+def decrement_comment_counts(sender, instance, origin=None, **kwargs):
+    post_id = instance.counted_post_id()
+    if post_id is None:
+        return
+    # Post o'chirilayotgan bo'lsa (CASCADE) uning hisoblagichini yangilash shart emas
+    if isinstance(origin, Post) and origin.pk == post_id:
+        return
+    if getattr(origin, 'model', None) is Post:
+        return
+    if not defer_comment_recount(post_id):
+        remove_post_comment(post_id)
+
+
+pre_save.connect(remember_counted_post, sender=Comment, dispatch_uid='counts-pre-save-Comment')
+post_save.connect(update_comment_counts, sender=Comment, dispatch_uid='counts-save-Comment')
+post_delete.connect(decrement_comment_counts, sender=Comment, dispatch_uid='counts-delete-Comment')
+
+setting_changed.connect(reset_response_cache)
+setting_changed.connect(reset_metrics)
+
+# So'rovlar soni va DB vaqti (blog.instrumentation.PerformanceMiddleware)
+connection_created.connect(install_query_timer, dispatch_uid='performance-query-timer')
+
+# Rasm yuklanganda/almashganda WebP variantlar (core.images); tayyor bo'lganda srcset javoblarda
+register_image_pipeline(Post, 'image')
+variants_ready.connect(invalidate_response_cache, sender=Post, dispatch_uid='cache-variants-Post')
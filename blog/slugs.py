@@ -0,0 +1,180 @@
+import re
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Q, Value, When
+from django.db.models.functions import Length
+from django.utils.text import slugify
+
+
+# O'zbek (va rus) kirill harflari -> lotin; slugify ularni shunchaki tashlab yuboradi
+CYRILLIC_TO_LATIN = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo', 'ж': 'j',
+    'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o',
+    'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'x', 'ц': 'ts',
+    'ч': 'ch', 'ш': 'sh', 'щ': 'sh', 'ъ': '', 'ы': 'i', 'ь': '', 'э': 'e', 'ю': 'yu',
+    'я': 'ya', 'ў': 'o', 'қ': 'q', 'ғ': 'g', 'ҳ': 'h',
+}
+TRANSLITERATION = str.maketrans(CYRILLIC_TO_LATIN)
+
+# '-999999' gacha suffix uchun joy: max_length'ga to'lgan asosda ham suffixli slug qisqartirilmaydi
+SUFFIX_LENGTH = 7
+
+
+def slug_base(value, max_length, fallback):
+    """
+    Slug asosi: kirill -> lotin, keyin slugify.
+    Baribir bo'sh qolsa (masalan, faqat emoji) - fallback ('post', 'category').
+    """
+    value = str(value).lower().translate(TRANSLITERATION)
+    return slugify(value)[:max_length].strip('-') or fallback
+
+
+def suffix_stem(base, max_length):
+    """
+    Suffixli slug'lar asosi ('stem-2', 'stem-3', ...): '-N' qo'shilganda ham max_length'dan oshmaydi,
+    shuning uchun band suffix'lar aynan shu stem bo'yicha qidiriladi.
+    """
+    return base[:max_length - SUFFIX_LENGTH].rstrip('-') or base
+
+
+def unique_slug(model, value, field='slug', exclude_pk=None):
+    """
+    Bitta model uchun keyingi bo'sh slug - bitta so'rov:
+    slug = 'asos' yoki slug LIKE 'stem-%' (indeks) va faqat raqamli suffix,
+    eng katta suffix (uzunlik, keyin qiymat bo'yicha) + 1.
+    model.reserved_slugs'dagi asos band hisoblanadi ('my' -> 'my-2').
+    """
+    max_length = model._meta.get_field(field).max_length
+    base = slug_base(value, max_length, model._meta.model_name)
+    stem = suffix_stem(base, max_length)
+
+    is_base = Q(**{field: base})
+    queryset = model._default_manager.filter(
+        is_base | Q(**{f'{field}__startswith': stem + '-', f'{field}__regex': rf'^{re.escape(stem)}-[0-9]+$'})
+    )
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+    reserved = base in getattr(model, 'reserved_slugs', ())
+    last = (
+        # Suffixlilar birinchi: max_length'gacha uzun asos qisqaroq 'stem-N' lardan oldin kelmasin
+        queryset.order_by(Case(When(is_base, then=Value(1)), default=Value(0)), Length(field).desc(), f'-{field}')
+        .values_list(field, flat=True)
+        .first()
+    )
+    if last is None and not reserved:
+        return base
+
+    number = 2 if last is None or last == base else int(last.rsplit('-', 1)[1]) + 1
+    return f'{stem}-{number}'
+
+
+class UniqueSlugMixin:
+    """
+    Model uchun: slug bo'sh bo'lsa slug_source maydonidan unique slug yaratadi (bitta so'rov).
+    Parallel insert aynan shu slug'ni olib qo'ysa - keyingi bo'sh slug bilan bitta qayta urinish.
+    Boshqa IntegrityError'lar (unique name, FK) qayta urinishsiz o'zgarmasdan chiqadi.
+    """
+    slug_source = 'title'
+    slug_field = 'slug'
+    reserved_slugs = ()  # URL'da slug o'rnidagi qat'iy yo'llar (masalan posts/my/)
+
+    def save(self, *args, **kwargs):
+        if getattr(self, self.slug_field):
+            return super().save(*args, **kwargs)
+
+        self.allocate_slug()
+        try:
+            with transaction.atomic():
+                return super().save(*args, **kwargs)
+        except IntegrityError:
+            if not self.slug_taken():
+                raise
+        self.allocate_slug()
+        return super().save(*args, **kwargs)
+
+    def slug_taken(self):
+        """IntegrityError slug'dan bo'lganmi: ajratilgan slug boshqa qatorda bormi"""
+        queryset = type(self)._default_manager.filter(**{self.slug_field: getattr(self, self.slug_field)})
+        if self.pk is not None:
+            queryset = queryset.exclude(pk=self.pk)
+        return queryset.exists()
+
+    def allocate_slug(self):
+        slug = unique_slug(
+            type(self), getattr(self, self.slug_source), self.slug_field, exclude_pk=self.pk
+        )
+        setattr(self, self.slug_field, slug)
+
+
+# ============================================
+# SLUG ALLOCATION (batch uchun, bitta so'rovda)
+# ============================================
+class SlugAllocator:
+    """
+    Bir-biridan va bazadagilardan farqli slug'lar.
+
+    load() - barcha asoslar uchun bitta so'rov (unique_slug bilan bir xil shart):
+    slug IN (asoslar) yoki slug LIKE 'stem-%' (indeks) va faqat raqamli suffix.
+    Har bir stem uchun eng katta suffix shu yerda bir marta hisoblanadi.
+    allocate() - band bo'lsa 'stem-<eng katta suffix + 1>', so'rovsiz.
+    """
+
+    def __init__(self, model, field='slug', fallback=None):
+        self.model = model
+        self.field = field
+        self.max_length = model._meta.get_field(field).max_length
+        self.fallback = fallback or model._meta.model_name
+        self.taken = set(getattr(model, 'reserved_slugs', ()))
+        self._loaded = set()
+        self._next = {}  # stem -> keyingi tekshiriladigan suffix
+
+    def base(self, value):
+        return slug_base(value, self.max_length, self.fallback)
+
+    def load(self, bases):
+        stems = {}
+        for base in set(bases) - self._loaded:
+            stems.setdefault(suffix_stem(base, self.max_length), set()).add(base)
+        if not stems:
+            return
+
+        condition = Q()
+        for stem, stem_bases in stems.items():
+            condition |= Q(**{f'{self.field}__in': stem_bases}) | Q(**{
+                f'{self.field}__startswith': stem + '-',
+                f'{self.field}__regex': rf'^{re.escape(stem)}-[0-9]+$',
+            })
+        queryset = self.model._default_manager.filter(condition)
+
+        max_suffix = dict.fromkeys(stems, 1)
+        for slug in queryset.values_list(self.field, flat=True).iterator():
+            self.taken.add(slug)
+            stem, _, number = slug.rpartition('-')
+            if number.isdigit() and stem in max_suffix:
+                max_suffix[stem] = max(max_suffix[stem], int(number))
+        for stem, number in max_suffix.items():
+            self._next[stem] = max(self._next.get(stem, 2), number + 1)
+        self._loaded.update(*stems.values())
+
+    def allocate(self, base):
+        if base not in self.taken:
+            self.taken.add(base)
+            return base
+
+        stem = suffix_stem(base, self.max_length)
+        number = self._next.get(stem, 2)
+        while True:
+            slug = f'{stem}-{number}'
+            number += 1
+            if slug not in self.taken:
+                self._next[stem] = number
+                self.taken.add(slug)
+                return slug
+
+
+def allocate_slugs(model, values, field='slug', fallback=None):
+    """values (sarlavhalar) uchun unique slug'lar ro'yxati - bitta SELECT bilan"""
+    allocator = SlugAllocator(model, field, fallback)
+    bases = [allocator.base(value) for value in values]
+    allocator.load(bases)
+    return [allocator.allocate(base) for base in bases]
@@ -0,0 +1,149 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+FIELDS_PARAM = 'fields'
+
+
+# ============================================
+# SPARSE FIELDSETS (?fields=id,title,author.username)
+# ============================================
+def parse_fields(value):
+    """
+    'id,title,author.username' -> {'id': {}, 'title': {}, 'author': {'username': {}}}
+    Bo'sh qiymat - None (hamma maydonlar)
+    """
+    if not value:
+        return None
+    spec = {}
+    for path in value.split(','):
+        path = path.strip()
+        if not path:
+            continue
+        node = spec
+        for part in path.split('.'):
+            node = node.setdefault(part, {})
+    return spec or None
+
+
+def prune_fields(fields, spec):
+    """
+    Serializer maydonlarini spec bo'yicha qisqartirish.
+    Ichki serializer uchun sub-spec bo'sh bo'lsa - barcha maydonlari qoladi.
+    """
+    for name in list(fields):
+        if name not in spec:
+            fields.pop(name)
+            continue
+        field = fields[name]
+        nested = getattr(field, 'child', field)
+        if spec[name] and isinstance(nested, serializers.BaseSerializer):
+            prune_fields(nested.fields, spec[name])
+    return fields
+
+
+def collect_only(serializer, prefix=''):
+    """
+    Serializer maydonlari uchun kerak bo'lgan model ustunlari va select_related yo'llari.
+    Aniqlab bo'lmasa (masalan, noma'lum method field) - None, only() qo'llanmaydi.
+    """
+    model = serializer.Meta.model
+    sources = getattr(serializer, 'sparse_sources', {})
+    paths = {prefix + model._meta.pk.name}
+    relations = set()
+
+    for name, field in serializer.fields.items():
+        if name in sources:
+            paths.update(prefix + source for source in sources[name])
+            continue
+
+        if isinstance(field, serializers.ListSerializer):
+            return None
+
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+
+        if isinstance(field, serializers.BaseSerializer):
+            if not model_field.many_to_one and not model_field.one_to_one:
+                return None
+            nested = collect_only(field, prefix + model_field.name + '__')
+            if nested is None:
+                return None
+            relations.add(prefix + model_field.name)
+            paths |= nested[0]
+            relations |= nested[1]
+        elif model_field.concrete:
+            paths.add(prefix + model_field.name)
+        else:
+            return None
+
+    return paths, relations
+
+
+class SparseFieldsetsMixin:
+    """
+    Serializer uchun: ?fields= (yoki context['sparse_fields']) bo'yicha maydonlarni qisqartiradi.
+    Faqat eng yuqori darajadagi serializer (yoki ro'yxat elementi) request'ni o'qiydi.
+
+    sparse_sources - method field -> kerakli model ustunlari (only() uchun)
+    """
+    sparse_sources = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        spec = self.get_sparse_spec()
+        if spec:
+            prune_fields(fields, spec)
+        return fields
+
+    def get_sparse_spec(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return None
+
+        context = self.context
+        if 'sparse_fields' in context:
+            return context['sparse_fields']
+        request = context.get('request')
+        if request is None:
+            return None
+        return parse_fields(request.query_params.get(FIELDS_PARAM))
+
+
+class SparseQuerysetMixin:
+    """
+    View uchun: so'ralgan maydonlarga qarab select_related va only() ni qisqartiradi
+    """
+    sparse_always = ('created_at',)  # KeysetPagination cursor'i uchun
+
+    def get_sparse_spec(self):
+        return parse_fields(self.request.query_params.get(FIELDS_PARAM))
+
+    def wants_field(self, path):
+        """'comments_count' yoki 'category.posts_count' so'ralganmi"""
+        node = self.get_sparse_spec()
+        if node is None:
+            return True
+        for part in path.split('.'):
+            if part not in node:
+                return False
+            if not node[part]:
+                return True
+            node = node[part]
+        return True
+
+    def sparse_queryset(self, queryset):
+        if self.get_sparse_spec() is None:
+            return queryset
+        collected = collect_only(self.get_serializer())
+        if collected is None:
+            return queryset
+        paths, relations = collected
+        queryset = queryset.select_related(None)
+        if relations:
+            queryset = queryset.select_related(*sorted(relations))
+        return queryset.only(*sorted(paths | set(self.sparse_always)))
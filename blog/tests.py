@@ -1,3 +1,1627 @@
-from django.test import TestCase
+import base64
+import bisect
+import json
+import math
+import os
+import random
+import re
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from contextlib import ExitStack
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F, QuerySet
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.test import (
+    AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings,
+)
+
+from PIL import Image
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from blog import fastpath, metrics
+from blog.async_views import AsyncListView, AsyncPostDetailView
+from blog.cache import get_response_cache
+from blog.models import Category, Comment, Post
+from blog.pagination import KeysetPagination
+from blog.serializers import CommentSerializer, PostListSerializer
+from blog.slugs import allocate_slugs, unique_slug
+from blog.sparse import parse_fields
+from blog.view_counter import LocalMemoryStore, SQLiteStore, ViewCounter, close_view_counter, get_view_counter
+from blog.views import PostDetailView, PostListView
+from core.images import ThreadPoolBackend, process_image
+
+
+class ViewCounterMixin:
+    """
+    Post detali ko'rishlarni buferga yozadi. Test davomida jarayon buferi (fon flush'isiz),
+    tearDown'dan keyin (test bazasi hali bor) override tugaydi va close_view_counter() buferni yozib,
+    oqimni to'xtatadi - atexit'da yo'q jadvalga flush qilinmaydi, keyingi testlarga ko'rish o'tmaydi.
+    """
+    view_counter = {'STORE': 'blog.view_counter.LocalMemoryStore', 'FLUSH_INTERVAL': 3600}
+
+    def setUp(self):
+        super().setUp()
+        self.enterContext(override_settings(VIEW_COUNTER=self.view_counter))
+
+
+# ============================================
+# EXPLAIN REJALARI (check_query_plans)
+# ============================================
+class QueryPlansTest(ViewCounterMixin, TestCase):
+    def test_endpoints_use_indexes(self):
+        """CI bilan bir xil: buyruq system check'lari bilan ishga tushadi, seq scan bo'lsa CommandError"""
+        out = StringIO()
+        call_command('check_query_plans', seed=60, skip_checks=False, stdout=out)
+        self.assertIn("Barcha so'rovlar indeks bilan bajariladi", out.getvalue())
+
+
+# ============================================
+# QUERY BUDJETLARI (check_query_budgets)
+# ============================================
+class QueryBudgetsTest(ViewCounterMixin, TestCase):
+    def test_views_stay_within_budgets(self):
+        """CI bilan bir xil: budjetdan oshish, N+1 yoki budjetsiz view bo'lsa CommandError"""
+        out = StringIO()
+        call_command('check_query_budgets', skip_checks=False, stdout=out)
+        self.assertIn("Barcha view'lar budjet ichida", out.getvalue())
+
+
+# ============================================
+# KEYSET PAGINATION
+# ============================================
+class KeysetPaginationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('keyset@example.com', 'keyset', 'pass12345')
+        Post.objects.bulk_create(
+            Post(title=f'Keyset {number}', slug=f'keyset-{number}', content='x', author=cls.author,
+                 status='published')
+            for number in range(45)
+        )
+        # created_at bir xil bo'lgan guruhlar - tartibni faqat id hal qiladi
+        posts = list(Post.objects.order_by('pk'))
+        for group in range(0, 45, 5):
+            Post.objects.filter(pk__in=[post.pk for post in posts[group:group + 5]]).update(
+                created_at=posts[group].created_at,
+            )
+        Post.objects.update(views_count=F('id'))  # ?ordering=-views_count - id bo'yicha kamayish
+        cls.expected = list(Post.objects.order_by('-created_at', '-id').values_list('pk', flat=True))
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def walk(self, url, link):
+        """url'dan boshlab link ('next'/'previous') bo'yicha barcha sahifalar: [[id, ...], ...]"""
+        pages = []
+        while url:
+            data = self.get(url)
+            pages.append([item['id'] for item in data['results']])
+            url = data[link]
+        return pages
+
+    def test_cursor_round_trip_with_created_at_ties(self):
+        """next bo'ylab hamma post bir martadan (teng created_at ichida ham), previous bilan orqaga"""
+        for fast_path in (False, True):
+            with self.subTest(fast_path=fast_path), override_settings(FAST_PATH_LISTS=fast_path):
+                pages = self.walk('/api/posts/?page_size=7', 'next')
+                self.assertEqual(sum(pages, []), self.expected)
+                self.assertTrue(all(len(page) == 7 for page in pages[:-1]))
+
+                last = self.get('/api/posts/?page_size=7')['next']
+                for _ in range(len(pages) - 2):
+                    last = self.get(last)['next']
+                previous = self.walk(self.get(last)['previous'], 'previous')
+                self.assertEqual(previous, pages[-2::-1])
+
+    def test_invalid_cursor_is_bad_request(self):
+        cursor = self.get('/api/posts/?page_size=5')['next'].split('cursor=')[1]
+        tampered = [
+            'bad', cursor[:-3], '!' + cursor[1:],
+            base64.urlsafe_b64encode(b'{"c":"yesterday","i":1}').decode(),
+            base64.urlsafe_b64encode(b'{"c":"2024-01-01T00:00:00+00:00","i":"x"}').decode(),
+            base64.urlsafe_b64encode(b'[1, 2]').decode(),
+        ]
+        for token in tampered:
+            with self.subTest(cursor=token):
+                response = self.client.get('/api/posts/', {'cursor': token})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('cursor', response.json())
+
+    def test_page_and_ordering_fall_back_to_offset(self):
+        data = self.get('/api/posts/?page=2&page_size=10')
+        self.assertEqual([item['id'] for item in data['results']], self.expected[10:20])
+        self.assertIn('page=3', data['next'])
+        self.assertIn('page=1', data['previous'])
+        self.assertNotIn('cursor=', data['next'])
+
+        data = self.get('/api/posts/?ordering=-views_count&page_size=10')
+        self.assertEqual([item['id'] for item in data['results']], sorted(self.expected, reverse=True)[:10])
+        self.assertIn('page=2', data['next'])
+
+    def test_deep_cursor_costs_the_same_as_first_page(self):
+        """Oxirgi sahifa ham OFFSET'siz, birinchi sahifa bilan bir xil so'rovlar soni"""
+        deep = KeysetPagination().encode_cursor(Post.objects.get(pk=self.expected[-3]))
+        counts = []
+        for url in ('/api/posts/?page_size=5', f'/api/posts/?page_size=5&cursor={deep}'):
+            with CaptureQueriesContext(connections['default']) as queries:
+                self.get(url)
+            self.assertFalse([query for query in queries if 'OFFSET' in query['sql'].upper()], url)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(
+            [item['id'] for item in self.get(f'/api/posts/?page_size=5&cursor={deep}')['results']],
+            self.expected[-2:],
+        )
+
+
+# ============================================
+# QIDIRUV (blog.search)
+# ============================================
+class PostSearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user('search@example.com', 'searcher', 'pass12345')
+
+        def create(title, content='x'):
+            return Post.objects.create(title=title, content=content, author=author, status='published')
+
+        cls.title_match = create('Django performance tips')
+        cls.content_match = create('Cooking at home', 'Today we talk about django for a minute')
+        cls.unrelated = create('Travel notes', 'Mountains and rivers')
+        cls.tutorials = [create(f'Django tutorial part {number}') for number in range(5)]
+
+    def setUp(self):
+        cache.clear()
+
+    def search(self, query, **params):
+        response = self.client.get('/api/posts/', dict(params, search=query))
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def ids(self, query, **params):
+        return [item['id'] for item in self.search(query, page_size=100, **params)['results']]
+
+    def test_title_matches_rank_above_content_matches(self):
+        ids = self.ids('django')
+        self.assertEqual(len(ids), 7)
+        self.assertEqual(ids[-1], self.content_match.pk)
+        self.assertNotIn(self.unrelated.pk, ids)
+
+    def test_prefix_matching(self):
+        self.assertEqual(set(self.ids('djan')), set(self.ids('django')))
+        self.assertEqual(self.ids('perf tip'), [self.title_match.pk])
+        self.assertEqual(self.ids('DJANGO PERFORMANCE'), [self.title_match.pk])
+
+    def test_author_username(self):
+        self.assertEqual(len(self.ids('searcher')), 8)
+
+    def test_empty_and_special_character_queries(self):
+        self.assertEqual(len(self.ids('')), 8)
+        for query in ('"', '*', 'NEAR', '"django', 'django*', 'NEAR(django tips)', 'django AND OR NOT',
+                      ":*&|!()'", "o'zbek", 'tips -django', '\\'):
+            with self.subTest(query=query):
+                self.search(query)
+        self.assertEqual(self.ids('"'), [])
+        self.assertEqual(set(self.ids('"django*')), set(self.ids('django')))
+
+    def test_paginated_results(self):
+        """Reyting tartibi - offset sahifalar, sahifalar bo'ylab takror va tushib qolish yo'q"""
+        expected = self.ids('django')
+        pages, data = [], self.search('django', page_size=3)
+        while True:
+            pages.append([item['id'] for item in data['results']])
+            if not data['next']:
+                break
+            self.assertIn('page=', data['next'])
+            data = self.client.get(data['next']).json()
+        self.assertEqual(sum(pages, []), expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+
+
+# ============================================
+# SO'ROVLAR SONI (N+1 regressiyalari)
+# ============================================
+class PostDetailQueriesTest(ViewCounterMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('detail@example.com', 'detail', 'pass12345')
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def create_thread(self, title, count):
+        """count ta comment: har biri oldingilardan biriga javob - chuqur daraxt"""
+        post = Post.objects.create(title=title, content='x', author=self.author, status='published')
+        parents = [None]
+        for number in range(count):
+            parents.append(Comment.objects.create(
+                post=post, author=self.author, content=f'comment {number}', is_approved=True,
+                parent=parents[number % len(parents)],
+            ))
+        return post
+
+    def test_post_detail_queries_do_not_grow_with_comments(self):
+        """Post + commentlar daraxti + javoblar soni - commentlar sonidan qat'i nazar 3 ta so'rov"""
+        for count in (1, 80):
+            post = self.create_thread(f'Thread {count}', count)
+            with self.subTest(comments=count), self.assertNumQueries(3):
+                response = self.client.get(f'/api/posts/{post.slug}/')
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.json()['comments'])
+
+
+class PostListQueriesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user('list@example.com', 'list', 'pass12345')
+        categories = [Category.objects.create(name=f'List {number}') for number in range(4)]
+        for number in range(100):
+            post = Post.objects.create(
+                title=f'List post {number}', content='x', author=author, status='published',
+                category=categories[number % 4] if number % 5 else None,
+            )
+            for _ in range(number % 3):
+                Comment.objects.create(post=post, author=author, content='comment', is_approved=True)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_100_post_page(self):
+        """comments_count va category.posts_count annotatsiyadan: Last-Modified + ro'yxat"""
+        for fast_path in (False, True):
+            with self.subTest(fast_path=fast_path), override_settings(FAST_PATH_LISTS=fast_path):
+                cache.clear()
+                with self.assertNumQueries(2):
+                    response = self.client.get('/api/posts/?page_size=100')
+                results = response.json()['results']
+                self.assertEqual(len(results), 100)
+                for item in results:
+                    post = Post.objects.get(pk=item['id'])
+                    self.assertEqual(item['comments_count'], post.comments.filter(is_approved=True).count())
+                    if item['category']:
+                        self.assertEqual(item['category']['posts_count'], 20)
+
+
+# ============================================
+# CONDITIONAL GET (ETag / Last-Modified)
+# ============================================
+class ListValidatorsTest(ViewCounterMixin, TestCase):
+    """Ro'yxat ichidagi author, category va views_count o'zgarsa ETag ham o'zgaradi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('etag@example.com', 'etag', 'pass12345')
+        cls.category = Category.objects.create(name='ETag')
+        cls.post = Post.objects.create(title='ETag', content='x', author=cls.author,
+                                       category=cls.category, status='published')
+        Comment.objects.create(post=cls.post, author=cls.author, content='comment', is_approved=True)
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.requests = 0
+
+    def etag(self, url):
+        self.requests += 1
+        # Har safar yangi kesh kaliti - ETag javob keshidan emas, validatorlardan
+        response = self.client.get(url, {'_': self.requests})
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def etags(self):
+        return {url: self.etag(url) for url in ('/api/posts/', '/api/comments/')}
+
+    def assertChanged(self, before, urls):
+        after = self.etags()
+        for url in after:
+            with self.subTest(url=url):
+                (self.assertNotEqual if url in urls else self.assertEqual)(before[url], after[url])
+        return after
+
+    def test_author_and_category_changes(self):
+        etags = self.etags()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.last_login = timezone.now()
+            self.author.save(update_fields=['last_login'])
+        etags = self.assertChanged(etags, ())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.first_name = 'Yangi'
+            self.author.save()
+        etags = self.assertChanged(etags, ('/api/posts/', '/api/comments/'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = 'Yangi nom'
+            self.category.save()
+        self.assertChanged(etags, ('/api/posts/',))
+
+    def test_flushed_views_change_list_and_detail_etags(self):
+        url = f'/api/posts/{self.post.slug}/'
+        etags = self.etags()
+        detail = self.etag(url)
+        self.assertEqual(self.client.get(url, {'_': 'a'}, HTTP_IF_NONE_MATCH=detail).status_code, 304)
+
+        get_view_counter().flush()
+        self.assertChanged(etags, ('/api/posts/',))
+        self.assertEqual(self.client.get(url, {'_': 'b'}, HTTP_IF_NONE_MATCH=detail).status_code, 200)
+
+
+# ============================================
+# JAVOB KESHI (blog.cache)
+# ============================================
+class ResponseCacheTest(ViewCounterMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('cache@example.com', 'cache', 'pass12345')
+        cls.category = Category.objects.create(name='Cache')
+        cls.post = Post.objects.create(title='Cache', content='x', author=cls.author,
+                                       category=cls.category, status='published')
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def versions(self):
+        namespaces = ('posts', 'comments', 'categories')
+        return dict(zip(namespaces, get_response_cache().get_versions(namespaces)))
+
+    def assertBumped(self, before, namespaces):
+        after = self.versions()
+        for namespace, version in after.items():
+            with self.subTest(namespace=namespace):
+                if namespace in namespaces:
+                    self.assertGreater(version, before[namespace])
+                else:
+                    self.assertEqual(version, before[namespace])
+        return after
+
+    def test_writes_bump_namespace_versions(self):
+        """Har model o'z namespace'larini (CACHE_NAMESPACES) eskirtiradi - faqat commit'dan keyin"""
+        versions = self.versions()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.post.title = 'Cache edited'
+            self.post.save()
+        self.assertEqual(self.versions(), versions)
+        for callback in callbacks:
+            callback()
+        versions = self.assertBumped(versions, ('posts',))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(post=self.post, author=self.author, content='comment', is_approved=True)
+        versions = self.assertBumped(versions, ('comments', 'posts'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.description = 'yangi'
+            self.category.save()
+        self.assertBumped(versions, ('categories', 'posts'))
+
+    def test_invalidation_on_commit_makes_next_get_a_miss(self):
+        for url in ('/api/posts/', f'/api/posts/{self.post.slug}/'):
+            with self.subTest(url=url):
+                cache.clear()
+                self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+                self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+                title = f'Edited {url}'
+                with self.captureOnCommitCallbacks() as callbacks:
+                    Post.objects.get(pk=self.post.pk).save()  # title o'zgarmaydi, faqat signal
+                    Post.objects.filter(pk=self.post.pk).update(title=title)
+                # Commit bo'lmaguncha eski javob
+                self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+                for callback in callbacks:
+                    callback()
+                response = self.client.get(url)
+                self.assertEqual(response['X-Cache'], 'MISS')
+                self.assertIn(title, response.content.decode())
+                self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+    def test_cached_hit_honours_if_none_match(self):
+        """Kesh javobi ham mos ETag'ga 304, mos kelmasa - keshdagi tana bilan 200"""
+        for url in ('/api/posts/', f'/api/posts/{self.post.slug}/', '/api/categories/'):
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                self.assertEqual(first.status_code, 200)
+                etag = first['ETag']
+
+                # Keshdan: validatorlar uchun ham SQL yo'q (304 javobi X-Cache'ni ko'chirmaydi)
+                with self.assertNumQueries(0):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+                self.assertEqual(response.content, b'')
+
+                response = self.client.get(url, HTTP_IF_NONE_MATCH='"stale"')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['X-Cache'], 'HIT')
+                self.assertEqual(response.content, first.content)
+
+
+# ============================================
+# SERVER-TIMING (blog.instrumentation)
+# ============================================
+PERFORMANCE = {'SAMPLE_RATE': 1.0, 'SERVER_TIMING': True, 'LOG': False, 'QUERY_BUDGET': None}
+
+
+@override_settings(PERFORMANCE=PERFORMANCE)
+class ServerTimingTest(ViewCounterMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user('timing@example.com', 'timing', 'pass12345')
+        cls.post = Post.objects.create(title='Timing', content='x', author=author, status='published')
+        Comment.objects.create(post=cls.post, author=author, content='comment', is_approved=True)
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def server_timing(self, response):
+        """'total;dur=1.2, db;dur=0.4;desc="3 queries", ...' -> {'total': (1.2, None), 'db': (0.4, '3 queries')}"""
+        phases = {}
+        for part in response['Server-Timing'].split(', '):
+            match = re.fullmatch(r'(\w+);dur=([\d.]+)(?:;desc="([^"]*)")?', part)
+            self.assertIsNotNone(match, part)
+            phases[match[1]] = (float(match[2]), match[3])
+        return phases
+
+    def test_header_counts_queries(self):
+        for url in ('/api/posts/', f'/api/posts/{self.post.slug}/', '/api/comments/'):
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connections['default']) as queries:
+                    response = self.client.get(url)
+                phases = self.server_timing(response)
+                self.assertEqual(set(phases), {'total', 'db', 'serialize', 'render'})
+                self.assertEqual(phases['db'][1], f'{len(queries)} queries')
+                self.assertGreater(len(queries), 0)
+                self.assertGreaterEqual(phases['total'][0], phases['db'][0])
+
+    def test_cache_hit_has_no_queries(self):
+        self.client.get('/api/posts/')
+        response = self.client.get('/api/posts/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(self.server_timing(response)['db'][1], '0 queries')
+
+    def test_render_is_timed_for_every_renderer(self):
+        """render() view'dan keyin (middleware) yoki javob keshida - renderer o'zi o'lchamasa ham"""
+        def slow_render(renderer, data, accepted_media_type=None, renderer_context=None):
+            time.sleep(0.02)
+            return b'{}'
+
+        token = AccessToken.for_user(self.post.author)
+        cases = (
+            ('/api/posts/', {}),  # javob keshi (MISS) view ichida render qiladi
+            ('/api/posts/my/', {'HTTP_AUTHORIZATION': f'Bearer {token}'}),  # keshsiz - handler render qiladi
+        )
+        with mock.patch('blog.renderers.FastJSONRenderer.render', slow_render):
+            for url, headers in cases:
+                with self.subTest(url=url):
+                    response = self.client.get(url, HTTP_ACCEPT='application/json', **headers)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertGreaterEqual(self.server_timing(response)['render'][0], 20)
+
+    @override_settings(PERFORMANCE=dict(PERFORMANCE, SAMPLE_RATE=0))
+    def test_unsampled_request_has_no_header(self):
+        self.assertNotIn('Server-Timing', self.client.get('/api/posts/'))
+
+
+# ============================================
+# /metrics KIRISH
+# ============================================
+class MetricsAccessTest(TestCase):
+    def get(self, remote_addr='127.0.0.1', **headers):
+        return self.client.get('/metrics', REMOTE_ADDR=remote_addr, **headers).status_code
+
+    @override_settings(METRICS={})
+    def test_closed_without_configuration(self):
+        self.assertEqual(self.get(), 403)
+        self.assertEqual(self.get('::1'), 403)
+
+    @override_settings(METRICS={'TOKEN': 's3cret', 'ALLOWED_IPS': ('127.0.0.1',)})
+    def test_token_required_even_from_allowed_ip(self):
+        self.assertEqual(self.get(), 403)
+        self.assertEqual(self.get(HTTP_AUTHORIZATION='Bearer wrong'), 403)
+        self.assertEqual(self.get(HTTP_AUTHORIZATION='Bearer s3cret'), 200)
+        self.assertEqual(self.get('10.0.0.5', HTTP_AUTHORIZATION='Bearer s3cret'), 403)
+
+    @override_settings(METRICS={'ALLOWED_IPS': ('127.0.0.1', '10.0.0.7')})
+    def test_forwarded_for_ignored_without_trusted_proxy(self):
+        self.assertEqual(self.get('10.0.0.5', HTTP_X_FORWARDED_FOR='127.0.0.1'), 403)
+        self.assertEqual(self.get('10.0.0.7'), 200)
+
+    @override_settings(METRICS={'ALLOWED_IPS': ('10.0.0.7',), 'TRUSTED_PROXIES': ('127.0.0.1',)})
+    def test_local_reverse_proxy(self):
+        """Proxy orqali tashqi klient 127.0.0.1 bo'lib ko'rinmaydi; klient yozgan chap qism hisobga olinmaydi"""
+        self.assertEqual(self.get(), 403)
+        self.assertEqual(self.get(HTTP_X_FORWARDED_FOR='203.0.113.9'), 403)
+        self.assertEqual(self.get(HTTP_X_FORWARDED_FOR='10.0.0.7, 203.0.113.9'), 403)
+        self.assertEqual(self.get(HTTP_X_FORWARDED_FOR='10.0.0.7'), 200)
+
+
+class MetricsExpositionTest(TestCase):
+    """/metrics: Prometheus text format, histogram'lar va worker snapshot fayllarini yig'ish"""
+    sample = re.compile(r'([a-z_]+)(?:\{((?:[a-z_]+="(?:[^"\\]|\\.)*",?)*)\})? (\S+)')
+    view_labels = ('test.view', 'GET', '200')
+
+    def setUp(self):
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        self.directory = directory
+        self.enterContext(override_settings(METRICS={
+            'TOKEN': 's3cret', 'MULTIPROCESS_DIR': directory, 'WRITE_INTERVAL': 0,
+        }))
+
+    def worker_file(self, pid, started, requests, latencies):
+        """Boshqa worker snapshot'i: requests ta so'rov, latency histogram'i va gauge"""
+        buckets = metrics.LATENCY.buckets
+        histogram = [0] * (len(buckets) + 1) + [0.0]
+        for seconds in latencies:
+            histogram[bisect.bisect_left(buckets, seconds)] += 1
+            histogram[-1] += seconds
+        data = {
+            'pid': pid, 'started': started,
+            'values': [
+                [metrics.REQUESTS.name, list(self.view_labels), requests],
+                [metrics.LATENCY.name, ['test.view', '200'], histogram],
+            ],
+            'gauges': [[metrics.VIEW_COUNTER_LAG.name, [str(pid)], 1.5]],
+        }
+        path = metrics.snapshot_path(self.directory, (pid, started))
+        with open(path, 'w') as file:
+            json.dump(data, file)
+        return path
+
+    def scrape(self):
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], metrics.CONTENT_TYPE)
+        return self.parse(response.content.decode())
+
+    def parse(self, text):
+        """{(nom, label'lar): qiymat} - har qator HELP/TYPE yoki namuna bo'lishi shart"""
+        self.assertTrue(text.endswith('\n'))
+        samples, types = {}, {}
+        for line in text.splitlines():
+            if line.startswith('# HELP '):
+                continue
+            if line.startswith('# TYPE '):
+                _, _, name, kind = line.split(' ')
+                self.assertIn(kind, ('counter', 'gauge', 'histogram'))
+                types[name] = kind
+                continue
+            match = self.sample.fullmatch(line)
+            self.assertIsNotNone(match, line)
+            name, labels, value = match.groups()
+            base = re.sub(r'_(bucket|sum|count)$', '', name) if name not in types else name
+            self.assertIn(base, types, f'{name}: TYPE qatoridan oldin')
+            labels = tuple(re.findall(r'([a-z_]+)="((?:[^"\\]|\\.)*)"', labels or ''))
+            samples[(name, labels)] = float(value)
+        return samples, types
+
+    def histogram(self, samples, name, labels):
+        """Bucket'lar o'sib boradi, oxirgisi +Inf = _count; (bucket'lar, _sum, _count)"""
+        buckets = sorted(
+            (float(dict(key)['le']), value) for (sample, key), value in samples.items()
+            if sample == f'{name}_bucket' and tuple(pair for pair in key if pair[0] != 'le') == labels
+        )
+        bounds = [float(bound) for bound in metrics.LATENCY.buckets] + [math.inf]
+        self.assertEqual([bound for bound, _ in buckets], bounds)
+        counts = [count for _, count in buckets]
+        self.assertEqual(counts, sorted(counts))
+        self.assertEqual(counts[-1], samples[(f'{name}_count', labels)])
+        return counts, samples[(f'{name}_sum', labels)], samples[(f'{name}_count', labels)]
+
+    def test_exposition_aggregates_worker_snapshots(self):
+        self.client.get('/api/categories/')
+        dead = subprocess.Popen([sys.executable, '-c', 'pass'])
+        dead.wait()
+        dead_path = self.worker_file(dead.pid, 1, requests=5, latencies=[0.003, 0.02, 0.02, 0.7, 20])
+        self.worker_file(os.getppid(), 2, requests=2, latencies=[0.003, 0.3])
+
+        samples, types = self.scrape()
+        self.assertEqual(types[metrics.LATENCY.name], 'histogram')
+        self.assertEqual(types[metrics.REQUESTS.name], 'counter')
+        labels = tuple(zip(metrics.REQUESTS.labelnames, self.view_labels))
+        self.assertEqual(samples[(metrics.REQUESTS.name, labels)], 7)
+
+        latency = (('view', 'test.view'), ('status', '200'))
+        counts, total, count = self.histogram(samples, metrics.LATENCY.name, latency)
+        self.assertEqual(count, 7)
+        self.assertAlmostEqual(total, 0.003 + 0.02 + 0.02 + 0.7 + 20 + 0.003 + 0.3)
+        self.assertEqual(counts[0], 2)  # le=0.005
+        self.assertEqual(counts[-2], 6)  # le=10 - 20 sekund faqat +Inf'da
+
+        # Joriy jarayon so'rovi ham (o'z snapshot'idan), o'lgan worker gauge'i - yo'q
+        self.assertTrue(any(
+            name == metrics.REQUESTS.name and ('view', 'category-list') in key for name, key in samples
+        ))
+        self.assertNotIn((metrics.VIEW_COUNTER_LAG.name, (('pid', str(dead.pid)),)), samples)
+        self.assertIn((metrics.VIEW_COUNTER_LAG.name, (('pid', str(os.getppid())),)), samples)
+
+        # O'lgan worker fayli birlashtirildi va o'chirildi - keyingi scrape'da ikki marta sanalmaydi
+        self.assertFalse(os.path.exists(dead_path))
+        self.assertTrue(os.path.exists(os.path.join(self.directory, metrics.MERGED_FILE)))
+        samples, _ = self.scrape()
+        self.assertEqual(samples[(metrics.REQUESTS.name, labels)], 7)
+        self.assertEqual(self.histogram(samples, metrics.LATENCY.name, latency)[2], 7)
+
+    def test_snapshot_file_is_keyed_by_pid_and_start_time(self):
+        metrics.write_snapshot(self.directory)
+        pid, started = metrics.process_identity()
+        self.assertEqual(pid, os.getpid())
+        path = metrics.snapshot_path(self.directory)
+        self.assertEqual(os.path.basename(path), f'blog-metrics-{pid}-{started}.json')
+        with open(path) as file:
+            self.assertEqual(json.load(file)['started'], started)
+
+
+# ============================================
+# READ REPLICA ROUTING
+# ============================================
+REPLICA = 'replica_test'
+
+
+@override_settings(READ_REPLICAS={'ALIASES': [REPLICA], 'STICKY_SECONDS': 5})
+class ReplicaRoutingTest(TransactionTestCase):
+    """
+    Replica o'rniga test bazasiga ikkinchi ulanish (alohida alias, shu bazaning o'zi).
+    TransactionTestCase - commit qilingan ma'lumot ikkala ulanishdan ko'rinadi.
+    MIRROR bo'lgani uchun alias flush qilinmaydi.
+    """
+    databases = '__all__'  # setUpClass'da qo'shilgan alias ham; runner esa faqat settings'dagilarni yaratadi
+
+    @classmethod
+    def setUpClass(cls):
+        connections.settings[REPLICA] = dict(connections['default'].settings_dict, TEST={'MIRROR': 'default'})
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('replica@example.com', 'replica', 'pass12345')
+        Category.objects.create(name='Replica')
+
+    def aliases_used(self, request):
+        """request() davomida har bir alias'da bajarilgan so'rovlar soni"""
+        captures = {alias: CaptureQueriesContext(connections[alias]) for alias in ('default', REPLICA)}
+        with ExitStack() as stack:
+            for capture in captures.values():
+                stack.enter_context(capture)
+            response = request()
+        self.assertLess(response.status_code, 400)
+        return {alias: len(capture) for alias, capture in captures.items()}
+
+    # Har so'rovda boshqa query string - javob keshidan (commit'dan keyingi warm ham) emas, bazadan o'qiladi
+    def test_anonymous_reads_use_replica(self):
+        used = self.aliases_used(lambda: APIClient().get('/api/categories/?replica=anonymous'))
+        self.assertEqual(used['default'], 0)
+        self.assertGreater(used[REPLICA], 0)
+
+    def test_writer_reads_primary_while_sticky(self):
+        """Yozuv - primary; keyin shu client (cookie) va shu user (kesh) ham primary'dan o'qiydi"""
+        client = APIClient()
+        client.force_authenticate(self.user)
+        used = self.aliases_used(lambda: client.post(
+            '/api/posts/create/', {'title': 'Replica post', 'content': 'x'}, format='json',
+        ))
+        self.assertEqual(used[REPLICA], 0)
+        self.assertIn('db_primary', client.cookies)
+
+        for name, reader in (('cookie', client), ('user', self.other_client_of_same_user())):
+            used = self.aliases_used(lambda: reader.get(f'/api/posts/?replica={name}'))
+            self.assertEqual(used[REPLICA], 0)
+            self.assertGreater(used['default'], 0)
+
+    def test_primary_override(self):
+        """db_routing = 'primary' (MyPostsView) replica'ga bormaydi"""
+        client = self.other_client_of_same_user()
+        used = self.aliases_used(lambda: client.get('/api/posts/my/'))
+        self.assertEqual(used[REPLICA], 0)
+        self.assertGreater(used['default'], 0)
+
+    def other_client_of_same_user(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        return client
+
+
+# ============================================
+# SLUG'LAR
+# ============================================
+class LongTitleSlugTest(TestCase):
+    title = 'a' * 200  # slug max_length'ni to'liq egallaydi
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('slugs@example.com', 'slugs', 'pass12345')
+
+    def test_repeated_long_titles_get_distinct_slugs(self):
+        """Uchinchi va keyingi postlar ham IntegrityError'siz yangi suffix oladi"""
+        slugs = [
+            Post.objects.create(title=self.title, content='x', author=self.author).slug
+            for _ in range(4)
+        ]
+        self.assertEqual(len(set(slugs)), 4)
+        self.assertTrue(all(len(slug) <= 200 for slug in slugs))
+
+    def test_batch_allocation_skips_existing_suffixes(self):
+        for _ in range(3):
+            Post.objects.create(title=self.title, content='x', author=self.author)
+        existing = set(Post.objects.values_list('slug', flat=True))
+        slugs = allocate_slugs(Post, [self.title] * 3)
+        self.assertEqual(len(set(slugs)), 3)
+        self.assertFalse(existing & set(slugs))
+
+
+class SlugCollisionTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('collide@example.com', 'collide', 'pass12345')
+
+    def test_colliding_titles_cost_the_same_queries(self):
+        """Bir xil sarlavhali 50-post ham 2-post kabi: bitta slug so'rovi + insert, IntegrityError'siz"""
+        counts = []
+        for number in range(50):
+            with CaptureQueriesContext(connections['default']) as queries:
+                post = Post.objects.create(title='Same title', content='x', author=self.author)
+            counts.append(len(queries))
+            self.assertEqual(post.slug, 'same-title' if number == 0 else f'same-title-{number + 1}')
+        self.assertEqual(counts[1], counts[-1])
+
+    def test_slug_taken_concurrently_is_retried_once(self):
+        """Oldindan tekshiruvdan keyin slug'ni parallel insert olib qo'ydi - keyingi bo'sh slug bilan"""
+        Post.objects.create(title='Race', content='x', author=self.author)
+        with mock.patch('blog.slugs.unique_slug', side_effect=['race', 'race-2']) as allocate:
+            post = Post.objects.create(title='Race', content='x', author=self.author)
+        self.assertEqual(post.slug, 'race-2')
+        self.assertEqual(allocate.call_count, 2)
+
+        with mock.patch('blog.slugs.unique_slug', return_value='race'), self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                Post.objects.create(title='Race', content='x', author=self.author)
+
+    def test_other_integrity_errors_are_not_retried(self):
+        """unique name buzilsa - slug qayta ajratilmaydi, xato o'zgarmasdan chiqadi"""
+        Category.objects.create(name='Duplicate')
+        with mock.patch('blog.slugs.unique_slug', wraps=unique_slug) as allocate:
+            with self.assertRaises(IntegrityError) as error, transaction.atomic():
+                Category.objects.create(name='Duplicate')
+        self.assertEqual(allocate.call_count, 1)
+        self.assertIn('name', str(error.exception))
+
+    def test_batch_allocation_matches_unique_slug(self):
+        """allocate_slugs ham faqat 'stem-<raqam>' ni suffix deb oladi ('django-tips' emas), bitta SELECT"""
+        for slug in ('django', 'django-7', 'django-tips', 'django-tips-x'):
+            Post.objects.create(title=slug, slug=slug, content='x', author=self.author)
+        self.assertEqual(unique_slug(Post, 'Django'), 'django-8')
+
+        with CaptureQueriesContext(connections['default']) as queries:
+            slugs = allocate_slugs(Post, ['Django', 'Django', 'Django Tips', 'Django Tips', 'Flask'])
+        self.assertEqual(slugs, ['django-8', 'django-9', 'django-tips-2', 'django-tips-3', 'flask'])
+        self.assertEqual(len(queries), 1)
+
+
+class ReservedSlugTest(ViewCounterMixin, TestCase):
+    titles = ('My', 'Create', 'Export', 'Bulk')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('reserved@example.com', 'reserved', 'pass12345')
+
+    def test_posts_named_like_fixed_routes_stay_reachable(self):
+        """posts/my/, posts/create/, ... posts/<slug>/ dan oldin - bunday slug'li post ochilmasdi"""
+        for title in self.titles:
+            with self.subTest(title=title):
+                post = Post.objects.create(title=title, content='x', author=self.author, status='published')
+                self.assertEqual(post.slug, f'{title.lower()}-2')
+                response = self.client.get(f'/api/posts/{post.slug}/')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()['id'], post.pk)
+
+    def test_batch_allocation_skips_reserved_slugs(self):
+        slugs = allocate_slugs(Post, self.titles * 2)
+        self.assertFalse(set(slugs) & set(Post.reserved_slugs))
+        self.assertEqual(len(set(slugs)), len(slugs))
+
+
+# ============================================
+# SPARSE FIELDSETS (?fields=)
+# ============================================
+@override_settings(FAST_PATH_LISTS=False)
+class CommentSparseFieldsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user('sparse@example.com', 'sparse', 'pass12345')
+        post = Post.objects.create(title='Sparse', content='x', author=author, status='published')
+        cls.root = Comment.objects.create(post=post, author=author, content='root', is_approved=True)
+        for number in range(20):
+            Comment.objects.create(post=post, author=author, content=f'comment {number}', is_approved=True,
+                                   parent=cls.root if number < 3 else None)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_replies_count_does_not_reload_parent_per_row(self):
+        """Serializer yo'li: Last-Modified + ro'yxat + CommentTree - sahifa hajmidan qat'i nazar"""
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/comments/?fields=id,replies_count&page_size=50')
+        self.assertEqual(response.status_code, 200)
+        counts = {item['id']: item['replies_count'] for item in response.json()['results']}
+        self.assertEqual(len(counts), 21)
+        self.assertEqual(counts[self.root.pk], 3)
+
+
+# ============================================
+# NDJSON EXPORT (blog.export)
+# ============================================
+class ExportStreamingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('export@example.com', 'export', 'pass12345')
+        cls.category = Category.objects.create(name='Export')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def create_posts(self, count):
+        Post.objects.bulk_create(
+            Post(title=f'Export {number}', slug=f'export-{number}', content='x', author=self.author,
+                 category=self.category, status='published')
+            for number in range(Post.objects.count(), Post.objects.count() + count)
+        )
+
+    def consume(self, url):
+        """(chunk'lar, so'rovlar soni) - javob oqimi to'liq o'qiladi"""
+        with CaptureQueriesContext(connections['default']) as queries:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            chunks = list(response.streaming_content)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        return chunks, len(queries)
+
+    def test_posts_stream_in_chunks_of_valid_json_lines(self):
+        """Har chunk_size qatordan bitta bo'lak, har satr - alohida JSON obyekt"""
+        self.create_posts(12)
+        with mock.patch('blog.views.PostExportView.export_chunk_size', 5):
+            chunks, _ = self.consume('/api/posts/export/')
+
+        self.assertEqual(len(chunks), 3)  # 5 + 5 + 2
+        lines = b''.join(chunks).decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 12)
+        items = [json.loads(line) for line in lines]
+        self.assertEqual({item['slug'] for item in items}, {f'export-{number}' for number in range(12)})
+        self.assertEqual(items[0]['author'], {'id': self.author.pk, 'username': 'export'})
+        self.assertEqual(items[0]['category']['name'], 'Export')
+
+    def test_queries_do_not_grow_with_rows(self):
+        """Bog'langan author/category JOIN bilan - qatorlar soni so'rovlar sonini o'zgartirmaydi"""
+        counts = []
+        for total in (3, 60):
+            self.create_posts(total - Post.objects.count())
+            Comment.objects.bulk_create(
+                Comment(post=post, author=self.author, content='x', is_approved=True)
+                for post in Post.objects.filter(comments__isnull=True)
+            )
+            with mock.patch('blog.views.PostExportView.export_chunk_size', 7):
+                _, posts_queries = self.consume('/api/posts/export/')
+            with mock.patch('blog.views.CommentExportView.export_chunk_size', 7):
+                chunks, comments_queries = self.consume('/api/comments/export/')
+            self.assertEqual(len(b''.join(chunks).splitlines()), total)
+            counts.append((posts_queries, comments_queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_rows_are_streamed_not_materialized(self):
+        """
+        Xotira qatorlar soniga bog'liq emas: iterator(chunk_size) ishlatiladi, queryset
+        _fetch_all() bilan to'liq o'qilmaydi va birinchi bo'lak faqat chunk_size qatorni map qiladi
+        """
+        self.create_posts(1000)
+        chunk_size = 25
+        iterator_calls = []
+        original_iterator = QuerySet.iterator
+
+        def iterator(queryset, *args, **kwargs):
+            iterator_calls.append(kwargs.get('chunk_size', args[0] if args else None))
+            return original_iterator(queryset, *args, **kwargs)
+
+        def fetch_all(queryset):
+            raise AssertionError('export queryset materializatsiya qilindi')
+
+        with ExitStack() as stack:
+            stack.enter_context(mock.patch('blog.views.PostExportView.export_chunk_size', chunk_size))
+            stack.enter_context(mock.patch.object(QuerySet, 'iterator', iterator))
+            stack.enter_context(mock.patch.object(QuerySet, '_fetch_all', fetch_all))
+            map_rows = stack.enter_context(
+                mock.patch.object(fastpath.RowMapper, 'map_rows', autospec=True, side_effect=fastpath.RowMapper.map_rows)
+            )
+            response = self.client.get('/api/posts/export/')
+            self.assertEqual(response.status_code, 200)
+            chunks = iter(response.streaming_content)
+
+            first = next(chunks)
+            self.assertEqual(len(first.splitlines()), chunk_size)
+            self.assertEqual(map_rows.call_count, chunk_size)
+
+            rest = list(chunks)
+
+        self.assertEqual(iterator_calls, [chunk_size])
+        self.assertEqual(len(rest), 1000 // chunk_size - 1)
+        self.assertTrue(all(len(chunk.splitlines()) == chunk_size for chunk in rest))
+        self.assertEqual(map_rows.call_count, 1000)
+
+
+# ============================================
+# BULK IMPORT (blog.bulk)
+# ============================================
+class BulkCreateTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('bulk@example.com', 'bulk', 'pass12345')
+        cls.category = Category.objects.create(name='Bulk')
+        cls.post = Post.objects.create(title='Bulk target', content='x', author=cls.author, status='published')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def posts(self, count, start=0):
+        return [
+            {'title': f'Bulk post {number}', 'content': 'x', 'category': self.category.pk, 'status': 'published'}
+            for number in range(start, start + count)
+        ]
+
+    def comments(self, count):
+        return [{'post': self.post.pk, 'content': f'Comment {number}'} for number in range(count)]
+
+    def test_valid_items_are_created_with_their_indexes(self):
+        response = self.client.post('/api/posts/bulk/', {'items': self.posts(3)}, format='json')
+        self.assertEqual(response.status_code, 201)
+        created = response.json()['created']
+        self.assertEqual([item['index'] for item in created], [0, 1, 2])
+        self.assertEqual(response.json()['errors'], [])
+        posts = Post.objects.in_bulk([item['id'] for item in created])
+        for item in created:
+            self.assertEqual(posts[item['id']].slug, item['slug'])
+            self.assertEqual(posts[item['id']].author, self.author)
+
+    def test_invalid_items_are_reported_by_index(self):
+        """Xato elementlar batch'ni to'xtatmaydi; hammasi xato bo'lsa - 400"""
+        items = self.posts(4)
+        items[1]['title'] = 'abc'
+        items[3]['category'] = 999999
+        response = self.client.post('/api/posts/bulk/', items, format='json')
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual([item['index'] for item in data['created']], [0, 2])
+        self.assertEqual([error['index'] for error in data['errors']], [1, 3])
+        self.assertIn('title', data['errors'][0]['errors'])
+        self.assertIn('category', data['errors'][1]['errors'])
+
+        before = Comment.objects.count()
+        response = self.client.post('/api/comments/bulk/', [{'post': self.post.pk, 'content': 'x'}, 'bad'], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['created'], [])
+        self.assertEqual([error['index'] for error in response.json()['errors']], [0, 1])
+        self.assertEqual(Comment.objects.count(), before)
+
+        response = self.client.post('/api/posts/bulk/', {'title': 'Not a list'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('items', response.json())
+
+    def test_batch_size_is_capped_at_1000(self):
+        before = Comment.objects.count()
+        response = self.client.post('/api/comments/bulk/', self.comments(1001), format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('items', response.json())
+        self.assertEqual(Comment.objects.count(), before)
+
+        response = self.client.post('/api/comments/bulk/', self.comments(1000), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()['created']), 1000)
+        self.assertEqual(Comment.objects.count(), before + 1000)
+
+    def test_slug_collision_is_retried_once(self):
+        """Parallel import slug'ni olib qo'ygan: slug'lar qayta ajratiladi, ikkinchi xato chiqadi"""
+        with mock.patch('blog.views.allocate_slugs', side_effect=[['bulk-target'], ['bulk-fresh']]) as allocate:
+            response = self.client.post('/api/posts/bulk/', self.posts(1), format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['created'][0]['slug'], 'bulk-fresh')
+        self.assertEqual(allocate.call_count, 2)
+
+        with mock.patch('blog.views.allocate_slugs', return_value=['bulk-target']) as allocate:
+            with self.assertRaises(IntegrityError):
+                self.client.post('/api/posts/bulk/', self.posts(1), format='json')
+        self.assertEqual(allocate.call_count, 2)
+
+    def test_created_items_invalidate_cached_lists(self):
+        """bulk_create post_save yubormaydi - kesh commit'dan keyin qo'lda eskirtiriladi"""
+        for url, list_url, items, namespaces in (
+            ('/api/posts/bulk/', '/api/posts/?page_size=50', self.posts(2), ('posts',)),
+            ('/api/comments/bulk/', f'/api/comments/?post={self.post.pk}&page_size=50', self.comments(2),
+             ('comments', 'posts')),
+        ):
+            with self.subTest(url=url):
+                total = len(self.client.get(list_url).json()['results'])
+                versions = get_response_cache().get_versions(namespaces)
+                with self.captureOnCommitCallbacks(execute=True):
+                    response = self.client.post(url, items, format='json')
+                self.assertEqual(response.status_code, 201)
+                new_versions = get_response_cache().get_versions(namespaces)
+                self.assertTrue(all(new > old for new, old in zip(new_versions, versions)))
+                self.assertEqual(len(self.client.get(list_url).json()['results']), total + 2)
+
+    def test_queries_do_not_grow_with_batch(self):
+        for url, build in (('/api/posts/bulk/', self.posts), ('/api/comments/bulk/', self.comments)):
+            counts = []
+            for size in (2, 50):
+                items = build(size)
+                if url == '/api/comments/bulk/':
+                    parent = Comment.objects.create(post=self.post, author=self.author, content='Parent')
+                    items[-1]['parent'] = parent.pk
+                with CaptureQueriesContext(connections['default']) as queries:
+                    response = self.client.post(url, items, format='json')
+                self.assertEqual(response.status_code, 201)
+                counts.append(len(queries))
+            self.assertEqual(counts[0], counts[1], url)
+
+
+# ============================================
+# RASM YUKLASH (core.uploads)
+# ============================================
+def png_bytes(width=40, height=30):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), 'teal').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def png_with_size(width, height):
+    """Kichik PNG, IHDR'da boshqa o'lcham (CRC to'g'ri) - header katta rasmni da'vo qiladi"""
+    data = bytearray(png_bytes())
+    ihdr = data[12:29]  # b'IHDR' + 13 bayt
+    ihdr[4:12] = struct.pack('>II', width, height)
+    data[12:29] = ihdr
+    data[29:33] = struct.pack('>I', zlib.crc32(bytes(ihdr)))
+    return bytes(data)
+
+
+class ImageUploadTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('upload@example.com', 'upload', 'pass12345')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+        self.media_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(
+            MEDIA_ROOT=self.media_root,
+            IMAGE_PIPELINE={'BACKEND': 'core.images.ImmediateBackend', 'MAX_PIXELS': 1_000_000},
+            UPLOADS={'MAX_FILE_SIZE': 64 * 2**10, 'MAX_REQUEST_SIZE': 128 * 2**10, 'CHUNK_SIZE': 4 * 2**10},
+        ))
+
+    def upload(self, content, name='rasm.png'):
+        return self.client.post('/api/posts/create/', {
+            'title': 'Rasmli post', 'content': 'x', 'status': 'published',
+            'image': SimpleUploadedFile(name, content, content_type='image/png'),
+        }, format='multipart')
+
+    def assertRejected(self, response, code):
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertIn('image', response.json())
+        self.assertFalse(Post.objects.exists())
+        self.assertEqual(code, response.data['image'][0].code)
+
+    def test_valid_image_saved(self):
+        response = self.upload(png_bytes())
+        self.assertEqual(response.status_code, 201, response.content)
+        post = Post.objects.get()
+        self.assertTrue(post.image.storage.exists(post.image.name))
+        with Image.open(post.image.path) as image:
+            self.assertEqual((image.format, image.size), ('PNG', (40, 30)))
+
+    def test_oversize_file_rejected(self):
+        content = png_bytes() + b'\0' * (65 * 2**10)
+        self.assertRejected(self.upload(content), 'file_too_large')
+
+    def test_non_image_rejected(self):
+        self.assertRejected(self.upload(b'oddiy matn, rasm emas\n' * 50, name='rasm.png'), 'invalid_image')
+
+    def test_corrupted_body_rejected_by_verify(self):
+        """Header to'g'ri, IDAT buzilgan - Image.verify() CRC xatosini topadi"""
+        data = bytearray(png_bytes())
+        idat = data.index(b'IDAT')
+        data[idat + 6] ^= 0xFF
+        self.assertRejected(self.upload(bytes(data)), 'invalid_image')
+
+    def test_huge_dimensions_rejected_before_decode(self):
+        """Decompression bomb / MAX_PIXELS: faqat header o'qiladi, piksellar decode qilinmaydi"""
+        for width, height in ((100_000, 100_000), (2000, 1000)):
+            content = png_with_size(width, height)
+            with self.subTest(size=(width, height)), mock.patch.object(Image.Image, 'load') as load:
+                self.assertRejected(self.upload(content), 'image_too_large')
+                load.assert_not_called()
+
+
+class ImagePipelineTest(TestCase):
+    """ImmediateBackend: variant nomlari, srcset va eski variantlarni tozalash"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('pipeline@example.com', 'pipeline', 'pass12345')
+
+    def setUp(self):
+        cache.clear()
+        self.media_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(
+            MEDIA_ROOT=self.media_root,
+            IMAGE_PIPELINE={'BACKEND': 'core.images.ImmediateBackend', 'WIDTHS': (320, 640)},
+        ))
+
+    def save_image(self, post, name, size):
+        with self.captureOnCommitCallbacks(execute=True):
+            post.image = SimpleUploadedFile(name, png_bytes(*size), content_type='image/png')
+            post.save()
+        post.refresh_from_db()
+        return post.image_variants
+
+    def test_variants_srcset_and_stale_cleanup(self):
+        post = Post.objects.create(title='Pipeline', content='x', author=self.author, status='published')
+        storage = post.image.storage
+        versions = get_response_cache().get_versions(('posts',))
+
+        variants = self.save_image(post, 'birinchi.png', (1000, 500))
+        self.assertEqual(variants['source'], post.image.name)
+        self.assertEqual((variants['width'], variants['height']), (1000, 500))
+        self.assertEqual(variants['webp'], {
+            '320': 'posts/variants/birinchi-320w.webp', '640': 'posts/variants/birinchi-640w.webp',
+        })
+        for name in variants['webp'].values():
+            with storage.open(name) as file, Image.open(file) as image:
+                self.assertEqual(image.format, 'WEBP')
+        # process_image .update() qiladi - javob keshi variants_ready signali bilan eskiradi
+        self.assertNotEqual(get_response_cache().get_versions(('posts',)), versions)
+
+        srcset = self.client.get(f'/api/posts/{post.slug}/').json()['image_srcset']
+        self.assertEqual(srcset, {
+            '320w': 'http://testserver/media/posts/variants/birinchi-320w.webp',
+            '640w': 'http://testserver/media/posts/variants/birinchi-640w.webp',
+        })
+
+        # Kichik rasm: bitta variant (o'z kengligida), eski variantlar o'chiriladi
+        stale = list(variants['webp'].values())
+        variants = self.save_image(post, 'ikkinchi.png', (200, 100))
+        self.assertEqual(variants['webp'], {'200': 'posts/variants/ikkinchi-200w.webp'})
+        self.assertTrue(storage.exists(variants['webp']['200']))
+        for name in stale:
+            self.assertFalse(storage.exists(name), name)
+
+
+class ThreadPoolBackendTest(SimpleTestCase):
+    def test_dropped_jobs_are_logged(self):
+        """shutdown(wait=False) bekor qilgan va yopilgandan keyin yuborilgan job'lar log'da"""
+        backend = ThreadPoolBackend(workers=1)
+        started, release = threading.Event(), threading.Event()
+
+        def busy():
+            started.set()
+            release.wait(5)
+
+        backend.submit(busy)
+        self.assertTrue(started.wait(5))
+        backend.submit(process_image, 'blog.Post', 1, 'image', ())  # navbatda qoladi
+        with self.assertLogs('core.images', 'WARNING') as logs:
+            backend.shutdown(wait=False)
+            self.assertIsNone(backend.submit(process_image, 'blog.Post', 2, 'image', ()))
+        release.set()
+
+        self.assertEqual(len(logs.output), 2)
+        self.assertIn("bekor qilindi: process_image('blog.Post', 1, 'image', ())", logs.output[0])
+        self.assertIn("backend yopilgan): process_image('blog.Post', 2, 'image', ())", logs.output[1])
+
+
+# ============================================
+# FAST PATH (RowMapper keshi)
+# ============================================
+class RowMapperCacheTest(SimpleTestCase):
+    def test_unknown_fields_share_mapper(self):
+        mapper = fastpath.get_row_mapper(PostListSerializer, parse_fields('id,title'))
+        self.assertIs(fastpath.get_row_mapper(PostListSerializer, parse_fields('title,nope,id')), mapper)
+        self.assertIs(fastpath.get_row_mapper(PostListSerializer, parse_fields('id,title,id.x')), mapper)
+
+    def test_cache_is_bounded(self):
+        """Klient yuborgan har xil ?fields= qiymatlari keshni cheksiz o'stirmaydi"""
+        for number in range(fastpath.MAX_MAPPERS * 2):
+            fastpath.get_row_mapper(PostListSerializer, parse_fields(f'id,title,junk{number}'))
+            fastpath.get_row_mapper(PostListSerializer, parse_fields(f'id,author.junk{number}'))
+        self.assertLessEqual(len(fastpath._mappers), fastpath.MAX_MAPPERS)
+
+
+class RowMapperEquivalenceTest(TestCase):
+    """mapper.map(qs.values(...)) va Serializer(qs, many=True).data - bir xil natija"""
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user('mapper@example.com', 'mapper', 'pass12345')
+        category = Category.objects.create(name='Mapper', description='tavsif')
+        for number in range(6):
+            post = Post.objects.create(
+                title=f'Mapper {number}', content='x', excerpt=f'qisqa {number}', author=author,
+                category=category if number % 2 else None, status='published',
+            )
+            parents = [None]
+            for reply in range(number % 4):
+                parents.append(Comment.objects.create(
+                    post=post, author=author, content=f'comment {reply}', is_approved=True,
+                    parent=parents[reply % len(parents)] if reply % 3 != 2 else None,
+                ))
+        Post.objects.filter(title='Mapper 3').update(
+            image='posts/rasm.jpg',
+            image_variants={'source': 'posts/rasm.jpg', 'width': 800, 'height': 600,
+                            'webp': {'320': 'posts/variants/rasm-320w.webp', '640': 'posts/variants/rasm-640w.webp'}},
+        )
+
+    def assertSameOutput(self, serializer_class, queryset, fields=''):
+        spec = parse_fields(fields)
+        request = Request(RequestFactory().get('/api/', {'fields': fields} if fields else {}))
+        mapper = fastpath.get_row_mapper(serializer_class, spec)
+        self.assertIsNotNone(mapper)
+
+        queryset = queryset.order_by('-created_at', '-id')
+        expected = serializer_class(queryset, many=True, context={'request': request, 'sparse_fields': spec}).data
+        rows = mapper.map(queryset.values(*sorted(mapper.paths)), request)
+        self.assertTrue(rows)
+        self.assertEqual(json.loads(json.dumps(rows)), json.loads(json.dumps(expected)))
+
+    def test_posts(self):
+        queryset = Post.objects.filter(status='published').select_related('author', 'category')
+        for fields in ('', 'id,title,author.username,category.name,comments_count,image_srcset'):
+            with self.subTest(fields=fields):
+                self.assertSameOutput(PostListSerializer, queryset, fields)
+
+    def test_comments(self):
+        queryset = Comment.objects.filter(is_approved=True).select_related('author').with_counts()
+        for fields in ('', 'id,parent,replies,replies_count,author.username'):
+            with self.subTest(fields=fields):
+                self.assertSameOutput(CommentSerializer, queryset, fields)
+        self.assertSameOutput(CommentSerializer, queryset.filter(parent=None))
+
+
+# ============================================
+# ASYNC READ VIEWS
+# ============================================
+@override_settings(FAST_PATH_LISTS=True)  # o'chiq bo'lsa AsyncListView sinxron view'ga topshiradi
+class AsyncErrorResponseTest(TestCase):
+    cases = (
+        (PostDetailView, AsyncPostDetailView, '/api/posts/nope/', {'slug': 'nope'}),
+        (PostListView, AsyncListView, '/api/posts/?cursor=bad', {}),
+    )
+
+    def setUp(self):
+        cache.clear()
+
+    async def test_errors_match_sync_views(self):
+        """404 va boshqa xatolar: status, body va Content-Type sinxron DRF view bilan bir xil"""
+        for view_class, async_class, url, kwargs in self.cases:
+            with self.subTest(url=url):
+                expected = await sync_to_async(self.sync_response)(view_class, url, kwargs)
+                request = AsyncRequestFactory().get(url, headers={'Accept': 'application/json'})
+                response = await async_class.as_view(view_class)(request, **kwargs)
+                self.assertEqual(response.status_code, expected.status_code)
+                self.assertEqual(response['Content-Type'], expected['Content-Type'])
+                self.assertEqual(json.loads(response.content), json.loads(expected.content))
+
+    @staticmethod
+    def sync_response(view_class, url, kwargs):
+        response = view_class.as_view()(RequestFactory().get(url, HTTP_ACCEPT='application/json'), **kwargs)
+        return response.render()
+
+
+@override_settings(FAST_PATH_LISTS=True)
+class AsyncContentNegotiationTest(TestCase):
+    """Async view'lar ham Accept/?format= bo'yicha renderer tanlaydi, kesh kalitlari aralashmaydi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user('negotiate@example.com', 'negotiate', 'pass12345')
+        cls.post = Post.objects.create(title='Negotiate', content='x', author=author, status='published')
+
+    def setUp(self):
+        cache.clear()
+        self.enterContext(override_settings(VIEW_COUNTER={
+            'STORE': 'blog.view_counter.LocalMemoryStore', 'FLUSH_INTERVAL': 3600,
+        }))
+
+    async def get(self, view_class, async_class, url, kwargs, accept):
+        request = AsyncRequestFactory().get(url, headers={'Accept': accept})
+        response = await async_class.as_view(view_class)(request, **kwargs)
+        if hasattr(response, 'render'):
+            response = await sync_to_async(response.render)()
+        return response
+
+    async def test_renderer_follows_accept_and_format(self):
+        cases = (
+            (PostListView, AsyncListView, '/api/posts/', {}),
+            (PostDetailView, AsyncPostDetailView, f'/api/posts/{self.post.slug}/', {'slug': self.post.slug}),
+        )
+        for view_class, async_class, url, kwargs in cases:
+            with self.subTest(url=url):
+                # Avval HTML, keyin JSON, yana HTML - har biri o'z kalitida keshlanadi
+                for accept, query, content_type in (
+                    ('text/html', '', 'text/html'),
+                    ('application/json', '', 'application/json'),
+                    ('text/html', '', 'text/html'),
+                    ('*/*', '?format=api', 'text/html'),
+                    ('*/*', '?format=json', 'application/json'),
+                ):
+                    response = await self.get(view_class, async_class, url + query, kwargs, accept)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertTrue(response['Content-Type'].startswith(content_type), (accept, query))
+                    if content_type == 'application/json':
+                        json.loads(response.content)
+
+    async def test_unacceptable_media_type(self):
+        response = await self.get(PostListView, AsyncListView, '/api/posts/', {}, 'image/png')
+        self.assertEqual(response.status_code, 406)
+
+
+# ============================================
+# DENORMALIZATSIYA QILINGAN HISOBLAGICHLAR
+# ============================================
+class CategoryPostCountersTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('categories@example.com', 'categories', 'pass12345')
+
+    def assertCountersConsistent(self):
+        for category in Category.objects.with_published_counts():
+            self.assertEqual(category.published_posts_count, category.published_posts_total, category.slug)
+
+    def test_randomized_operations_with_stale_category_saves(self):
+        """Post yaratish/nashr/ko'chirish/o'chirish va bulk update orasida eski Category saqlash"""
+        rnd = random.Random(19)
+        categories = [Category.objects.create(name=f'Counter {number}') for number in range(3)]
+        stale = [Category.objects.get(pk=category.pk) for category in categories]
+        choices = categories + [None]
+        for _ in range(150):
+            action = rnd.random()
+            posts = list(Post.objects.values_list('pk', flat=True))
+            if action < 0.3 or not posts:
+                Post.objects.create(
+                    title='Counter post', content='x', author=self.author, category=rnd.choice(choices),
+                    status=rnd.choice(('draft', 'published')),
+                )
+            elif action < 0.5:
+                post = Post.objects.get(pk=rnd.choice(posts))
+                post.status = rnd.choice(('draft', 'published'))
+                post.category = rnd.choice(choices)
+                post.save()
+            elif action < 0.6:
+                Post.objects.get(pk=rnd.choice(posts)).delete()
+            elif action < 0.7:
+                Post.objects.filter(pk__in=rnd.sample(posts, min(3, len(posts)))).update(
+                    status=rnd.choice(('draft', 'published')),
+                )
+            elif action < 0.75:
+                Post.objects.bulk_create(
+                    Post(title='Bulk post', slug=f'bulk-{rnd.random()}', content='x', author=self.author,
+                         category=rnd.choice(choices), status='published')
+                    for _ in range(2)
+                )
+            else:
+                category = rnd.choice(stale)
+                category.description = f'Edited {rnd.random()}'
+                category.save()
+        self.assertCountersConsistent()
+
+
+class PostCommentCountersTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('counters@example.com', 'counters', 'pass12345')
+
+    def assertCountersConsistent(self):
+        for post in Post.objects.with_approved_comments():
+            self.assertEqual(post.approved_comments_count, post.approved_comments_total, post.slug)
+            self.assertEqual(post.last_comment_at, post.last_comment_total, post.slug)
+
+    def test_randomized_operations_with_stale_post_saves(self):
+        """Comment qo'shish/o'chirish/tasdiqlash orasida eski Post instance'larini saqlash hisoblagichni buzmasin"""
+        rnd = random.Random(20)
+        posts = [
+            Post.objects.create(title=f'Counter {number}', content='x', author=self.author, status='published')
+            for number in range(4)
+        ]
+        stale = [Post.objects.get(pk=post.pk) for post in posts]  # hech qachon yangilanmaydi
+        for _ in range(150):
+            action = rnd.random()
+            comments = list(Comment.objects.values_list('pk', flat=True))
+            if action < 0.4 or not comments:
+                Comment.objects.create(
+                    post=rnd.choice(posts), author=self.author, content='comment', is_approved=rnd.random() < 0.8,
+                )
+            elif action < 0.55:
+                comment = Comment.objects.get(pk=rnd.choice(comments))
+                comment.is_approved = not comment.is_approved
+                comment.save()
+            elif action < 0.7:
+                Comment.objects.get(pk=rnd.choice(comments)).delete()
+            elif action < 0.8:
+                Comment.objects.filter(pk__in=rnd.sample(comments, min(3, len(comments)))).update(is_approved=True)
+            else:
+                post = rnd.choice(stale)
+                post.title = f'Edited {rnd.random()}'
+                post.save()
+        self.assertCountersConsistent()
+
+
+# ============================================
+# KO'RISHLAR HISOBLAGICHI
+# ============================================
+class ViewCounterConcurrencyTest(TransactionTestCase):
+    """
+    SQLite Django bazasida flush va save() parallel yozuvlari transaction_mode IMMEDIATE
+    va timeout bilan ishlaydi (aks holda "database is locked") - settings.py'dagi SQLite DATABASES
+    """
+
+    def test_concurrent_views_are_not_lost(self):
+        """
+        50 thread ko'radi va flush qiladi, shu vaqtning o'zida 10 thread eski Post instance'larini
+        saqlaydi (bitta Barrier'dan birga boshlanadi) - save() flush qilingan sonni qaytarib yozmasin
+        """
+        close_view_counter()
+        author = User.objects.create_user('views@example.com', 'views', 'pass12345')
+        post = Post.objects.create(title='Views', content='x', author=author, status='published')
+        counter = ViewCounter(LocalMemoryStore(), flush_interval=0)  # har ko'rishda flush
+        viewers_count, views_per_thread = 50, 20
+        savers_count, saves_per_thread = 10, 10
+        stale = [Post.objects.get(pk=post.pk) for _ in range(savers_count)]  # views_count = 0
+        start = threading.Barrier(viewers_count + savers_count)
+        errors = []
+
+        def run(work):
+            try:
+                start.wait()
+                work()
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connections.close_all()
+
+        def view():
+            for _ in range(views_per_thread):
+                counter.record(post.pk)
+
+        def save(instance):
+            for number in range(saves_per_thread):
+                instance.title = f'Edited {number}'
+                instance.save()
+
+        threads = [threading.Thread(target=run, args=(view,)) for _ in range(viewers_count)]
+        threads += [threading.Thread(target=run, args=(lambda instance=instance: save(instance),)) for instance in stale]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        counter.flush()
+        self.assertEqual(errors, [])
+        post.refresh_from_db()
+        self.assertTrue(post.title.startswith('Edited'))
+        self.assertEqual(post.views_count, viewers_count * views_per_thread)
+
+    def test_sqlite_store_shared_by_workers(self):
+        """
+        4 "worker" (har biri o'z SQLiteStore ulanishlari va jarayon buferi bilan) bitta faylga
+        parallel push/flush qiladi, flush_view_counts o'rnidagi beshinchi counter ham flush qiladi
+        """
+        close_view_counter()
+        author = User.objects.create_user('shared@example.com', 'shared', 'pass12345')
+        posts = [
+            Post.objects.create(title=f'Shared {number}', content='x', author=author, status='published')
+            for number in range(3)
+        ]
+        workers_count, threads_per_worker, views_per_thread = 4, 5, 40
+        errors = []
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = f'{directory}/views.sqlite3'
+            workers = [ViewCounter(SQLiteStore(path), flush_interval=3600) for _ in range(workers_count)]
+            command = ViewCounter(SQLiteStore(path), flush_interval=3600)
+            start = threading.Barrier(workers_count * threads_per_worker + 1)
+
+            def view(worker):
+                try:
+                    start.wait()
+                    for number in range(views_per_thread):
+                        worker.record(posts[number % len(posts)].pk)
+                        if number % 10 == 9:
+                            worker.flush()
+                except Exception as error:
+                    errors.append(error)
+                finally:
+                    connections.close_all()
+
+            def flush_command():
+                try:
+                    start.wait()
+                    for _ in range(20):
+                        command.flush()
+                except Exception as error:
+                    errors.append(error)
+                finally:
+                    connections.close_all()
+
+            threads = [
+                threading.Thread(target=view, args=(worker,))
+                for worker in workers for _ in range(threads_per_worker)
+            ]
+            threads.append(threading.Thread(target=flush_command))
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            for worker in workers:
+                worker.flush()
+            self.assertEqual(command.store.drain(), {})
+
+        self.assertEqual(errors, [])
+        total = workers_count * threads_per_worker * views_per_thread
+        views = Post.objects.filter(pk__in=[post.pk for post in posts]).values_list('views_count', flat=True)
+        self.assertEqual(sum(views), total)
+        self.assertEqual(sorted(views), sorted(
+            len(range(index, views_per_thread, len(posts))) * workers_count * threads_per_worker
+            for index in range(len(posts))
+        ))
+
+
+class FlushViewCountsTest(TestCase):
+    def test_command_flushes_views_buffered_by_another_counter(self):
+        """Worker'ning ViewCounter'i va buyruq (yangi jarayon) bitta SQLiteStore faylini ko'radi"""
+        author = User.objects.create_user('flush@example.com', 'flush', 'pass12345')
+        post = Post.objects.create(title='Flush', content='x', author=author, status='published')
+        with tempfile.TemporaryDirectory() as directory:
+            options = {'path': f'{directory}/views.sqlite3'}
+            worker = ViewCounter(SQLiteStore(**options), flush_interval=3600)
+            for _ in range(3):
+                worker.store.incr(post.pk)
+            with override_settings(VIEW_COUNTER={'STORE_OPTIONS': options, 'FLUSH_INTERVAL': 3600}):
+                out = StringIO()
+                call_command('flush_view_counts', stdout=out)
+        self.assertIn('1 ta post', out.getvalue())
+        post.refresh_from_db()
+        self.assertEqual(post.views_count, 3)
+
+    @override_settings(VIEW_COUNTER={'STORE': 'blog.view_counter.LocalMemoryStore'})
+    def test_command_refuses_process_local_store(self):
+        with self.assertRaises(CommandError):
+            call_command('flush_view_counts')
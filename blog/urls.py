@@ -1,23 +1,36 @@
+from django.conf import settings
 from django.urls import path
 from .views import *
+from .async_views import AsyncListView, AsyncPostDetailView
+
+
+def read_view(view_class, async_class):
+    """ASYNC_READ_VIEWS=True (ASGI deploy) bo'lsa ommaviy o'qish endpointining async varianti"""
+    if getattr(settings, 'ASYNC_READ_VIEWS', False):
+        return async_class.as_view(view_class)
+    return view_class.as_view()
 
 
 urlpatterns = [
  #categories
-    path('categories/', CategoryListView.as_view(), name='category-list'),
+    path('categories/', read_view(CategoryListView, AsyncListView), name='category-list'),
     path('categories/<int:pk>/', CategoryDetailView.as_view(), name='category-detail'),
 
     #posts
-    path('posts/', PostListView.as_view(), name='post-list'),
+    path('posts/', read_view(PostListView, AsyncListView), name='post-list'),
     path('posts/my/', MyPostsView.as_view(), name='my-posts'),
     path('posts/create/', PostCreateView.as_view(), name='post-create'),
-    path('posts/<int:pk>/', PostDetailView.as_view(), name='post-detail'),
-    path('posts/<int:pk>/update/', PostUpdateView.as_view(), name='post-update'),
-    path('posts/<int:pk>/delete/', PostDeleteView.as_view(), name='post-delete'),
+    path('posts/export/', PostExportView.as_view(), name='post-export'),
+    path('posts/bulk/', PostBulkCreateView.as_view(), name='post-bulk-create'),
+    path('posts/<slug:slug>/', read_view(PostDetailView, AsyncPostDetailView), name='post-detail'),
+    path('posts/<slug:slug>/update/', PostUpdateView.as_view(), name='post-update'),
+    path('posts/<slug:slug>/delete/', PostDeleteView.as_view(), name='post-delete'),
 
     #comments
-    path('comments/', CommentListView.as_view(), name='comment-list'),
+    path('comments/', read_view(CommentListView, AsyncListView), name='comment-list'),
     path('comments/create/', CommentCreateView.as_view(), name='comment-create'),
+    path('comments/export/', CommentExportView.as_view(), name='comment-export'),
+    path('comments/bulk/', CommentBulkCreateView.as_view(), name='comment-bulk-create'),
     path('comments/<int:pk>/update/', CommentUpdateView.as_view(), name='comment-update'),
     path('comments/<int:pk>/delete/', CommentDeleteView.as_view(), name='comment-delete'),
 ]
\ No newline at end of file
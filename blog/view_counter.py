@@ -0,0 +1,271 @@
+import atexit
+import logging
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import DatabaseError, connections, transaction
+from django.db.models import F
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    # Serverdagi barcha workerlar (va flush_view_counts) uchun umumiy bufer
+    'STORE': 'blog.view_counter.SQLiteStore',
+    'STORE_OPTIONS': {},
+    'FLUSH_INTERVAL': 10,  # sekund; 0 - har bir ko'rishda darhol yozish
+}
+
+
+# ============================================
+# STORES (ko'rishlarni vaqtincha saqlash joyi)
+# ============================================
+class BaseStore:
+    """
+    Ko'rishlar buferi interfeysi.
+    incr() - post uchun +n, drain() - yig'ilganlarni olib, buferni tozalash
+    shared - bufer boshqa jarayonlardan ham ko'rinadi (flush_view_counts uchun)
+    """
+    shared = True
+
+    def incr(self, post_id, amount=1):
+        raise NotImplementedError
+
+    def drain(self):
+        raise NotImplementedError
+
+    def merge(self, counts):
+        """Flush muvaffaqiyatsiz bo'lsa, sonlarni buferga qaytarish"""
+        for post_id, amount in counts.items():
+            self.incr(post_id, amount)
+
+
+class LocalMemoryStore(BaseStore):
+    """
+    Jarayon (worker) xotirasidagi bufer.
+    Boshqa jarayondan ko'rinmaydi: flush_view_counts bilan ishlamaydi (bitta jarayonli dev/test uchun).
+    """
+    shared = False
+
+    def __init__(self):
+        self._counts = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def incr(self, post_id, amount=1):
+        with self._lock:
+            self._counts[post_id] += amount
+
+    def drain(self):
+        with self._lock:
+            counts, self._counts = self._counts, defaultdict(int)
+        return dict(counts)
+
+
+class SQLiteStore(BaseStore):
+    """
+    Bitta serverdagi barcha workerlar uchun umumiy bufer (lokal sqlite fayl).
+    flush_view_counts buyrug'i boshqa jarayondan ham flush qila oladi.
+    path berilmasa - BASE_DIR/var/view_counts.sqlite3 (.gitignore'da)
+    """
+
+    def __init__(self, path=None):
+        path = Path(path or Path(settings.BASE_DIR) / 'var' / 'view_counts.sqlite3')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = str(path)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS view_counts '
+                '(post_id INTEGER PRIMARY KEY, amount INTEGER NOT NULL)'
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            # WAL'da NORMAL - commit'da fsync yo'q (faqat checkpoint'da); elektr uzilsa
+            # oxirgi ko'rishlar yo'qolishi mumkin, fayl buzilmaydi
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    upsert = (
+        'INSERT INTO view_counts (post_id, amount) VALUES (?, ?) '
+        'ON CONFLICT(post_id) DO UPDATE SET amount = amount + excluded.amount'
+    )
+
+    def incr(self, post_id, amount=1):
+        self._connect().execute(self.upsert, (post_id, amount))
+
+    def merge(self, counts):
+        """Bir nechta postni bitta tranzaksiyada qo'shish (worker buferini push qilish)"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany(self.upsert, counts.items())
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def drain(self):
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = conn.execute('SELECT post_id, amount FROM view_counts').fetchall()
+            conn.execute('DELETE FROM view_counts')
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return dict(rows)
+
+
+# ============================================
+# VIEW COUNTER
+# ============================================
+class ViewCounter:
+    """
+    Ko'rishlarni buferda yig'ib, vaqti-vaqti bilan
+    UPDATE ... SET views_count = views_count + n ko'rinishida yozadi.
+    record() faqat jarayon xotirasiga yozadi (so'rovda disk/tarmoq yo'q);
+    umumiy store'ga (shared) flush paytida bitta tranzaksiyada push qilinadi.
+    """
+
+    def __init__(self, store, flush_interval):
+        self.store = store
+        self.local = LocalMemoryStore() if store.shared else store
+        self.flush_interval = flush_interval
+        self.last_flush = time.monotonic()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._stopped = threading.Event()
+        self._start_lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        config = dict(DEFAULTS, **getattr(settings, 'VIEW_COUNTER', {}))
+        store = import_string(config['STORE'])(**config['STORE_OPTIONS'])
+        return cls(store, config['FLUSH_INTERVAL'])
+
+    def record(self, post_id, amount=1):
+        """Bitta ko'rishni qayd qilish"""
+        self.local.incr(post_id, amount)
+        if not self.flush_interval:
+            self.flush()
+            return
+        self._ensure_started()
+
+    def flush(self):
+        """Buferdagi barcha ko'rishlarni bazaga yozadi, yozilgan postlar sonini qaytaradi"""
+        with self._flush_lock:
+            self.push()
+            counts = self.store.drain()
+            if not counts:
+                self.last_flush = time.monotonic()
+                return 0
+
+            # Bir xil n ga ega postlar bitta UPDATE bilan yangilanadi
+            by_amount = defaultdict(list)
+            for post_id, amount in counts.items():
+                by_amount[amount].append(post_id)
+
+            from .models import Post
+            try:
+                with transaction.atomic():
+                    for amount, post_ids in by_amount.items():
+                        Post.objects.filter(pk__in=post_ids).update(
+                            views_count=F('views_count') + amount
+                        )
+            except Exception:
+                self.store.merge(counts)
+                raise
+
+            self.last_flush = time.monotonic()
+            return len(counts)
+
+    def push(self):
+        """Jarayon buferini umumiy store'ga o'tkazish (flush_view_counts boshqa jarayondan ko'rishi uchun)"""
+        if self.local is self.store:
+            return
+        counts = self.local.drain()
+        if not counts:
+            return
+        try:
+            self.store.merge(counts)
+        except Exception:
+            self.local.merge(counts)
+            raise
+
+    def stop(self):
+        """
+        Fon oqimini to'xtatib, oxirgi marta flush qilish (worker yopilganda).
+        Baza allaqachon yo'q bo'lsa (masalan, test bazasi o'chirilgan) - xato chiqarmaydi,
+        sonlar buferga qaytariladi (SQLiteStore'da keyingi flush yozadi).
+        """
+        self._stopped.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        try:
+            self.flush()
+        except DatabaseError:
+            logger.exception("Ko'rishlar to'xtash paytida flush qilinmadi")
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='view-counter-flush', daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.stop)
+
+    def _run(self):
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                # Sonlar buferga qaytarilgan, keyingi urinishda yoziladi
+                logger.exception("Ko'rishlar flush qilinmadi, keyingi urinishda qayta yoziladi")
+            finally:
+                connections.close_all()
+
+
+_view_counter = None
+_view_counter_lock = threading.Lock()
+
+
+def get_view_counter():
+    """Jarayon uchun yagona ViewCounter"""
+    global _view_counter
+    if _view_counter is None:
+        with _view_counter_lock:
+            if _view_counter is None:
+                _view_counter = ViewCounter.from_settings()
+    return _view_counter
+
+
+def close_view_counter():
+    """Jarayon ViewCounter'ini to'xtatib, buferini yozadi; keyingi get_view_counter() yangisini yaratadi"""
+    global _view_counter
+    with _view_counter_lock:
+        counter, _view_counter = _view_counter, None
+    if counter is not None:
+        counter.stop()
+
+
+@receiver(setting_changed)
+def reset_view_counter(setting, **kwargs):
+    """Testlarda override_settings(VIEW_COUNTER=...) ishlashi uchun"""
+    if setting == 'VIEW_COUNTER':
+        close_view_counter()
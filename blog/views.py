@@ -1,15 +1,31 @@
 from rest_framework import generics, permissions, status, filters
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
 from unicodedata import category
 
+from core.uploads import StreamingUploadMixin
+
 from .models import *
 from .serializers import *
+from .bulk import BulkCreateMixin
+from .cache import CachedResponseMixin
+from .conditional import ConditionalGetMixin, make_validators
+from .export import NDJSONExportMixin
+from .fastpath import FastPathListMixin
+from .pagination import KeysetPagination
+from .renderers import FastJSONRenderer
+from .routers import ReplicaReadMixin
+from .search import PostSearchFilter
+from .slugs import allocate_slugs
+from .sparse import SparseQuerysetMixin
+from .view_counter import get_view_counter
 
 
 # category view
-class CategoryListView(generics.ListCreateAPIView):
+class CategoryListView(CachedResponseMixin, ReplicaReadMixin, FastPathListMixin, ConditionalGetMixin,
+                       SparseQuerysetMixin, generics.ListCreateAPIView):
     """
     GET /api/categories/ - Barcha kategoriyalar
     POST /api/categories/ - Yangi kategoriya yaratish (faqat admin)
@@ -18,9 +34,16 @@ class CategoryListView(generics.ListCreateAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = (permissions.IsAuthenticatedOrReadOnly,)
+    query_budget = {'GET': 3, 'POST': 6}  # blog.query_budget - SQL so'rovlar soni chegarasi
+    renderer_classes = (FastJSONRenderer, BrowsableAPIRenderer)
+    cache_namespaces = ('categories',)
+    validator_field = 'created_at'  # Category'da updated_at yo'q
+
+    def annotate_queryset(self, queryset):
+        return self.sparse_queryset(queryset)
 
 
-class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CategoryDetailView(CachedResponseMixin, generics.RetrieveUpdateDestroyAPIView):
     """
         GET /api/categories/<id>/ - Kategoriya detali
         PUT/PATCH /api/categories/<id>/ - Kategoriyani yangilash (admin)
@@ -29,20 +52,29 @@ class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = (permissions.IsAuthenticatedOrReadOnly,)
+    query_budget = {'GET': 2, 'PUT': 3, 'PATCH': 3, 'DELETE': 4}
+    cache_namespaces = ('categories',)
 
 
 # post veiw
-class PostListView(generics.ListAPIView):
+class PostListView(CachedResponseMixin, ReplicaReadMixin, FastPathListMixin, ConditionalGetMixin,
+                   SparseQuerysetMixin, generics.ListAPIView):
     """
         GET /api/posts/ - Barcha postlar (faqat published)
-        Search: ?search=django
+        Search: ?search=django (full-text, relevance bo'yicha tartiblanadi)
         Filter: ?category=1&author=2
+        Pagination: ?cursor=<token>&page_size=20 yoki ?page=2
+        Fields: ?fields=id,title,slug,author.username
         """
     serializer_class = PostListSerializer
     permission_classes = [permissions.AllowAny]
-    filter_backends = (filters.SearchFilter, filters.OrderingFilter)
-    search_fields = ('title', 'content', 'author__username')
-    ordering_fields = ('-created_at', 'views_count')
+    query_budget = 4  # sahifa hajmidan qat'i nazar
+    renderer_classes = (FastJSONRenderer, BrowsableAPIRenderer)
+    pagination_class = KeysetPagination
+    cache_namespaces = ('posts', 'categories', 'comments')
+    validator_counters = ('views_count',)  # ViewCounter flush'i updated_at'ni o'zgartirmaydi
+    filter_backends = (PostSearchFilter, filters.OrderingFilter)
+    ordering_fields = ('-created_at', 'views_count', 'last_activity_at')
 
     def get_queryset(self):
         """
@@ -62,37 +94,113 @@ class PostListView(generics.ListAPIView):
 
         return queryset
 
-class PostDetailView(APIView):
+    def annotate_queryset(self, queryset):
+        return self.sparse_queryset(queryset)
+
+class PostDetailView(CachedResponseMixin, ReplicaReadMixin, ConditionalGetMixin, APIView):
     """
         GET /api/posts/<slug>/ - Post detali
         """
     permission_classes = [permissions.AllowAny]
+    query_budget = 4
+    cache_namespaces = ('posts', 'categories', 'comments')
+    serializer_class = PostDetailSerializer
+
+    def get_queryset(self):
+        return (
+            Post.objects.filter(status='published')
+            .select_related('author', 'category')
+            .with_comments_updated()
+        )
 
     def get(self, request, slug):
-        post = get_object_or_404(Post, slug=slug, status='published')
+        post = get_object_or_404(self.get_queryset(), slug=slug)
+        self.record_view(post)
 
-        #korishlar sonini hisoblash
-        post.views += 1
-        post.save(update_fields=['views'])
-        serializer = PostDetailSerializer(post)
+        # Post va oxirgi comment o'zgarmagan bo'lsa - 304, serializatsiyasiz
+        not_modified = self.not_modified(request, self.post_validators(post))
+        if not_modified is not None:
+            return not_modified
+
+        serializer = self.serializer_class(post, context={'request': request})
         return Response(serializer.data)
 
+    def record_view(self, post):
+        #korishlar sonini hisoblash (buferga yoziladi, keyin F() bilan flush qilinadi)
+        get_view_counter().record(post.pk)
+        post.views_count += 1
+        self.response_cache_meta['post_id'] = post.pk
+
+    def post_validators(self, post, versions=None):
+        """versions - kesh namespace versiyalari (async view o'zi o'qib beradi)"""
+        if versions is None:
+            versions = self.namespace_versions()
+        last_modified = max(filter(None, [post.updated_at, post.comments_updated_at]))
+        # views_count - bazadagi qiymat (+1 shu ko'rish): flush'dan keyin ETag o'zgaradi
+        return make_validators(
+            post.pk, post.updated_at, post.comments_updated_at, post.approved_comments_count,
+            post.views_count, *versions, last_modified=last_modified,
+        )
+
+    def response_cache_hit(self, request, meta, *args, **kwargs):
+        """Keshdan berilgan javob ham ko'rish hisoblanadi"""
+        get_view_counter().record(meta['post_id'])
+
+
+class PostExportView(NDJSONExportMixin, APIView):
+    """
+        GET /api/posts/export/ - Barcha published postlar, NDJSON oqimi
+        Inkremental: ?updated_since=2024-05-01T00:00:00Z
+        """
+    permission_classes = [permissions.IsAuthenticated]
+    query_budget = None  # stream: so'rovlar soni chunk'lar soniga bog'liq
+    export_serializer_class = PostDetailSerializer
+    export_fields = ('id,title,slug,author.id,author.username,category.id,category.name,'
+                     'category.slug,content,excerpt,image,status,views_count,'
+                     'created_at,updated_at,published_at')
 
-class PostCreateView(generics.CreateAPIView):
+    def get_export_queryset(self):
+        return Post.objects.filter(status='published')
+
+
+class PostCreateView(StreamingUploadMixin, generics.CreateAPIView):
     """
     POST /api/posts/create/ - Yangi post yaratish (login kerak)
     """
     serializer_class = PostCreateUpdateSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 8
 
     def perform_create(self, serializer):
         """Author'ni avtomatik qo'shish"""
         serializer.save(author=self.request.user)
 
 
-class PostUpdateView(generics.UpdateAPIView):
+class PostBulkCreateView(BulkCreateMixin, generics.CreateAPIView):
+    """
+    POST /api/posts/bulk/ - Ko'p postni bitta so'rovda import qilish (login kerak)
+    Body: [{"title": "...", "content": "...", "status": "published"}, ...]
+    """
+    serializer_class = PostCreateUpdateSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    query_budget = 7  # postlar sonidan qat'i nazar
+
+    def build_instances(self, validated):
+        """Author va butun batch uchun unique slug'lar (bitta SELECT)"""
+        slugs = allocate_slugs(Post, [data['title'] for data in validated])
+        return [
+            Post(author=self.request.user, slug=slug, **data)
+            for slug, data in zip(slugs, validated)
+        ]
+
+    def created_item(self, instance):
+        return {'id': instance.pk, 'slug': instance.slug}
+
+
+class PostUpdateView(StreamingUploadMixin, generics.UpdateAPIView):
     serializer_class = PostCreateUpdateSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 6
     lookup_field = 'slug'
 
     def get_queryset(self):
@@ -105,6 +213,7 @@ class PostUpdateView(generics.UpdateAPIView):
 
 class PostDeleteView(generics.DestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 10  # CASCADE commentlar 100 talik DELETE batch'lari bilan o'chadi
     lookup_field = 'slug'
 
     def get_queryset(self):
@@ -115,29 +224,44 @@ class PostDeleteView(generics.DestroyAPIView):
         return Post.objects.filter(author=self.request.user)
 
 
-class MyPostsView(generics.ListAPIView):
+class MyPostsView(ReplicaReadMixin, FastPathListMixin, ConditionalGetMixin, SparseQuerysetMixin,
+                  generics.ListAPIView):
     serializer_class = PostListSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 4
+    renderer_classes = (FastJSONRenderer, BrowsableAPIRenderer)
+    pagination_class = KeysetPagination
+    cache_namespaces = ('posts', 'categories', 'comments')
+    validator_counters = ('views_count',)
+    db_routing = 'primary'  # O'z postlari - yozgandan keyin darhol ko'rinishi kerak
 
     def get_queryset(self):
         # Swagger uchun
         if getattr(self, 'swagger_fake_view', False):
             return Post.objects.none()
-        return Post.objects.filter(author=self.request.user).select_related('category')
+        return Post.objects.filter(author=self.request.user).select_related('author', 'category')
+
+    def annotate_queryset(self, queryset):
+        return self.sparse_queryset(queryset)
 
 # ============================================
 # COMMENT VIEWS
 # ============================================
-class CommentListView(generics.ListAPIView):
+class CommentListView(CachedResponseMixin, ReplicaReadMixin, FastPathListMixin, ConditionalGetMixin,
+                      SparseQuerysetMixin, generics.ListAPIView):
     """
     GET /api/comments/ - Barcha kommentariyalar
     GET /api/comments/?post=1 - Bitta post commentlari
     """
     serializer_class = CommentSerializer
     permission_classes = [permissions.AllowAny]
+    query_budget = 4
+    renderer_classes = (FastJSONRenderer, BrowsableAPIRenderer)
+    pagination_class = KeysetPagination
+    cache_namespaces = ('comments',)
 
     def get_queryset(self):
-        queryset = Comment.objects.filter(is_approved=True).select_related('author', 'post')
+        queryset = Comment.objects.filter(is_approved=True).select_related('author')
 
         # Post bo'yicha filter
         post_id = self.request.query_params.get('post', None)
@@ -146,6 +270,26 @@ class CommentListView(generics.ListAPIView):
 
         return queryset
 
+    def annotate_queryset(self, queryset):
+        if self.wants_field('replies_count'):
+            queryset = queryset.with_counts()
+        return self.sparse_queryset(queryset)
+
+
+class CommentExportView(NDJSONExportMixin, APIView):
+    """
+    GET /api/comments/export/ - Barcha tasdiqlangan commentlar, NDJSON oqimi
+    Inkremental: ?updated_since=2024-05-01
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    query_budget = None  # stream: so'rovlar soni chunk'lar soniga bog'liq
+    export_serializer_class = CommentSerializer
+    export_fields = ('id,post,author.id,author.username,content,parent,is_approved,'
+                     'created_at,updated_at')
+
+    def get_export_queryset(self):
+        return Comment.objects.filter(is_approved=True)
+
 
 class CommentCreateView(generics.CreateAPIView):
     """
@@ -154,15 +298,30 @@ class CommentCreateView(generics.CreateAPIView):
     """
     serializer_class = CommentCreateSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 6
 
     def perform_create(self, serializer):
         """Author'ni avtomatik qo'shish"""
         serializer.save(author=self.request.user)
 
 
+class CommentBulkCreateView(BulkCreateMixin, generics.CreateAPIView):
+    """
+    POST /api/comments/bulk/ - Ko'p commentni bitta so'rovda import qilish (login kerak)
+    Body: [{"post": 1, "content": "Zo'r post!", "parent": null}, ...]
+    """
+    serializer_class = CommentCreateSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    query_budget = 8  # commentlar sonidan qat'i nazar
+
+    def build_instances(self, validated):
+        return [Comment(author=self.request.user, **data) for data in validated]
+
+
 class CommentUpdateView(generics.UpdateAPIView):
     serializer_class = CommentCreateSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 6
 
     def get_queryset(self):
         """Faqat o'z commentlarini tahrirlash"""
@@ -174,6 +333,7 @@ class CommentUpdateView(generics.UpdateAPIView):
 
 class CommentDeleteView(generics.DestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 10  # javoblar (CASCADE) 100 talik DELETE batch'lari bilan o'chadi
 
     def get_queryset(self):
         """Faqat o'z commentlarini o'chirish"""
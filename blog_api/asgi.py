@@ -5,6 +5,15 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
+
+Tavsiya etilgan sozlama (uvicorn / gunicorn -k uvicorn.workers.UvicornWorker):
+
+    DB_POOL=1 DB_POOL_MAX_SIZE=10  # psycopg3 pool, CONN_MAX_AGE=0
+    ASYNC_READ_VIEWS=1             # ommaviy GET endpointlar async (blog.async_views)
+
+ASGI'da doimiy ulanishlar (CONN_MAX_AGE > 0) ishonchli emas: sync kod
+thread'lar orasida yuradi va ulanishlar so'rov oxirida yopilmay qolishi mumkin.
+Shuning uchun bu yerda pool (yoki PgBouncer + DB_PGBOUNCER=1) ishlatiladi.
 """
 
 import os
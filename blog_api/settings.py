@@ -45,11 +45,13 @@ INSTALLED_APPS = [
     'corsheaders',
     'drf_yasg',
 #     apps
+    'core',  # umumiy rasm pipeline'i va yuklash (accounts va blog ishlatadi)
     'accounts',
     'blog',
 ]
 
 MIDDLEWARE = [
+    'blog.instrumentation.PerformanceMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -59,10 +61,11 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'blog.routers.ReplicaRoutingMiddleware',
 ]
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',  # ✅ TO'G'RI
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
@@ -74,8 +77,55 @@ CORS_ORIGIN_ALLOW_ALL = True
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
+    # refresh'da user bazadan qayta o'qiladi (eskirgan is_staff/is_superuser claim'lari qolmaydi)
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.tokens.ClaimsTokenRefreshSerializer',
 }
 
+# JWT user'ni aniqlash (accounts.authentication.CachedJWTAuthentication)
+# MODE: 'strict' (har so'rovda DB), 'cache' (TIMEOUT sekund kesh), 'claims' (token ichidan)
+JWT_USER_CACHE = {
+    'MODE': os.environ.get('JWT_USER_CACHE_MODE', 'cache'),
+    'TIMEOUT': 60,
+    'ALIAS': 'default',
+}
+
+# Ko'rishlar hisoblagichi (blog.view_counter)
+# STORE: blog.view_counter.SQLiteStore - serverdagi barcha workerlar uchun umumiy bufer
+# (flush_view_counts boshqa jarayondan ham yozadi) yoki blog.view_counter.LocalMemoryStore (faqat bitta jarayon).
+# Worker ko'rishlarni o'z xotirasida sanaydi va har FLUSH_INTERVAL'da store'ga push qiladi.
+VIEW_COUNTER = {
+    'STORE': 'blog.view_counter.SQLiteStore',
+    'STORE_OPTIONS': {'path': os.environ.get('VIEW_COUNTER_PATH') or BASE_DIR / 'var' / 'view_counts.sqlite3'},
+    'FLUSH_INTERVAL': int(os.environ.get('VIEW_COUNTER_FLUSH_INTERVAL', 10)),
+}
+
+# Rasm pipeline'i (core.images): Post.image va Profile.avatar uchun WebP variantlar
+# (srcset), EXIF tozalash va piksel cheklovi. Job'lar request oqimidan tashqarida:
+# BACKEND - core.images.ThreadPoolBackend (jarayon ichida) yoki core.images.ImmediateBackend
+IMAGE_PIPELINE = {
+    'BACKEND': 'core.images.ThreadPoolBackend',
+    'WORKERS': int(os.environ.get('IMAGE_PIPELINE_WORKERS', 2)),
+    'WIDTHS': (320, 640, 1280),
+    'MAX_PIXELS': 40_000_000,
+}
+
+# Rasm yuklash (core.uploads): post/profil view'larida fayl bo'laklab temp faylga yoziladi,
+# hajm limiti va format/o'lcham (header'dan) tekshiruvi fayl to'liq qabul qilinishidan oldin.
+UPLOADS = {
+    'MAX_FILE_SIZE': int(os.environ.get('UPLOAD_MAX_FILE_SIZE', 20 * 2**20)),
+    'MAX_REQUEST_SIZE': int(os.environ.get('UPLOAD_MAX_REQUEST_SIZE', 25 * 2**20)),
+}
+# Temp fayllar MEDIA_ROOT bilan bitta diskda bo'lsa storage'ga nusxalanmasdan ko'chiriladi
+FILE_UPLOAD_TEMP_DIR = os.environ.get('FILE_UPLOAD_TEMP_DIR')
+
+# Ro'yxat endpointlari uchun .values() + row mapper (blog.fastpath).
+# Standart o'chiq (oddiy DRF serializerlar): FAST_PATH_LISTS=1 bilan yoqiladi
+FAST_PATH_LISTS = os.environ.get('FAST_PATH_LISTS', '0') == '1'
+
+# Ommaviy o'qish endpointlari (post/category/comment ro'yxati, post detali) uchun
+# async view'lar (blog.async_views) - ASGI (uvicorn) deploy'da yoqiladi
+ASYNC_READ_VIEWS = os.environ.get('ASYNC_READ_VIEWS', '0') == '1'
+
 ROOT_URLCONF = 'blog_api.urls'
 
 TEMPLATES = [
@@ -99,10 +149,13 @@ WSGI_APPLICATION = 'blog_api.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# SQLite'da parallel yozuvlar (view counter flush'i, thread'li worker'lar) uchun IMMEDIATE
+# tranzaksiyalar va kutish vaqti kerak - aks holda "database is locked"
 # DATABASES = {
 #     'default': {
 #         'ENGINE': 'django.db.backends.sqlite3',
 #         'NAME': BASE_DIR / 'db.sqlite3',
+#         'OPTIONS': {'transaction_mode': 'IMMEDIATE', 'timeout': 20},
 #     }
 # }
 
@@ -117,6 +170,90 @@ DATABASES = {
     }
 }
 
+# Ulanishlarni qayta ishlatish (har so'rovda yangi ulanish + TLS qimmat).
+# DB_POOL=1 - psycopg3 connection pool (Django 5.1+, 'psycopg[pool]' kerak);
+#   pool bilan CONN_MAX_AGE 0 bo'lishi shart. ASGI uchun tavsiya etiladi.
+# DB_POOL=0 - doimiy ulanishlar: har worker thread'i bitta ulanishni
+#   DB_CONN_MAX_AGE sekund saqlaydi, CONN_HEALTH_CHECKS eskirganini tekshiradi.
+# Jami ulanishlar ~ gunicorn workers x (threads yoki DB_POOL_MAX_SIZE) <= max_connections.
+# Batafsil: blog_api/wsgi.py va blog_api/asgi.py
+if os.environ.get('DB_POOL', '0') == '1':
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+            'timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),  # bo'sh ulanish kutish, sekund
+        },
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', 60))
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# PgBouncer transaction pooling orqasida server-side cursor ishlamaydi (blog.export)
+DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = os.environ.get('DB_PGBOUNCER', '0') == '1'
+
+# Read replica'lar (blog.routers): DB_REPLICA_HOSTS=replica1.internal,replica2.internal
+# ReplicaReadMixin'li view'larning GET so'rovlari replica'dan o'qiydi, yozuvlar - primary.
+# Yozgan client/user STICKY_SECONDS davomida primary'dan o'qiydi (read-your-writes).
+READ_REPLICAS = {
+    'ALIASES': [],
+    'STICKY_SECONDS': int(os.environ.get('DB_REPLICA_STICKY_SECONDS', 5)),
+}
+for number, host in enumerate(filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(',')), 1):
+    alias = f'replica_{number}'
+    DATABASES[alias] = dict(DATABASES['default'], HOST=host.strip(), TEST={'MIRROR': 'default'})
+    READ_REPLICAS['ALIASES'].append(alias)
+
+DATABASE_ROUTERS = ['blog.routers.ReplicaRouter']
+
+
+
+# Cache
+# REDIS_URL berilsa Redis, aks holda jarayon ichidagi locmem
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Ommaviy GET javoblari keshi (blog.cache)
+RESPONSE_CACHE = {
+    'ALIAS': 'default',
+    'TIMEOUT': int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 300)),
+    # Namespace eskirgach (commit'dan keyin) shu javoblar oldindan qayta yig'iladi
+    'WARM': {'categories': ['/api/categories/']},
+}
+
+# So'rov o'lchovlari (blog.instrumentation): Server-Timing header, log va histogram'lar
+PERFORMANCE = {
+    'SAMPLE_RATE': float(os.environ.get('PERFORMANCE_SAMPLE_RATE', 1.0 if DEBUG else 0.1)),
+    'SERVER_TIMING': DEBUG or os.environ.get('PERFORMANCE_SERVER_TIMING', '0') == '1',
+    'SLOW_MS': int(os.environ.get('PERFORMANCE_SLOW_MS', 500)),
+    # View'lardagi query_budget: 'log' (WARNING + SQL fingerprint'lari) yoki 'raise'; CI: check_query_budgets
+    'QUERY_BUDGET': os.environ.get('PERFORMANCE_QUERY_BUDGET', 'log' if DEBUG else '') or None,
+}
+
+# /metrics (blog.metrics). gunicorn'da METRICS_MULTIPROC_DIR - worker'lar snapshot yozadigan papka
+# (deploy boshida tozalanadi); scrape qaysi worker'ga tushsa ham hammasi yig'iladi.
+# Production: METRICS_TOKEN (Prometheus bearer_token). Reverse proxy ortida METRICS_ALLOWED_IPS
+# ishlatilsa - proxy manzili METRICS_TRUSTED_PROXIES'da bo'lishi kerak, aks holda hamma 127.0.0.1 bo'lib ko'rinadi.
+METRICS = {
+    'MULTIPROCESS_DIR': os.environ.get('METRICS_MULTIPROC_DIR') or None,
+    'ALLOWED_IPS': tuple(filter(None, os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1' if DEBUG else '').split(','))),
+    'TRUSTED_PROXIES': tuple(filter(None, os.environ.get('METRICS_TRUSTED_PROXIES', '').split(','))),
+    'TOKEN': os.environ.get('METRICS_TOKEN') or None,
+}
 
 
 # Password validation
@@ -7,6 +7,8 @@ from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
+from blog.metrics import metrics_view
+
 schema_view = get_schema_view(
     openapi.Info(
         title="Blog API from Shukurjon",
@@ -31,6 +33,9 @@ urlpatterns = [
     # Swagger Documentation
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+
+    # Prometheus (ichki): blog.metrics
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 # Media files uchun (development)
@@ -5,6 +5,18 @@ It exposes the WSGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/wsgi/
+
+Tavsiya etilgan sozlama (gunicorn):
+
+    gunicorn blog_api.wsgi -w 4 --threads 4 --max-requests 10000
+
+    DB_POOL=0 DB_CONN_MAX_AGE=60  # har thread o'z ulanishini qayta ishlatadi
+    # ulanishlar: 4 worker x 4 thread = 16
+
+    yoki psycopg3 bilan:
+    DB_POOL=1 DB_POOL_MIN_SIZE=1 DB_POOL_MAX_SIZE=4  # max_size ~ --threads
+
+Tekshirish: python manage.py loadtest --url http://127.0.0.1:8000/api/categories/
 """
 
 import os
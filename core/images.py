@@ -0,0 +1,409 @@
+import io
+import logging
+import math
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.signals import setting_changed
+from django.db import close_old_connections, transaction
+from django.db.models.signals import post_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from PIL import Image, ImageOps
+from rest_framework import serializers
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULTS = {
+    'BACKEND': 'core.images.ThreadPoolBackend',
+    'WORKERS': 2,
+    'WIDTHS': (320, 640, 1280),  # srcset kengliklari (px)
+    'QUALITY': 80,  # WebP sifati
+    'MAX_PIXELS': 40_000_000,  # kenglik x balandlik; kattaroq rasm qabul qilinmaydi
+    'STRIP_ORIGINAL': True,  # EXIF (GPS, kamera) bo'lsa originalni ham metadata'siz qayta yozish
+}
+
+# Metadata'siz qayta yoziladigan original formatlar (animatsiyali GIF va h.k. - yo'q)
+STRIP_FORMATS = ('JPEG', 'PNG', 'WEBP')
+# EXIF orientation qiymatlari - rasm 90/270 gradusga buriladi (kenglik <-> balandlik)
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def get_config():
+    return dict(DEFAULTS, **getattr(settings, 'IMAGE_PIPELINE', {}))
+
+
+class ImagePipelineError(Exception):
+    """Rasmni qayta ishlab bo'lmaydi (buzilgan fayl yoki MAX_PIXELS dan katta)"""
+
+
+def validate_image_pixels(value):
+    """
+    Model validator: piksellar soni MAX_PIXELS dan oshmasin.
+    Faqat header o'qiladi - rasm xotiraga yuklanmaydi.
+    """
+    image_info = getattr(value, 'image_info', None)  # core.uploads header'dan o'qigan
+    if image_info is not None:
+        width, height = image_info[1:]
+    else:
+        file = getattr(value, 'file', value)
+        if file is None:
+            return
+        position = file.tell()
+        try:
+            with Image.open(file) as image:
+                width, height = image.size
+        except (OSError, Image.DecompressionBombError):
+            return  # Format tekshiruvi ImageField'ning o'zida
+        finally:
+            file.seek(position)
+
+    max_pixels = get_config()['MAX_PIXELS']
+    if width * height > max_pixels:
+        raise ValidationError(
+            f"Rasm juda katta: {width}x{height}, ko'pi bilan {max_pixels:,} piksel bo'lishi mumkin",
+            code='image_too_large',
+        )
+
+
+# ============================================
+# IMAGE PROCESSOR (Pillow)
+# ============================================
+class ProcessedImage:
+    """process() natijasi: variants - {kenglik: WebP bytes}, original - metadata'siz nusxa yoki None"""
+
+    def __init__(self, width, height, variants, original=None):
+        self.width = width
+        self.height = height
+        self.variants = variants
+        self.original = original
+
+
+class ImageProcessor:
+    """
+    Bitta rasm -> WIDTHS kengliklaridagi WebP variantlar.
+
+    - piksellar soni decode qilishdan oldin tekshiriladi (MAX_PIXELS)
+    - JPEG kerakli o'lchamga yaqin masshtabda decode qilinadi (draft), original o'qilmaydi
+    - EXIF orientation qo'llanadi, variantlarga metadata yozilmaydi
+    - har bir variant oldingi (kattaroq) variantdan kichraytiriladi
+    """
+
+    def __init__(self, widths, quality, max_pixels, strip_original=True):
+        self.widths = sorted(set(widths), reverse=True)
+        self.quality = quality
+        self.max_pixels = max_pixels
+        self.strip_original = strip_original
+
+    @classmethod
+    def from_settings(cls):
+        config = get_config()
+        return cls(config['WIDTHS'], config['QUALITY'], config['MAX_PIXELS'], config['STRIP_ORIGINAL'])
+
+    def process(self, file):
+        try:
+            with Image.open(file) as image:
+                width, height = image.size
+                if width * height > self.max_pixels:
+                    raise ImagePipelineError(f'{width}x{height} - MAX_PIXELS dan katta')
+                return self._process(image)
+        except (OSError, SyntaxError, Image.DecompressionBombError) as exc:
+            raise ImagePipelineError(str(exc)) from exc
+
+    def _process(self, image):
+        exif = image.getexif()
+        orientation = exif.get(0x0112, 1)
+        original = None
+        if self.strip_original and self._has_metadata(image, exif) and image.format in STRIP_FORMATS:
+            original = self._stripped(image, orientation)
+        else:
+            self._draft(image, orientation)
+
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            has_alpha = 'A' in image.mode or 'transparency' in image.info
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        width, height = image.size
+        targets = [target for target in self.widths if target < width] or [width]
+        variants = {}
+        current = image
+        for target in targets:
+            if target != current.width:
+                size = (target, max(1, round(height * target / width)))
+                current = current.resize(size, Image.LANCZOS, reducing_gap=3.0)
+            buffer = io.BytesIO()
+            current.save(buffer, 'WEBP', quality=self.quality, method=4)
+            variants[target] = buffer.getvalue()
+        return ProcessedImage(width, height, variants, original)
+
+    def _has_metadata(self, image, exif):
+        return bool(exif) or any(key in image.info for key in ('exif', 'xmp', 'XML:com.adobe.xmp'))
+
+    def _draft(self, image, orientation):
+        """JPEG'ni eng katta variantga yetarli 1/2, 1/4, 1/8 masshtabda decode qilish"""
+        if image.format != 'JPEG':
+            return
+        width, height = image.size
+        displayed_width = height if orientation in TRANSPOSED_ORIENTATIONS else width
+        ratio = min(1.0, self.widths[0] / displayed_width)
+        image.draft('RGB', (math.ceil(width * ratio), math.ceil(height * ratio)))
+
+    def _stripped(self, image, orientation):
+        """Originalning metadata'siz nusxasi (o'sha format, orientation qo'llangan)"""
+        image_format = image.format
+        options = {}
+        if image_format == 'JPEG' and orientation == 1 and image.mode in ('RGB', 'L'):
+            # Burilmagan JPEG - kvantlash jadvallari saqlanadi, sifat yo'qolmaydi
+            transposed = image
+            options = {'quality': 'keep'}
+        else:
+            transposed = ImageOps.exif_transpose(image)
+        if image_format == 'JPEG' and not options:
+            options = {'quality': 90}
+            if transposed.mode not in ('RGB', 'L'):
+                transposed = transposed.convert('RGB')
+        elif image_format == 'WEBP':
+            options = {'quality': 90}
+        buffer = io.BytesIO()
+        transposed.save(buffer, image_format, **options)
+        return buffer.getvalue()
+
+
+def variant_name(name, width):
+    """posts/rasm.jpg -> posts/variants/rasm-640w.webp"""
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(directory, 'variants', f'{stem}-{width}w.webp')
+
+
+def variant_files(variants):
+    return list((variants or {}).get('webp', {}).values())
+
+
+# ============================================
+# JOB (worker ichida bajariladi)
+# ============================================
+def process_image(model_label, pk, field_name, stale=()):
+    """
+    Obyekt rasmi uchun variantlarni yaratib, <field>_variants ga yozadi.
+    stale - eski rasm variantlari, o'chiriladi.
+    """
+    model = apps.get_model(model_label)
+    variants_field = f'{field_name}_variants'
+    storage = model._meta.get_field(field_name).storage
+    for name in stale:
+        storage.delete(name)
+
+    name = model._default_manager.filter(pk=pk).values_list(field_name, flat=True).first()
+    if not name:
+        return None
+
+    try:
+        with storage.open(name, 'rb') as file:
+            result = ImageProcessor.from_settings().process(file)
+    except ImagePipelineError as exc:
+        # source yoziladi - keyingi save() shu rasmni qayta navbatga qo'ymaydi
+        model._default_manager.filter(pk=pk, **{field_name: name}).update(
+            **{variants_field: {'source': name, 'error': str(exc)}}
+        )
+        return None
+
+    saved = []
+    source = name
+    if result.original is not None:
+        source = storage.save(name, ContentFile(result.original))
+        saved.append(source)
+    variants = {'source': source, 'width': result.width, 'height': result.height, 'webp': {}}
+    for width, content in result.variants.items():
+        variants['webp'][str(width)] = storage.save(variant_name(source, width), ContentFile(content))
+    saved.extend(variants['webp'].values())
+
+    values = {field_name: source, variants_field: variants}
+    if any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+        values['updated_at'] = timezone.now()
+    # Shu orada rasm almashtirilgan bo'lsa - natija kerak emas
+    updated = model._default_manager.filter(pk=pk, **{field_name: name}).update(**values)
+    if not updated:
+        for saved_name in saved:
+            storage.delete(saved_name)
+        return None
+
+    if source != name:
+        storage.delete(name)
+    # .update() post_save yubormaydi - javob keshlari (blog.signals) shu signal bilan eskiradi
+    variants_ready.send(sender=model, pk=pk, field_name=field_name, variants=variants)
+    return variants
+
+
+# ============================================
+# BACKENDS (job'lar qayerda bajariladi)
+# ============================================
+class ImmediateBackend:
+    """Job'ni shu oqimda bajaradi (management command, testlar)"""
+
+    def submit(self, func, *args):
+        func(*args)
+
+
+class ThreadPoolBackend:
+    """
+    Jarayon ichidagi worker pool - request oqimi kutmaydi.
+    Pillow resize/encode paytida GIL'ni qo'yib yuboradi, shuning uchun thread'lar yetarli.
+    Celery/RQ kabi navbat uchun BACKEND'ga submit(func, *args) li klass beriladi.
+
+    Navbat faqat xotirada: oddiy chiqishda (sys.exit, gunicorn graceful stop) Python pool
+    thread'larini kutadi va navbatdagi job'lar bajariladi; SIGKILL/timeout'da ular yo'qoladi.
+    Yopilgan backend'ga yuborilgan yoki shutdown(wait=False) bekor qilgan job'lar log'ga yoziladi.
+    Yo'qolgan job'lar variantsiz qoladi (_variants bo'sh yoki source eskirgan) -
+    `manage.py build_image_variants` ularni topib qayta yaratadi.
+    """
+
+    def __init__(self, workers=2):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='image-pipeline')
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+
+    def submit(self, func, *args):
+        try:
+            future = self._executor.submit(self._run, func, *args)
+        except RuntimeError:
+            # shutdown() dan keyin yoki interpreter yopilayotganda
+            logger.warning('Image pipeline job bajarilmaydi (backend yopilgan): %s%r', func.__name__, args)
+            return None
+        future.job = (func.__name__, args)
+        with self._pending_lock:
+            self._pending.add(future)
+        future.add_done_callback(self._discard)
+        return future
+
+    def _discard(self, future):
+        with self._pending_lock:
+            self._pending.discard(future)
+
+    def _run(self, func, *args):
+        close_old_connections()
+        try:
+            return func(*args)
+        except Exception:
+            logger.exception('Image pipeline job xatosi: %s%r', func.__name__, args)
+        finally:
+            close_old_connections()
+
+    def shutdown(self, wait=True):
+        """wait=False - navbatdagi (boshlanmagan) job'lar bekor qilinadi va log'ga yoziladi"""
+        with self._pending_lock:
+            pending = list(self._pending)
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        for future in pending:
+            if future.cancelled():
+                logger.warning('Image pipeline job bekor qilindi: %s%r', *future.job)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_image_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                config = get_config()
+                backend_class = import_string(config['BACKEND'])
+                if backend_class is ThreadPoolBackend:
+                    _backend = backend_class(config['WORKERS'])
+                else:
+                    _backend = backend_class()
+    return _backend
+
+
+@receiver(setting_changed)
+def reset_image_backend(setting, **kwargs):
+    global _backend
+    if setting == 'IMAGE_PIPELINE':
+        _backend = None
+
+
+# ============================================
+# SIGNAL (rasm o'zgarganda variantlarni navbatga qo'yish)
+# ============================================
+# {model label: rasm maydoni} - register() qilinganlar (build_image_variants uchun)
+registered_fields = {}
+
+# process_image() variantlarni yozgandan keyin: sender=model, pk, field_name, variants
+variants_ready = Signal()
+
+
+def schedule_variants(instance, field_name):
+    """Rasm variantlari eskirgan bo'lsa - tozalab, commit'dan keyin job yuborish"""
+    variants_field = f'{field_name}_variants'
+    name = getattr(instance, field_name).name or ''
+    variants = getattr(instance, variants_field) or {}
+    if variants.get('source', '') == name:
+        return
+
+    stale = variant_files(variants)
+    if variants:
+        # Eski srcset yangi rasm bilan chiqmasin
+        type(instance)._default_manager.filter(pk=instance.pk).update(**{variants_field: {}})
+        setattr(instance, variants_field, {})
+    if not name and not stale:
+        return
+
+    args = (instance._meta.label, instance.pk, field_name, stale)
+    transaction.on_commit(lambda: get_image_backend().submit(process_image, *args))
+
+
+def register(model, field_name):
+    """model.<field_name> (ImageField) uchun pipeline; modelda <field_name>_variants JSONField bo'lishi kerak"""
+
+    def handler(sender, instance, raw=False, **kwargs):
+        if not raw:
+            schedule_variants(instance, field_name)
+
+    post_save.connect(handler, sender=model, weak=False, dispatch_uid=f'image-variants-{model._meta.label}')
+    registered_fields[model._meta.label] = field_name
+
+
+# ============================================
+# SERIALIZER FIELD
+# ============================================
+class ImageVariantsField(serializers.Field):
+    """
+    <field>_variants JSON'idan srcset: {'320w': url, '640w': url, ...}.
+    Variantlar hali tayyor bo'lmasa (yoki rasm yo'q) - None.
+    """
+
+    def __init__(self, image_field, **kwargs):
+        self.image_field = image_field
+        kwargs.setdefault('source', f'{image_field}_variants')
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_storage(self):
+        model = self.parent.Meta.model
+        return model._meta.get_field(self.image_field).storage
+
+    def to_representation(self, value):
+        return self.build(value, self.get_storage(), self.context.get('request'))
+
+    @staticmethod
+    def build(value, storage, request=None):
+        webp = (value or {}).get('webp')
+        if not webp:
+            return None
+        srcset = {}
+        for width, name in sorted(webp.items(), key=lambda item: int(item[0])):
+            url = storage.url(name)
+            srcset[f'{width}w'] = request.build_absolute_uri(url) if request is not None else url
+        return srcset
+
@@ -0,0 +1,98 @@
+import io
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from PIL import Image, ImageDraw
+
+from core.images import ImagePipelineError, ImageProcessor
+
+
+class Command(BaseCommand):
+    """
+    Rasm pipeline'i (core.images) uchun o'lchov: bitta rasmga sarflangan vaqt
+    va ro'yxat kartasi originalning o'rniga variantni yuklaganda tejalgan baytlar.
+
+        python manage.py benchmark_images photo1.jpg photo2.png
+        python manage.py benchmark_images --synthetic 4000x3000 --repeat 5 --json
+
+    Fayl berilmasa sintetik (EXIF'li) JPEG ishlatiladi.
+    """
+    help = "Rasm variantlarini yaratish vaqti va tejalgan baytlarni o'lchaydi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*')
+        parser.add_argument('--synthetic', default='4000x3000', help='Fayl berilmasa: KENGLIKxBALANDLIK')
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--json', action='store_true', help='Natijani JSON ko\'rinishida chiqarish')
+
+    def handle(self, *args, **options):
+        processor = ImageProcessor.from_settings()
+        if options['paths']:
+            sources = []
+            for path in options['paths']:
+                with open(path, 'rb') as file:
+                    sources.append((path, file.read()))
+        else:
+            sources = [(f"synthetic-{options['synthetic']}.jpg", self.synthetic(options['synthetic']))]
+
+        results = [self.measure(processor, name, content, options['repeat']) for name, content in sources]
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for result in results:
+            self.stdout.write(
+                f"{result['name']}: {result['width']}x{result['height']}, "
+                f"{result['original_bytes'] / 1024:.0f} KB, "
+                f"median {result['median_ms']:.0f} ms (min {result['min_ms']:.0f} ms)"
+            )
+            for width, size in result['variant_bytes'].items():
+                saved = 100 - size * 100 / result['original_bytes']
+                self.stdout.write(f"  {width}w.webp: {size / 1024:.1f} KB (-{saved:.1f}%)")
+
+    def measure(self, processor, name, content, repeat):
+        timings = []
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            try:
+                result = processor.process(io.BytesIO(content))
+            except ImagePipelineError as exc:
+                raise CommandError(f'{name}: {exc}')
+            timings.append((time.perf_counter() - started) * 1000)
+
+        variant_bytes = {width: len(data) for width, data in sorted(result.variants.items())}
+        return {
+            'name': name,
+            'width': result.width,
+            'height': result.height,
+            'original_bytes': len(content),
+            'stripped_original_bytes': len(result.original) if result.original is not None else None,
+            'variant_bytes': variant_bytes,
+            'saved_bytes': {width: len(content) - size for width, size in variant_bytes.items()},
+            'median_ms': statistics.median(timings),
+            'min_ms': min(timings),
+        }
+
+    def synthetic(self, size):
+        """Fotoga o'xshash (gradient + shakllar), EXIF'li JPEG"""
+        try:
+            width, height = (int(part) for part in size.lower().split('x'))
+        except ValueError:
+            raise CommandError('--synthetic KENGLIKxBALANDLIK ko\'rinishida bo\'lishi kerak')
+
+        image = Image.linear_gradient('L').resize((width, height)).convert('RGB')
+        draw = ImageDraw.Draw(image)
+        step = max(1, min(width, height) // 12)
+        for index, x in enumerate(range(0, width, step)):
+            colour = (index * 37 % 256, index * 91 % 256, index * 53 % 256)
+            draw.ellipse((x, (index * step) % height, x + step * 2, (index * step) % height + step), fill=colour)
+        image = Image.blend(image, Image.effect_noise((width, height), 40).convert('RGB'), 0.3)
+
+        exif = Image.Exif()
+        exif[0x010F] = 'Benchmark Camera'  # Make
+        exif[0x0112] = 1  # Orientation
+        buffer = io.BytesIO()
+        image.save(buffer, 'JPEG', quality=92, exif=exif)
+        return buffer.getvalue()
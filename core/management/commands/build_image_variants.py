@@ -0,0 +1,30 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from core.images import process_image, registered_fields, variant_files
+
+
+class Command(BaseCommand):
+    """
+    Variantlari yo'q yoki eskirgan rasmlar uchun WebP variantlarni yaratish
+    (pipeline'dan oldin yuklangan rasmlar, bulk import, jarayon o'ldirilganda yo'qolgan job'lar).
+    Modellar core.images.register() bilan ulanganlar (Post.image, Profile.avatar)
+    python manage.py build_image_variants
+    """
+    help = "Post.image va Profile.avatar uchun yetishmayotgan WebP variantlarni yaratadi"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Hammasini qayta yaratish')
+
+    def handle(self, *args, **options):
+        for label, field_name in sorted(registered_fields.items()):
+            model = apps.get_model(label)
+            queryset = model._default_manager.exclude(**{field_name: ''}).exclude(**{field_name: None})
+            processed = 0
+            for pk, name, variants in queryset.values_list('pk', field_name, f'{field_name}_variants').iterator():
+                if not options['all'] and (variants or {}).get('source') == name:
+                    continue
+                stale = variant_files(variants)
+                if process_image(label, pk, field_name, stale) is not None:
+                    processed += 1
+            self.stdout.write(self.style.SUCCESS(f'{label}.{field_name}: {processed} ta rasm'))
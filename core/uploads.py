@@ -0,0 +1,166 @@
+import io
+
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers
+from PIL import Image
+from rest_framework import serializers
+
+from .images import get_config as get_image_config
+
+
+DEFAULTS = {
+    'MAX_FILE_SIZE': 20 * 2**20,  # bitta fayl, bayt
+    'MAX_REQUEST_SIZE': 25 * 2**20,  # butun multipart so'rov (Content-Length), bayt
+    'HEADER_BYTES': 256 * 2**10,  # format/o'lcham shu baytlar ichida aniqlanishi kerak (EXIF uchun zaxira)
+    'CHUNK_SIZE': 64 * 2**10,
+    'FORMATS': ('JPEG', 'PNG', 'WEBP', 'GIF'),
+}
+
+
+def get_config():
+    return dict(DEFAULTS, **getattr(settings, 'UPLOADS', {}))
+
+
+def upload_error(field_name, message, code='invalid'):
+    return serializers.ValidationError({field_name: [message]}, code=code)
+
+
+# ============================================
+# UPLOAD HANDLER
+# ============================================
+class StreamingImageUploadHandler(FileUploadHandler):
+    """
+    Multipart fayllarni CHUNK_SIZE bo'laklarda to'g'ridan-to'g'ri temp faylga yozadi
+    (xotirada to'planmaydi, FILE_UPLOAD_MAX_MEMORY_SIZE ga qaramaydi).
+
+    - Content-Length / fayl hajmi limitdan oshsa - o'qish darhol to'xtatiladi (400)
+    - image_fields dagi fayllar uchun birinchi baytlardan Image.open() (lazy - faqat header):
+      format va piksellar soni fayl to'liq qabul qilinishidan oldin tekshiriladi
+    - FileSystemStorage TemporaryUploadedFile'ni nusxalamasdan ko'chiradi (rename)
+    """
+
+    def __init__(self, request=None, image_fields=()):
+        super().__init__(request)
+        self.config = get_config()
+        self.chunk_size = self.config['CHUNK_SIZE']
+        self.image_fields = set(image_fields)
+        self.file = None
+        self.input_data = None
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # Limitdan katta so'rov o'qilmaydi ham - ulanish yopiladi (nginx 413 kabi)
+        if content_length > self.config['MAX_REQUEST_SIZE']:
+            raise serializers.ValidationError(
+                f"So'rov hajmi {self.config['MAX_REQUEST_SIZE'] // 2**20} MB dan oshmasligi kerak",
+                code='request_too_large',
+            )
+        self.input_data = input_data
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None,
+                 content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        if content_length is not None and content_length > self.config['MAX_FILE_SIZE']:
+            self.reject(self.too_large_message(), code='file_too_large')
+        self.file = TemporaryUploadedFile(file_name, content_type, 0, charset, content_type_extra)
+        self.header = bytearray() if field_name in self.image_fields else None
+        self.image_info = None
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.config['MAX_FILE_SIZE']:
+            self.reject(self.too_large_message(), code='file_too_large')
+        if self.header is not None and self.image_info is None:
+            self.header += raw_data
+            self.inspect_header(complete=False)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        if self.header is not None and self.image_info is None:
+            self.inspect_header(complete=True)
+        self.header = None
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.image_info = self.image_info
+        file, self.file = self.file, None
+        return file
+
+    def upload_interrupted(self):
+        if self.file is not None:
+            self.file.close()  # temp fayl o'chadi
+            self.file = None
+
+    def inspect_header(self, complete):
+        """Header yetarli bo'lsa image_info = (format, kenglik, balandlik)"""
+        try:
+            with Image.open(io.BytesIO(self.header)) as image:
+                image_format, (width, height) = image.format, image.size
+        except Image.DecompressionBombError:
+            self.reject("Rasm o'lchami juda katta", code='image_too_large')
+        except (OSError, SyntaxError, ValueError):
+            if complete or len(self.header) >= self.config['HEADER_BYTES']:
+                self.reject("Yuklangan fayl rasm emas yoki buzilgan", code='invalid_image')
+            return
+
+        if image_format not in self.config['FORMATS']:
+            self.reject(f"{image_format} formati qo'llab-quvvatlanmaydi", code='invalid_image')
+        max_pixels = get_image_config()['MAX_PIXELS']
+        if width * height > max_pixels:
+            self.reject(
+                f"Rasm juda katta: {width}x{height}, ko'pi bilan {max_pixels:,} piksel bo'lishi mumkin",
+                code='image_too_large',
+            )
+        self.image_info = (image_format, width, height)
+
+    def too_large_message(self):
+        return f"Fayl hajmi {self.config['MAX_FILE_SIZE'] // 2**20} MB dan oshmasligi kerak"
+
+    def reject(self, message, code):
+        """
+        Temp faylni o'chirib, qolgan tanani saqlamasdan o'qib tashlash (MAX_REQUEST_SIZE bilan
+        cheklangan) - aks holda client 400 javobni o'qiy olmay broken pipe oladi.
+        """
+        self.upload_interrupted()
+        if self.input_data is not None:
+            while self.input_data.read(self.chunk_size):
+                pass
+        raise upload_error(self.field_name, message, code)
+
+
+# ============================================
+# VIEW MIXIN VA SERIALIZER FIELD
+# ============================================
+class StreamingUploadMixin:
+    """
+    DRF view uchun: request.FILES shu view'da StreamingImageUploadHandler bilan o'qiladi.
+    upload_image_fields - header tekshiriladigan rasm maydonlari.
+    """
+    upload_image_fields = ('image',)
+
+    def initialize_request(self, request, *args, **kwargs):
+        # Handler'lar request.POST/FILES o'qilishidan oldin almashtirilishi kerak
+        request.upload_handlers = [StreamingImageUploadHandler(request, self.upload_image_fields)]
+        return super().initialize_request(request, *args, **kwargs)
+
+
+class UploadedImageField(serializers.ImageField):
+    """
+    StreamingImageUploadHandler tekshirgan fayl uchun format va o'lcham header'dan olinadi;
+    fayl faqat Image.verify() bilan tekshiriladi - piksellar decode qilinmaydi, lekin header'dan
+    keyin buzilgan fayl (PNG CRC, kesilgan chunk'lar) saqlanmaydi. Boshqa fayllar - oddiy ImageField.
+    """
+
+    def to_internal_value(self, data):
+        image_info = getattr(data, 'image_info', None)
+        if image_info is None:
+            return super().to_internal_value(data)
+        file = serializers.FileField.to_internal_value(self, data)
+        try:
+            with Image.open(file) as image:
+                image.verify()
+        except Exception:
+            self.fail('invalid_image')
+        finally:
+            file.seek(0)
+        file.content_type = Image.MIME.get(image_info[0], file.content_type)
+        return file